@@ -0,0 +1,59 @@
+"""
+Compare `clean_entire_market_data` with the previous copy/rename/concat implementation.
+
+Run from the repository root:
+    python -m benchmarks.clean_market_data
+"""
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc import schema
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+
+
+def legacy_clean_entire_market_data(raw_data: list[schema.OptionData]) -> pd.DataFrame:
+    df = pd.DataFrame(raw_data)
+
+    general_columns = [column for column in df.columns if (not column.endswith("_P")) and (not column.endswith("_C"))]
+    specific_columns = [column.replace("_C", "") for column in df.columns if column.endswith("_C")]
+
+    calls = df[general_columns + [column + "_C" for column in specific_columns]].copy()
+    calls.columns = [column.replace("_C", "") for column in calls.columns]
+    calls = calls.rename(columns=schema.SPECIFIC_COLUMN_NAMES)
+    calls['option_type'] = 'call'
+
+    puts = df[general_columns + [column + "_P" for column in specific_columns]].copy()
+    puts.columns = [column.replace("_P", "") for column in puts.columns]
+    puts = puts.rename(columns=schema.SPECIFIC_COLUMN_NAMES)
+    puts['option_type'] = 'put'
+
+    result_df = pd.concat([calls, puts], ignore_index=True)
+    result_df.rename(columns=schema.GENERAL_COLUMN_NAMES, inplace=True)
+    return result_df
+
+
+def main(n_rows: int = 10_000, repeat: int = 5) -> None:
+    payload = make_market_watch_payload(n_rows)
+
+    expected = legacy_clean_entire_market_data(payload)
+    actual = clean_entire_market_data(payload)
+    pd.testing.assert_frame_equal(actual, expected[actual.columns], check_dtype=False, check_categorical=False)
+
+    # Fractional values in fields declared as int are kept, as the legacy cleaner did.
+    fractional = make_market_watch_payload(1_000)
+    for record in fractional[::7]:
+        record["pClosing_UA"] += 0.56
+        record["qTitMeDem_C"] += 0.5
+    expected = legacy_clean_entire_market_data(fractional)
+    actual = clean_entire_market_data(fractional)
+    pd.testing.assert_frame_equal(actual, expected[actual.columns], check_dtype=False, check_categorical=False)
+
+    for name, func in (("legacy", legacy_clean_entire_market_data), ("current", clean_entire_market_data)):
+        best = min(timeit.repeat(lambda: func(payload), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1e3:8.2f} ms for {n_rows} market-watch rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Measure the memory saved by `compact_market_data` and the time it takes.
+
+Run from the repository root:
+    python -m benchmarks.compact_market_data
+"""
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data, compact_market_data, memory_report
+
+
+def main(n_rows: int = 5_000, repeat: int = 5) -> None:
+    data = clean_entire_market_data(make_market_watch_payload(n_rows))
+    compact = compact_market_data(data)
+    report = memory_report(compact, baseline=data)
+
+    total = report.loc["total"]
+    print(f"pandas {pd.__version__}, {len(data)} contracts: {total['baseline_bytes'] / 1e6:.2f} MB -> "
+          f"{total['bytes'] / 1e6:.2f} MB ({total['ratio']:.2f}x)")
+    print(report.drop(index="total").sort_values("bytes", ascending=False).head(5))
+
+    best = min(timeit.repeat(lambda: compact_market_data(data), number=1, repeat=repeat))
+    print(f"compact_market_data: {best * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Time `price_options` on a synthetic market. Its accuracy against a scalar Black-Scholes reference
+is checked in tests/test_pricing.py.
+
+Run from the repository root:
+    python -m benchmarks.pricing
+"""
+import timeit
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.use_case.pricing import price_options
+
+
+def main(n_rows: int = 5_000, r: float = 0.3) -> None:
+    market_data = clean_entire_market_data(make_market_watch_payload(n_rows))
+    best = min(timeit.repeat(lambda: price_options(market_data, risk_free_rate=r), number=1, repeat=5))
+    print(f"price_options: {best * 1e3:.2f} ms for {len(market_data)} contracts")
+
+
+if __name__ == "__main__":
+    main()
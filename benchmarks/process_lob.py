@@ -0,0 +1,37 @@
+"""
+Compare `process_raw_data` with the previous per-row HHMMSS parsing on a synthetic trading day.
+
+Run from the repository root:
+    python -m benchmarks.process_lob
+"""
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_best_limits_history
+from tseopt.data_source.tsetmc.limit_order_book.api import convert_to_time_format, process_raw_data
+from tseopt.data_source.tsetmc.limit_order_book.schemas import RawLOBLevel, columns_name
+
+
+def legacy_process_raw_data(raw_data: list[RawLOBLevel]) -> pd.DataFrame:
+    data = pd.DataFrame(raw_data)
+    data.rename(columns=columns_name, inplace=True)
+    data['time'] = data['hEven'].apply(convert_to_time_format)
+    columns = list(columns_name.values()) + ["time"]
+    return data[columns].sort_values(by=["time", "level"]).reset_index(drop=True)
+
+
+def main(n_events: int = 200_000, repeat: int = 3) -> None:
+    raw_data = make_best_limits_history(n_events)
+
+    expected = legacy_process_raw_data(raw_data)
+    actual = process_raw_data(raw_data)
+    assert (pd.to_datetime(actual["datetime"]).dt.time == expected["time"]).all()
+
+    for name, func in (("legacy", legacy_process_raw_data), ("current", process_raw_data)):
+        best = min(timeit.repeat(lambda: func(raw_data), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1e3:9.2f} ms for {n_events} best-limits events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare the `OptionMarket` statistics with the previous sort-based implementation.
+
+Run from the repository root:
+    python -m benchmarks.screen_market
+"""
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.use_case.screen_market import OptionMarket
+
+
+class LegacyOptionMarket:
+
+    def __init__(self, entire_option_market_data: pd.DataFrame) -> None:
+        self.__data = entire_option_market_data
+
+    def extreme_changes_in_open_positions(self, n: int = 5) -> dict:
+        data = self.__data.copy()
+        data["new_positions"] = data["open_positions"] - data["yesterday_open_positions"]
+        best = data.sort_values(by="new_positions", ascending=False).head(n)
+        worst = data.sort_values(by="new_positions", ascending=True).head(n)
+        return {
+            "best": best[["ticker", "new_positions"]].to_dict("records"),
+            "worst": worst[["ticker", "new_positions"]].to_dict("records"),
+        }
+
+    def most_trade_value(self, n: int = 5) -> dict:
+        data = self.__data.sort_values(by="trades_value", ascending=False).copy()
+        call = data[["ticker", "trades_value"]][data["option_type"] == "call"].head(n)
+        put = data[["ticker", "trades_value"]][data["option_type"] == "put"].head(n)
+        return {"call": call.to_dict("records"), "put": put.to_dict("records")}
+
+    def most_trade_value_by_underlying_asset(self, n: int = 5) -> list[dict]:
+        g = self.__data.groupby(['ua_ticker', 'option_type'], observed=True)
+        data = g.agg({"trades_value": "sum"})
+        data = data.pivot_table(index='ua_ticker', columns='option_type', values='trades_value',
+                                fill_value=0, observed=True).reset_index()
+        data.columns.name = None
+        data["total"] = data["call"] + data["put"]
+        return data.sort_values("total", ascending=False).head(n).to_dict("records")
+
+
+def screen(market: OptionMarket | LegacyOptionMarket) -> list:
+    return [
+        market.extreme_changes_in_open_positions(10),
+        market.most_trade_value(10),
+        market.most_trade_value_by_underlying_asset(10),
+    ]
+
+
+def main(n_contracts: int = 10_000, repeat: int = 5) -> None:
+    market_data = clean_entire_market_data(make_market_watch_payload(n_contracts // 2))
+
+    expected = screen(LegacyOptionMarket(market_data))
+    actual = screen(OptionMarket(market_data))
+    assert actual == expected
+
+    # Contracts without an underlying ticker are left out of the per-underlying sums, as in the legacy groupby.
+    missing_ticker = market_data.copy()
+    missing_ticker.loc[::50, "ua_ticker"] = None
+    assert screen(OptionMarket(missing_ticker)) == screen(LegacyOptionMarket(missing_ticker))
+
+    for name, cls in (("legacy", LegacyOptionMarket), ("current", OptionMarket)):
+        best = min(timeit.repeat(lambda: screen(cls(market_data)), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1e3:8.2f} ms for all statistics of {len(market_data)} contracts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the buffered and the streaming decoding of a recorded-shape market-watch payload
+served from a local HTTP server: wall time, time to the first record and peak Python memory.
+
+Run from the repository root:
+    python -m benchmarks.stream_market_watch
+"""
+import json
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import requests
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data, clean_market_watch_columns
+from tseopt.data_source.tsetmc.stream import ColumnBuffers, iter_json_array_items
+
+
+def serve(body: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for start in range(0, len(body), 16 * 1024):
+                self.wfile.write(body[start: start + 16 * 1024])
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def buffered(url: str) -> tuple[pd.DataFrame, float]:
+    response = requests.get(url, timeout=10)
+    records = response.json()["instrumentOptMarketWatch"]
+    first_record = time.perf_counter()
+    return clean_entire_market_data(records), first_record
+
+
+def streamed(url: str) -> tuple[pd.DataFrame, float]:
+    buffers = ColumnBuffers()
+    first_record = None
+    with requests.get(url, timeout=10, stream=True) as response:
+        for record in iter_json_array_items(response.iter_content(64 * 1024), "instrumentOptMarketWatch"):
+            if first_record is None:
+                first_record = time.perf_counter()
+            buffers.append(record)
+    return clean_market_watch_columns(buffers.columns), first_record
+
+
+def main(n_rows: int = 10_000) -> None:
+    payload = {"instrumentOptMarketWatch": make_market_watch_payload(n_rows)}
+    server = serve(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    frames = []
+    for name, func in (("buffered", buffered), ("streamed", streamed)):
+        start = time.perf_counter()
+        frame, first_record = func(url)
+        end = time.perf_counter()
+        frames.append(frame)
+
+        # Measured in a separate run since tracemalloc slows every allocation down.
+        tracemalloc.start()
+        func(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>9}: total {(end - start) * 1e3:8.2f} ms, first record {(first_record - start) * 1e3:8.2f} ms, "
+              f"peak {peak / 2**20:7.1f} MiB")
+
+    pd.testing.assert_frame_equal(*frames)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Offline benchmark suite of the data-source parsers and the use cases built on them.
+
+Every benchmark runs at several scales on synthetic payloads shaped like the live responses, or on
+payloads recorded once from the live endpoints. Timings can be saved as a baseline and later runs
+compared against it, so a performance regression fails the run.
+
+Run from the repository root:
+    python -m benchmarks.suite                                   # all benchmarks, synthetic payloads
+    python -m benchmarks.suite --filter chains --repeat 7
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --tolerance 1.3
+    python -m benchmarks.suite --fixtures fixtures/              # recorded payloads, see `record`
+    python -m benchmarks.suite record fixtures/ --tse-code 17091434834979599 --date 20250122 --isins IRO9AHRM2501
+"""
+import argparse
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from benchmarks import synthetic
+from tseopt.data_source.mercantile_exchange.api import MercantileCleanedData, MercantileData
+from tseopt.data_source.tadbir.api import Tadbir, TadbirCleanedData
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.data_source.tsetmc.limit_order_book.api import process_raw_data, take_lob_screenshot
+from tseopt.use_case.arbitrage import scan_arbitrage
+from tseopt.use_case.options_chains import Chains
+from tseopt.use_case.screen_market import OptionMarket
+
+FIXTURE_FILES: dict[str, str] = {
+    "market_watch": "market_watch.json",
+    "best_limits": "best_limits.json",
+    "tadbir_bulk": "tadbir_bulk.json",
+    "tadbir_detail": "tadbir_detail.json",
+    "mercantile_poll": "mercantile_poll.json",
+}
+
+
+class Benchmark(NamedTuple):
+    name: str
+    scales: tuple[int, ...]
+    # Builds the payload of one scale and returns the callable that is timed.
+    setup: Callable[["Fixtures", int], Callable[[], object]]
+
+
+def _scaled(records: list, n: int) -> list:
+    """
+    The first `n` records, cycling through a recorded payload that is shorter than `n`.
+    """
+    return [records[i % len(records)] for i in range(n)] if records else []
+
+
+class Fixtures:
+    """
+    The payloads of every benchmark: recorded ones from `directory` where available, synthetic otherwise.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.recorded: dict[str, object] = {}
+        if directory is not None:
+            for key, filename in FIXTURE_FILES.items():
+                path = directory / filename
+                if path.exists():
+                    self.recorded[key] = json.loads(path.read_text(encoding="utf-8"))
+
+    def market_watch(self, n_rows: int) -> list[dict]:
+        if "market_watch" in self.recorded:
+            return _scaled(self.recorded["market_watch"], n_rows)
+        return synthetic.make_market_watch_payload(n_rows)
+
+    def best_limits(self, n_events: int) -> list[dict]:
+        if "best_limits" in self.recorded:
+            return _scaled(self.recorded["best_limits"], n_events)
+        return synthetic.make_best_limits_history(n_events)
+
+    def tadbir_bulk(self, n_isins: int) -> list[dict]:
+        if "tadbir_bulk" in self.recorded:
+            return _scaled(self.recorded["tadbir_bulk"], n_isins)
+        return synthetic.make_tadbir_bulk_payload(n_isins)
+
+    def tadbir_detail(self, n_isins: int) -> dict[str, dict]:
+        if "tadbir_detail" in self.recorded:
+            recorded = list(self.recorded["tadbir_detail"].values())
+            return {f"ISIN{i:08d}": detail for i, detail in enumerate(_scaled(recorded, n_isins))}
+        return {f"ISIN{i:08d}": synthetic.make_tadbir_detail_payload(f"ISIN{i:08d}") for i in range(n_isins)}
+
+    def mercantile_poll(self, n_contracts: int) -> list[dict]:
+        if "mercantile_poll" in self.recorded:
+            return [
+                message | {"A": [_scaled(message["A"][0], n_contracts)]} if isinstance(message["A"][0], list) else message
+                for message in self.recorded["mercantile_poll"]
+            ]
+        return synthetic.make_mercantile_poll_messages(n_contracts)
+
+
+class RecordedTadbir(Tadbir):
+    """
+    A Tadbir client that answers from in-memory payloads, so only the parsing is measured.
+    """
+
+    def __init__(self, bulk: list[dict], details: dict[str, dict]) -> None:
+        super().__init__()
+        self._bulk = {record["nc"]: record for record in bulk}
+        self._details = details
+
+    def _get_last_bulk_data_direct(self, isin_list: list[str]) -> list[dict]:
+        return [self._bulk[isin] for isin in isin_list]
+
+    def get_detail_data(self, isin: str) -> dict:
+        return self._details[isin]
+
+
+def _clean_market_watch(fixtures: Fixtures, n_rows: int) -> Callable[[], object]:
+    raw_data = fixtures.market_watch(n_rows)
+    return lambda: clean_entire_market_data(raw_data)
+
+
+def _process_lob(fixtures: Fixtures, n_events: int) -> Callable[[], object]:
+    raw_data = fixtures.best_limits(n_events)
+    return lambda: process_raw_data(raw_data)
+
+
+def _lob_screenshot(fixtures: Fixtures, n_events: int) -> Callable[[], object]:
+    entire_data = process_raw_data(fixtures.best_limits(n_events))
+    return lambda: [take_lob_screenshot(entire_data, f"{hour:02d}:{minute:02d}")
+                    for hour in (9, 10, 11, 12) for minute in (0, 15, 30, 45)]
+
+
+def _chains(fixtures: Fixtures, n_rows: int) -> Callable[[], object]:
+    market_data = clean_entire_market_data(fixtures.market_watch(n_rows))
+
+    def iterate() -> int:
+        chains = Chains(market_data)
+        return sum(1 for _ in chains.iter_date_chains()) + sum(1 for _ in chains.iter_strike_price_chains())
+    return iterate
+
+
+def _option_market(fixtures: Fixtures, n_rows: int) -> Callable[[], object]:
+    market_data = clean_entire_market_data(fixtures.market_watch(n_rows))
+
+    def screen() -> list:
+        market = OptionMarket(market_data)
+        return [market.total_trade_value, market.extreme_changes_in_open_positions(10),
+                market.most_trade_value(10), market.most_trade_value_by_underlying_asset(10)]
+    return screen
+
+
+def _arbitrage_scan(fixtures: Fixtures, n_rows: int) -> Callable[[], object]:
+    market_data = clean_entire_market_data(fixtures.market_watch(n_rows))
+    return lambda: scan_arbitrage(market_data)
+
+
+def _tadbir_bulk(fixtures: Fixtures, n_isins: int) -> Callable[[], object]:
+    bulk = fixtures.tadbir_bulk(n_isins)
+    isins = [record["nc"] for record in bulk]
+    cleaned = TadbirCleanedData(RecordedTadbir(bulk, {}))
+    return lambda: cleaned.get_last_bulk_data(isins, chunk_size=500, max_workers=1)
+
+
+def _tadbir_detail(fixtures: Fixtures, n_isins: int) -> Callable[[], object]:
+    details = fixtures.tadbir_detail(n_isins)
+    cleaned = TadbirCleanedData(RecordedTadbir([], details))
+    return lambda: cleaned.get_detail_data_many(list(details), concurrency=1)
+
+
+def _mercantile(fixtures: Fixtures, n_contracts: int) -> Callable[[], object]:
+    messages = fixtures.mercantile_poll(n_contracts)
+
+    def convert() -> list:
+        mercantile_data = MercantileData(mercantile_exchange=None)
+        mercantile_data.apply_messages(messages)
+        cleaned = MercantileCleanedData(mercantile_data)
+        return [cleaned.future, cleaned.markets_info, cleaned.gavahi]
+    return convert
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark("clean_entire_market_data", (1_000, 5_000, 10_000), _clean_market_watch),
+    Benchmark("process_raw_data", (10_000, 50_000, 200_000), _process_lob),
+    Benchmark("take_lob_screenshot", (10_000, 50_000, 200_000), _lob_screenshot),
+    Benchmark("chains_iteration", (1_000, 5_000, 10_000), _chains),
+    Benchmark("option_market_stats", (1_000, 5_000, 10_000), _option_market),
+    Benchmark("arbitrage_scan", (1_000, 5_000, 10_000), _arbitrage_scan),
+    Benchmark("tadbir_bulk_data", (100, 1_000, 5_000), _tadbir_bulk),
+    Benchmark("tadbir_detail_data_many", (10, 100, 500), _tadbir_detail),
+    Benchmark("mercantile_cleaned_data", (50, 200, 1_000), _mercantile),
+]
+
+
+def run(fixtures: Fixtures, name_filter: str = "", repeat: int = 5) -> dict[str, float]:
+    """
+    Best-of-`repeat` time in seconds of every benchmark and scale, keyed by 'name[scale]'.
+    """
+    timings = {}
+    for benchmark in BENCHMARKS:
+        if name_filter not in benchmark.name:
+            continue
+        for scale in benchmark.scales:
+            function = benchmark.setup(fixtures, scale)
+            function()  # warm-up, e.g. lazy imports and cached layouts
+            key = f"{benchmark.name}[{scale}]"
+            timings[key] = min(timeit.repeat(function, number=1, repeat=repeat))
+            print(f"{key:>40}: {timings[key] * 1e3:10.2f} ms", flush=True)
+    return timings
+
+
+def compare(timings: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """
+    The benchmarks that became more than `tolerance` times slower than the baseline.
+    """
+    regressions = []
+    for key, seconds in timings.items():
+        if key in baseline and seconds > baseline[key] * tolerance:
+            regressions.append(f"{key}: {baseline[key] * 1e3:.2f} ms -> {seconds * 1e3:.2f} ms "
+                               f"({seconds / baseline[key]:.2f}x)")
+    return regressions
+
+
+def record(directory: Path, tse_code: str | None, date: str | None, isins: list[str]) -> None:
+    """
+    Save live responses as fixtures; the benchmarks that have no recorded payload stay synthetic.
+    """
+    from tseopt.data_source.mercantile_exchange.api import make_a_mercantile_data_object
+    from tseopt.data_source.tsetmc.api import fetch_entire_market_data
+    from tseopt.data_source.tsetmc.limit_order_book.api import fetch_lob_data
+
+    directory.mkdir(parents=True, exist_ok=True)
+    payloads: dict[str, object] = {"market_watch": fetch_entire_market_data()}
+    if tse_code and date:
+        payloads["best_limits"] = fetch_lob_data(tse_code, date)
+    if isins:
+        tadbir = Tadbir()
+        payloads["tadbir_bulk"] = tadbir.get_last_bulk_data(isins)
+        payloads["tadbir_detail"] = tadbir.get_detail_data_many(isins)
+    mercantile_exchange = make_a_mercantile_data_object()._api
+    payloads["mercantile_poll"] = mercantile_exchange.get_data()
+
+    for key, payload in payloads.items():
+        (directory / FIXTURE_FILES[key]).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        print(f"recorded {directory / FIXTURE_FILES[key]}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+    parser.add_argument("--filter", default="", help="Only run the benchmarks whose name contains this text.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixtures", type=Path, help="Directory of recorded payloads.")
+    parser.add_argument("--save", type=Path, help="Save the timings as a JSON baseline.")
+    parser.add_argument("--compare", type=Path, help="Fail if slower than this JSON baseline.")
+    parser.add_argument("--tolerance", type=float, default=1.3, help="Allowed slowdown against the baseline.")
+
+    recorder = subparsers.add_parser("record", help="Record live responses as fixtures.")
+    recorder.add_argument("directory", type=Path)
+    recorder.add_argument("--tse-code", help="Contract whose BestLimits history is recorded.")
+    recorder.add_argument("--date", help="Gregorian date of the BestLimits history, YYYYMMDD.")
+    recorder.add_argument("--isins", nargs="*", default=[], help="ISINs whose Tadbir responses are recorded.")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.directory, args.tse_code, args.date, args.isins)
+        return 0
+
+    timings = run(Fixtures(args.fixtures), name_filter=args.filter, repeat=args.repeat)
+    if args.save:
+        args.save.write_text(json.dumps(timings, indent=2), encoding="utf-8")
+    if args.compare:
+        regressions = compare(timings, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
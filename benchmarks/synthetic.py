@@ -0,0 +1,167 @@
+"""
+Synthetic payloads shaped like the live API responses, so the benchmarks run offline.
+"""
+import random
+from typing import get_type_hints
+
+from tseopt.data_source.mercantile_exchange import schema as mercantile_schema
+from tseopt.data_source.tsetmc import schema
+
+
+def make_market_watch_payload(n_rows: int, n_underlyings: int = 60, seed: int = 0) -> list[schema.OptionData]:
+    """
+    Build `n_rows` records shaped like the `instrumentOptMarketWatch` items of
+    GetInstrumentOptionMarketWatch. Every record holds one call and one put.
+    """
+    rng = random.Random(seed)
+    underlyings = [
+        (str(10_000_000_000_000_000 + i * 7919), f"UA{i}", rng.randint(1_000, 30_000))
+        for i in range(n_underlyings)
+    ]
+    end_dates = ["20250122", "20250219", "20250319", "20250521", "20250723", "20250917"]
+
+    records = []
+    for i in range(n_rows):
+        ua_tse_code, ua_ticker, ua_price = underlyings[i % n_underlyings]
+        strike_price = ua_price + 500 * rng.randint(-10, 10)
+        end_date = end_dates[(i // n_underlyings) % len(end_dates)]
+        record = {
+            "contractSize": 1000,
+            "uaInsCode": ua_tse_code,
+            "lval30_UA": ua_ticker,
+            "pClosing_UA": ua_price,
+            "pDrCotVal_UA": ua_price + rng.randint(-50, 50),
+            "priceYesterday_UA": ua_price,
+            "beginDate": "20240821",
+            "endDate": end_date,
+            "strikePrice": strike_price,
+            "remainedDay": rng.randint(1, 300),
+        }
+        for suffix, letter in (("_C", "ض"), ("_P", "ط")):
+            record |= {
+                "insCode" + suffix: str(20_000_000_000_000_000 + 2 * i + (suffix == "_P")),
+                "lVal18AFC" + suffix: f"{letter}{ua_ticker}{i}",
+                "lVal30" + suffix: f"اختیار {ua_ticker}-{strike_price}-{end_date}",
+                "zTotTran" + suffix: rng.randint(0, 500),
+                "qTotTran5J" + suffix: rng.randint(0, 1_000_000),
+                "qTotCap" + suffix: float(rng.randint(0, 10**11)),
+                "notionalValue" + suffix: float(rng.randint(0, 10**12)),
+                "pClosing" + suffix: rng.randint(1, 5_000),
+                "priceYesterday" + suffix: rng.randint(1, 5_000),
+                "pDrCotVal" + suffix: rng.randint(1, 5_000),
+                "oP" + suffix: rng.randint(0, 100_000),
+                "yesterdayOP" + suffix: rng.randint(0, 100_000),
+                "pMeDem" + suffix: rng.randint(1, 5_000),
+                "qTitMeDem" + suffix: rng.randint(0, 10_000),
+                "pMeOf" + suffix: rng.randint(1, 5_000),
+                "qTitMeOf" + suffix: rng.randint(0, 10_000),
+            }
+        records.append(record)
+    return records
+
+
+def make_best_limits_history(n_events: int, date: int = 20241218, seed: int = 0) -> list[dict]:
+    """
+    Build `n_events` records shaped like the `bestLimitsHistory` items of BestLimits/{tse_code}/{date},
+    spread over a trading day from 08:45 to 12:30.
+    """
+    rng = random.Random(seed)
+    start, end = 8 * 3600 + 45 * 60, 12 * 3600 + 30 * 60
+    seconds = sorted(rng.randint(start, end) for _ in range(n_events))
+
+    records = []
+    for i, second in enumerate(seconds):
+        hours, rest = divmod(second, 3600)
+        minutes, secs = divmod(rest, 60)
+        bid = float(rng.randint(1_000, 1_100) * 10)
+        records.append({
+            "idn": i + 1,
+            "dEven": date,
+            "hEven": hours * 10000 + minutes * 100 + secs,
+            "refID": 13_000_000_000 + i,
+            "number": rng.randint(1, 5),
+            "qTitMeDem": rng.randint(1, 50_000),
+            "zOrdMeDem": rng.randint(1, 20),
+            "pMeDem": bid,
+            "pMeOf": bid + 10 * rng.randint(1, 20),
+            "zOrdMeOf": rng.randint(1, 20),
+            "qTitMeOf": rng.randint(1, 50_000),
+            "insCode": None,
+        })
+    return records
+
+
+def make_tadbir_bulk_payload(n_isins: int, seed: int = 0) -> list[dict]:
+    """
+    Build `n_isins` records shaped like the items of Tadbir's getstockprice2 response.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(n_isins):
+        price = float(rng.randint(1, 5_000))
+        record = {key: float(rng.randint(0, 10_000)) for key in ("bv", "cpv", "cpvp", "lpv", "lpvp", "mnqo", "mxqo")}
+        record |= {
+            "bbp": price - 1, "bbq": rng.randint(0, 10_000), "bsp": price + 1, "bsq": rng.randint(0, 10_000),
+            "cp": price, "ltp": price, "ftp": price, "pcp": price, "rp": price, "hp": price + 5, "lp": price - 5,
+            "hap": price * 1.1, "lap": price * 0.9, "tv": float(rng.randint(0, 10**11)),
+            "nbb": rng.randint(0, 20), "nbs": rng.randint(0, 20), "nst": rng.randint(0, 1_000_000),
+            "nt": rng.randint(0, 500), "cs": 1000, "gs": 1, "ss": 1, "csid": None,
+            "cn": f"company {i}", "ic": str(20_000_000_000_000_000 + i), "nc": f"IRO9T{i:07d}",
+            "sc": "56", "sf": f"ضT{i}", "mtd": "2025/01/22 12:29:59", "td": "2025/01/22", "vs": "+",
+        }
+        records.append(record)
+    return records
+
+
+def make_tadbir_detail_payload(isin: str, n_levels: int = 5, seed: int = 0) -> dict:
+    """
+    Build a response shaped like Tadbir's getLightSymbolInfoAndQueue for `isin`.
+    """
+    rng = random.Random(f"{seed}/{isin}")
+    price = rng.randint(1, 5_000)
+    symbol_info = {"est": f"ضT{isin[-4:]}", "nc": isin, "ic": isin, "bisin": "IRO1UA000001", "ltp": float(price),
+                   "bltp": float(rng.randint(1_000, 30_000)), "ltd": "2025/01/22", "cp": float(price), "lp": price - 5,
+                   "hp": price + 5, "nt": rng.randint(0, 500), "nst": rng.randint(0, 1_000_000), "pcp": float(price),
+                   "tv": float(rng.randint(0, 10**11)), "cs": 1000, "sp": float(rng.randint(1_000, 30_000)),
+                   "ed": "2025/03/19", "sd": "2024/08/21", "im": float(rng.randint(0, 10**6)), "op": rng.randint(0, 10**5)}
+    levels = [
+        {"BestBuyPrice": float(price - level), "BestBuyQuantity": rng.randint(1, 10_000),
+         "BestSellPrice": float(price + level), "BestSellQuantity": rng.randint(1, 10_000),
+         "NSCCode": isin, "NoBestBuy": rng.randint(1, 20), "NoBestSell": rng.randint(1, 20), "Place": level}
+        for level in range(1, n_levels + 1)
+    ]
+    return {"symbolinfo": symbol_info, "symbolqueue": {"Value": levels}}
+
+
+def make_mercantile_poll_messages(n_contracts: int, seed: int = 0) -> list[dict]:
+    """
+    Build the `M` field of a Mercantile Exchange poll response with `n_contracts` contracts in each of
+    the futures, options (updateMarketsInfo) and certificate (gavahi) markets.
+    """
+    rng = random.Random(seed)
+
+    def contract(typed_dict: type, i: int) -> dict:
+        record = {}
+        for field, annotation in get_type_hints(typed_dict).items():
+            if annotation is bool:
+                record[field] = rng.random() < 0.5
+            elif annotation is int or annotation == int | None:
+                record[field] = rng.randint(0, 100_000)
+            elif annotation is float or annotation == float | None:
+                record[field] = float(rng.randint(0, 10**7))
+            elif field.strip("_").endswith(mercantile_schema.CATEGORICAL_FIELD_SUFFIXES):
+                record[field] = rng.choice(["red", "green", "black"])
+            else:
+                record[field] = f"{field}-{i}"
+        record |= {field: i for field in ("ID", "ContractID") if field in record}
+        return record
+
+    markets = (
+        ("updateFutureMarketsInfo", mercantile_schema.FutureData),
+        ("updateMarketsInfo", mercantile_schema.UpdateMarketInfo),
+        ("updateGavahiMarketsInfo", mercantile_schema.Type1Data),
+    )
+    return [
+        {"H": "marketsHub", "M": market_name, "A": [[contract(typed_dict, i) for i in range(n_contracts)]]}
+        for market_name, typed_dict in markets
+    ]
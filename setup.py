@@ -22,11 +22,15 @@ setup(
     ],
     python_requires='>=3.12',
     install_requires=[
+        'numpy>=1.26',
         'pandas>=2.2.2',
         'requests>=2.32.3',
         'fake-useragent==1.5.1',
         'jdatetime==5.1.0',
     ],
+    extras_require={
+        'store': ['pyarrow>=14.0'],
+    },
     license='MIT',
     keywords='tse options tehran derivative',
 
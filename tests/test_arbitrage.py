@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+
+from tseopt.use_case.arbitrage import Strategy, scan_arbitrage
+
+
+def _calls(strikes: list[int], bids: list[float], asks: list[float], volume: int = 10) -> pd.DataFrame:
+    return pd.DataFrame({
+        "ua_tse_code": "1", "ua_ticker": "UA", "end_date": "20250101", "strike_price": strikes,
+        "ticker": [f"C{strike}" for strike in strikes], "contract_size": 1, "ua_last_price": 100,
+        "days_to_maturity": 30, "bid_price": bids, "bid_volume": volume, "ask_price": asks,
+        "ask_volume": volume, "option_type": "call",
+    })
+
+
+def test_uneven_butterfly_reports_its_weights():
+    data = _calls([100, 110, 130], bids=[19, 20, 4], asks=[20, 21, 5])
+    opportunities = scan_arbitrage(data)
+    butterfly = opportunities[opportunities["strategy"] == Strategy.CALL_BUTTERFLY.value].iloc[0]
+
+    assert butterfly["legs"] == "+0.6667*C100 -C110 +0.3333*C130"
+    assert butterfly["profit"] == pytest.approx(20 - 2 / 3 * 20 - 1 / 3 * 5)
+    assert butterfly["volume"] == pytest.approx(10)
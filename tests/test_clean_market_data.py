@@ -0,0 +1,23 @@
+import pandas as pd
+
+from benchmarks.clean_market_data import legacy_clean_entire_market_data
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+
+
+def test_fields_missing_from_some_records_are_kept():
+    payload = make_market_watch_payload(50)
+    del payload[0]["zTotTran_C"], payload[0]["zTotTran_P"]
+    payload[7]["pMeDem_C"] = None
+
+    data = clean_entire_market_data(payload)
+    expected = legacy_clean_entire_market_data(payload)
+    pd.testing.assert_frame_equal(data, expected[data.columns], check_dtype=False, check_categorical=False)
+    assert data["trades_num"].isna().tolist() == [True] + [False] * 49 + [True] + [False] * 49
+
+
+def test_a_field_only_later_records_have_is_kept():
+    payload = make_market_watch_payload(10)
+    payload[3]["extra"] = 1
+    data = clean_entire_market_data(payload)
+    assert data["extra"].tolist() == [None, None, None, 1, None, None, None, None, None, None] * 2
@@ -0,0 +1,17 @@
+import numpy as np
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data, compact_market_data
+
+
+def test_prices_and_volumes_keep_int64():
+    data = clean_entire_market_data(make_market_watch_payload(50))
+    compact = compact_market_data(data)
+
+    for column in ("contract_size", "strike_price", "last_price", "trades_volume", "bid_volume"):
+        assert compact[column].dtype == np.int64
+    for column in ("trades_num", "days_to_maturity", "open_positions"):
+        assert compact[column].dtype == np.int32
+
+    notional = compact["last_price"] * compact["trades_volume"] * compact["contract_size"]
+    assert notional.equals(data["last_price"] * data["trades_volume"] * data["contract_size"])
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from benchmarks.synthetic import make_best_limits_history
+from tseopt.data_source.tsetmc.limit_order_book.async_api import fetch_historical_lob_many
+from tseopt.data_source.tsetmc.trading_calendar import default_calendar
+from tseopt.storage.lob_cache import LOBCache
+
+DAYS = list(default_calendar.iter_trading_days("1403-10-01", "1403-10-30"))
+
+
+class FakeResponse:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class FakeBestLimitsServer:
+    """
+    A transport answering BestLimits requests locally after `latency` seconds; dates in `empty`
+    get an empty history. Records the start time and the peak number of requests in flight.
+    """
+
+    def __init__(self, latency: float = 0.0, empty: tuple[str, ...] = (), slow: dict[str, float] | None = None) -> None:
+        self.latency = latency
+        self.empty = set(empty)
+        self.slow = slow or {}
+        self.started: list[float] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float | None = None) -> FakeResponse:
+        date = url.rsplit("/", 1)[-1]
+        with self._lock:
+            self.started.append(time.monotonic())
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.slow.get(date, self.latency))
+            history = [] if date in self.empty else make_best_limits_history(5, date=int(date))
+            return FakeResponse({"bestLimitsHistory": history})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+async def _collect(pairs, **kwargs) -> dict:
+    return {pair: result async for pair, result in fetch_historical_lob_many(pairs, **kwargs)}
+
+
+def test_concurrency_limit():
+    server = FakeBestLimitsServer(latency=0.05)
+    pairs = [("1", day) for day in DAYS[:12]]
+    results = asyncio.run(_collect(pairs, concurrency=3, rate_limit=None, transport=server))
+    assert set(results) == set(pairs)
+    assert server.peak == 3
+
+
+def test_rate_limit():
+    server = FakeBestLimitsServer()
+    pairs = [("1", day) for day in DAYS[:6]]
+    asyncio.run(_collect(pairs, concurrency=6, rate_limit=20, transport=server))
+    starts = sorted(server.started)
+    assert starts[-1] - starts[0] >= 0.9 * (len(pairs) - 1) / 20
+
+
+def test_errors_are_reported_per_pair():
+    server = FakeBestLimitsServer()
+    pairs = [("1", day) for day in DAYS[:4]]
+    empty = default_calendar.validate(pairs[1][1])
+    server.empty.add(empty)
+
+    results = asyncio.run(_collect(pairs, rate_limit=None, return_exceptions=True, transport=server))
+    assert isinstance(results[pairs[1]], ValueError)
+    assert all(len(results[pair]) == 5 for pair in pairs if pair != pairs[1])
+
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(pairs, rate_limit=None, transport=server))
+
+
+async def _order(pairs, **kwargs) -> list[tuple[str, str]]:
+    return [pair async for pair, _ in fetch_historical_lob_many(pairs, **kwargs)]
+
+
+def test_ordered_results_follow_the_pairs():
+    pairs = [("1", day) for day in DAYS[:5]]
+    slow = {default_calendar.validate(day): delay for (_, day), delay in zip(pairs, (0.3, 0.2, 0.1))}
+
+    server = FakeBestLimitsServer(slow=slow)
+    assert asyncio.run(_order(pairs, concurrency=5, rate_limit=None, ordered=True, transport=server)) == pairs
+
+    server = FakeBestLimitsServer(slow=slow)
+    unordered = asyncio.run(_order(pairs, concurrency=5, rate_limit=None, transport=server))
+    assert unordered[-3:] == pairs[2::-1]
+
+
+def test_cached_days_skip_the_rate_limit(tmp_path):
+    pairs = [("1", day) for day in DAYS[:5]]
+    cache = LOBCache(tmp_path)
+    server = FakeBestLimitsServer()
+    first = asyncio.run(_collect(pairs, rate_limit=None, transport=server, cache=cache))
+    assert len(server.started) == len(pairs)
+
+    # At one request per second the five days would take four seconds if they were rate limited.
+    started = time.monotonic()
+    cached = asyncio.run(_collect(pairs, rate_limit=1, transport=server, cache=cache))
+    assert time.monotonic() - started < 1
+    assert len(server.started) == len(pairs)
+    assert all(cached[pair].equals(first[pair]) for pair in pairs)
+
+
+def test_early_close_does_not_wait_for_running_requests():
+    pairs = [("1", day) for day in DAYS[:3]]
+    slow = default_calendar.validate(pairs[2][1])
+    server = FakeBestLimitsServer(slow={slow: 2.0})
+
+    async def main() -> float:
+        lobs = fetch_historical_lob_many(pairs, concurrency=3, rate_limit=None, ordered=True, transport=server)
+        await anext(lobs)
+        await asyncio.sleep(0.1)
+        started = time.monotonic()
+        await lobs.aclose()
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.5
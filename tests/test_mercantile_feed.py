@@ -0,0 +1,213 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from tseopt.data_source.mercantile_exchange.api import MercantileData, MercantileExchangeAPI
+from tseopt.data_source.mercantile_exchange.async_api import MarketSubscription, MercantileExchangeFeed
+from tseopt.data_source.transport import Transport
+
+FUTURE = "updateFutureMarketsInfo"
+GAVAHI = "updateGavahiMarketsInfo"
+
+
+def _message(market_name: str, data) -> dict:
+    return {"H": "marketsHub", "M": market_name, "A": [data]}
+
+
+class StubMercantileServer:
+    """
+    A local server that mimics the SignalR longPolling protocol of the Mercantile Exchange.
+
+    Every negotiate issues a new connection token. Poll requests answer with the next scripted item:
+    a poll response, or "expire" to reject the current token with HTTP 403. An empty script answers
+    with an empty poll response after a short wait, like an idle long poll.
+    """
+
+    def __init__(self, script: list) -> None:
+        self.script = list(script)
+        self.negotiations = 0
+        self.valid_token: str | None = None
+        self.poll_tokens: list[str] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, status: int, body: dict | None = None) -> None:
+                payload = json.dumps(body or {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                with stub._lock:
+                    stub.negotiations += 1
+                    stub.valid_token = f"token-{stub.negotiations}"
+                self._reply(200, {"ConnectionToken": stub.valid_token})
+
+            def do_POST(self) -> None:
+                url = urlsplit(self.path)
+                token = parse_qs(url.query).get("connectionToken", [None])[0]
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                action = url.path.rsplit("/", 1)[-1]
+                if token != stub.valid_token:
+                    self._reply(403)
+                elif action == "connect":
+                    self._reply(200, {"C": "m-0"})
+                elif action == "start":
+                    self._reply(200, {"Response": "started"})
+                else:
+                    self._poll(token)
+
+            def _poll(self, token: str) -> None:
+                with stub._lock:
+                    stub.poll_tokens.append(token)
+                    item = stub.script.pop(0) if stub.script else None
+                if item is None:
+                    threading.Event().wait(0.05)
+                    self._reply(200, {"C": "m-idle", "M": []})
+                elif item == "expire":
+                    stub.valid_token = None
+                    self._reply(403)
+                else:
+                    self._reply(200, item)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def api(self) -> MercantileExchangeAPI:
+        api = MercantileExchangeAPI(transport=Transport(retries=0))
+        api._BASE_URL = f"http://127.0.0.1:{self._server.server_port}/realTimeServer/"
+        return api
+
+    def __enter__(self) -> "StubMercantileServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _feed(server: StubMercantileServer) -> MercantileExchangeFeed:
+    return MercantileExchangeFeed(server.api, poll_timeout=5, reconnect_delay=0.01, max_reconnect_delay=0.05)
+
+
+async def _take(subscription: MarketSubscription, n: int) -> list:
+    return [await asyncio.wait_for(anext(subscription), timeout=5) for _ in range(n)]
+
+
+def test_updates_reach_the_subscribed_markets():
+    script = [
+        {"C": "m-1", "M": [_message(GAVAHI, [{"ID": 7}]), _message(FUTURE, [{"ContractID": 1}])]},
+        {"C": "m-2", "M": [_message(FUTURE, [{"ContractID": 2}])]},
+    ]
+
+    async def main():
+        with StubMercantileServer(script) as server:
+            async with _feed(server) as feed:
+                futures = feed.subscribe([FUTURE])
+                everything = feed.subscribe()
+                seen = []
+                while len(seen) < 2:
+                    (market_name, data), = await _take(futures, 1)
+                    assert market_name == FUTURE
+                    seen += [contract["ContractID"] for contract in data]
+                assert seen == [1, 2]
+                # Read after both polls, so the two partial future updates arrive merged.
+                assert await _take(everything, 2) == [
+                    (GAVAHI, [{"ID": 7}]), (FUTURE, [{"ContractID": 1}, {"ContractID": 2}])
+                ]
+
+    asyncio.run(main())
+
+
+def test_reconnects_when_the_token_expires():
+    script = ["expire", {"C": "m-1", "M": [_message(FUTURE, [{"ContractID": 1}])]}]
+
+    async def main():
+        with StubMercantileServer(script) as server:
+            async with _feed(server) as feed:
+                assert await _take(feed.subscribe([FUTURE]), 1) == [(FUTURE, [{"ContractID": 1}])]
+                assert feed.reconnects == 1
+                assert server.negotiations == 2
+                assert server.poll_tokens[:2] == ["token-1", "token-2"]
+
+    asyncio.run(main())
+
+
+def test_malformed_response_is_logged_and_retried(caplog):
+    script = [{"C": "m-1", "M": 5}, {"C": "m-2", "M": [_message(FUTURE, [{"ContractID": 1}])]}]
+
+    async def main():
+        with StubMercantileServer(script) as server:
+            async with _feed(server) as feed:
+                assert await _take(feed.subscribe([FUTURE]), 1) == [(FUTURE, [{"ContractID": 1}])]
+                assert isinstance(feed.last_error, TypeError)
+
+    asyncio.run(main())
+    assert "reconnecting" in caplog.text
+
+
+def test_slow_consumer_gets_coalesced_partial_updates():
+    async def main():
+        subscription = MarketSubscription(None)
+        subscription.put(FUTURE, [{"ContractID": 1, "Price": 10}, {"ContractID": 2, "Price": 20}])
+        subscription.put(GAVAHI, [{"ID": 7}])
+        subscription.put(FUTURE, [{"ContractID": 1, "Price": 11}, {"ContractID": 3, "Price": 30}])
+        subscription.close()
+
+        updates = [update async for update in subscription]
+        assert updates == [
+            (FUTURE, [{"ContractID": 1, "Price": 11}, {"ContractID": 2, "Price": 20}, {"ContractID": 3, "Price": 30}]),
+            (GAVAHI, [{"ID": 7}]),
+        ]
+
+        mercantile_data = MercantileData(mercantile_exchange=None)
+        for market_name, data in updates:
+            mercantile_data.apply_update(market_name, data)
+        assert [contract["Price"] for contract in mercantile_data.future] == [11, 20, 30]
+
+    asyncio.run(main())
+
+
+def test_a_dead_feed_fails_its_subscribers():
+    async def main():
+        with StubMercantileServer([]) as server:
+            feed = _feed(server)
+
+            async def crash():
+                raise RuntimeError("boom")
+
+            feed._run = crash
+            subscription = feed.subscribe()
+            feed.start()
+            with pytest.raises(RuntimeError, match="boom"):
+                await asyncio.wait_for(anext(subscription), timeout=5)
+            with pytest.raises(RuntimeError, match="boom"):
+                await anext(feed.subscribe())
+            await feed.stop()
+
+    asyncio.run(main())
+
+
+def test_stop_ends_the_subscriptions():
+    async def main():
+        with StubMercantileServer([]) as server:
+            feed = _feed(server)
+            feed.start()
+            subscription = feed.subscribe()
+            await asyncio.sleep(0.1)
+            await feed.stop()
+            assert [update async for update in subscription] == []
+
+    asyncio.run(main())
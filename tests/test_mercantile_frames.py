@@ -0,0 +1,35 @@
+import numpy as np
+
+from tseopt.data_source.mercantile_exchange.frames import make_future_converter
+
+
+def _contracts(*ids) -> list[dict]:
+    return [{"ContractID": contract_id, "ContractSize": 10.0, "BidVolume1": 5} for contract_id in ids]
+
+
+def test_frames_own_their_columns_by_default():
+    converter = make_future_converter()
+    first = converter.convert(_contracts(1, 2))
+    second = converter.convert(_contracts(3, 4))
+    assert first["contract_id"].tolist() == [1, 2]
+    assert second["contract_id"].tolist() == [3, 4]
+    assert first["contract_id"].dtype == np.int64
+    assert converter._buffers == {}
+
+
+def test_copy_false_reuses_the_buffers():
+    converter = make_future_converter()
+    first = converter.convert(_contracts(1, 2), copy=False)
+    converter.convert(_contracts(3, 4), copy=False)
+    assert first["contract_id"].tolist() == [3, 4]
+
+
+def test_fractional_and_missing_ints():
+    converter = make_future_converter()
+    for copy in (True, False):
+        records = _contracts(1, 2)
+        records[0]["BidVolume1"] = 2.5
+        records[1]["ContractID"] = None
+        data = converter.convert(records, copy=copy)
+        assert data["bid_volume1"].tolist() == [2.5, 5.0]
+        assert np.isnan(data["contract_id"].iloc[1])
@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.use_case.pricing import (DAYS_IN_YEAR, black_scholes_greeks, black_scholes_price, implied_volatility,
+                                     norm_cdf, price_options)
+
+R = 0.3
+
+
+def scalar_price(s: float, k: float, t: float, r: float, sigma: float, is_call: bool) -> float:
+    def cdf(x: float) -> float:
+        return 0.5 * math.erfc(-x / math.sqrt(2))
+
+    d1 = (math.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * math.sqrt(t))
+    d2 = d1 - sigma * math.sqrt(t)
+    if is_call:
+        return s * cdf(d1) - k * math.exp(-r * t) * cdf(d2)
+    return k * math.exp(-r * t) * cdf(-d2) - s * cdf(-d1)
+
+
+def scalar_implied_volatility(price: float, s: float, k: float, t: float, r: float, is_call: bool) -> float:
+    lo, hi = 1e-4, 10.0
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if scalar_price(s, k, t, r, mid, is_call) > price:
+            hi = mid
+        else:
+            lo = mid
+    return 0.5 * (lo + hi)
+
+
+@pytest.fixture(scope="module")
+def contracts() -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(0)
+    s = rng.uniform(1_000, 30_000, 2_000)
+    return {
+        "s": s,
+        "k": s * rng.uniform(0.6, 1.4, s.size),
+        "t": rng.integers(1, 300, s.size) / DAYS_IN_YEAR,
+        "sigma": rng.uniform(0.1, 1.5, s.size),
+        "is_call": rng.random(s.size) < 0.5,
+    }
+
+
+def _meaningful(price, s, k, t, is_call) -> np.ndarray:
+    # Deep in-the-money prices carry almost no time value, so their volatility is not identifiable.
+    discounted_k = k * np.exp(-R * t)
+    intrinsic = np.where(is_call, np.maximum(s - discounted_k, 0), np.maximum(discounted_k - s, 0))
+    return price - intrinsic > 1e-3 * s
+
+
+def test_norm_cdf():
+    x = np.linspace(-8, 8, 1001)
+    reference = np.array([0.5 * math.erfc(-value / math.sqrt(2)) for value in x])
+    assert np.max(np.abs(norm_cdf(x) - reference)) < 1e-14
+
+
+def test_price_matches_the_scalar_reference(contracts):
+    s, k, t, sigma, is_call = (contracts[key] for key in ("s", "k", "t", "sigma", "is_call"))
+    price = black_scholes_price(s, k, t, R, sigma, is_call)
+    reference = np.array([scalar_price(*args, R, vol, call) for args, vol, call in zip(zip(s, k, t), sigma, is_call)])
+    assert np.max(np.abs(price - reference) / s) < 1e-12
+
+
+def test_implied_volatility_recovers_sigma(contracts):
+    s, k, t, sigma, is_call = (contracts[key] for key in ("s", "k", "t", "sigma", "is_call"))
+    price = black_scholes_price(s, k, t, R, sigma, is_call)
+    recovered = implied_volatility(price, s, k, t, R, is_call)
+    meaningful = _meaningful(price, s, k, t, is_call)
+    assert np.max(np.abs(recovered - sigma)[meaningful]) < 1e-6
+
+    n = 200
+    scalar = np.array([scalar_implied_volatility(p, *args, R, call) for p, args, call in
+                       zip(price[:n], zip(s[:n], k[:n], t[:n]), is_call[:n])])
+    assert np.max(np.abs(recovered[:n] - scalar)[meaningful[:n]]) < 1e-6
+
+
+def test_implied_volatility_edge_cases():
+    s, k, t = 10_000.0, 10_000.0, 30 / DAYS_IN_YEAR
+    price = float(black_scholes_price(s, k, t, R, 0.5, True))
+    cases = {
+        "expired": (price, s, k, 0.0),
+        "zero price": (0.0, s, k, t),
+        "negative price": (-price, s, k, t),
+        "above the upper bound": (s + 1, s, k, t),
+        "zero underlying": (price, 0.0, k, t),
+    }
+    prices, spots, strikes, times = map(np.array, zip(*cases.values()))
+    assert np.isnan(implied_volatility(prices, spots, strikes, times, R, True)).all()
+    assert implied_volatility(price, s, k, t, R, True) == pytest.approx(0.5)
+
+
+def test_implied_volatility_that_does_not_converge_is_nan(contracts):
+    s, k, t, sigma, is_call = (contracts[key] for key in ("s", "k", "t", "sigma", "is_call"))
+    price = black_scholes_price(s, k, t, R, sigma, is_call)
+    converged = implied_volatility(price, s, k, t, R, is_call)
+    one_step = implied_volatility(price, s, k, t, R, is_call, max_iter=1)
+    assert np.isnan(one_step).sum() > np.isnan(converged).sum()
+    finite = ~np.isnan(one_step)
+    assert np.allclose(one_step[finite], converged[finite], atol=1e-9)
+
+
+def test_price_options_leaves_expired_and_unquoted_contracts_nan():
+    market_data = clean_entire_market_data(make_market_watch_payload(20))
+    market_data.loc[0, "days_to_maturity"] = 0
+    market_data.loc[1, ["bid_price", "ask_price", "last_price"]] = 0
+    output = price_options(market_data, risk_free_rate=R)
+    assert output.loc[[0, 1], "iv"].isna().all()
+    assert np.isnan(black_scholes_greeks(1.0, 1.0, 0.1, R, np.nan, True)["delta"])
@@ -0,0 +1,11 @@
+from benchmarks.screen_market import LegacyOptionMarket, screen
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.use_case.screen_market import OptionMarket
+
+
+def test_contracts_without_an_underlying_ticker_are_skipped():
+    market_data = clean_entire_market_data(make_market_watch_payload(200))
+    market_data.loc[::3, "ua_ticker"] = None
+
+    assert screen(OptionMarket(market_data)) == screen(LegacyOptionMarket(market_data))
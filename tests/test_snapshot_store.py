@@ -0,0 +1,39 @@
+import pandas as pd
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.storage.snapshot_store import SnapshotStore
+
+START = pd.Timestamp("2025-01-05 09:00")
+
+
+def test_one_file_per_snapshot(tmp_path):
+    data = clean_entire_market_data(make_market_watch_payload(300))
+    store = SnapshotStore(tmp_path)
+    for minute in range(3):
+        store.append(data, START + pd.Timedelta(minutes=minute))
+    store.append(clean_entire_market_data(make_market_watch_payload(300), compact=True), START + pd.Timedelta(hours=1))
+
+    assert len(list(tmp_path.rglob("*.parquet"))) == 4
+    assert len(store.snapshot_times()) == 4
+
+    ua_tse_code = data["ua_tse_code"].iloc[0]
+    history = store.read(columns=["tse_code", "last_price"], ua_tse_codes=[ua_tse_code],
+                         start=START + pd.Timedelta(minutes=1))
+    expected = data.loc[data["ua_tse_code"] == ua_tse_code, "tse_code"]
+    assert len(history) == 3 * len(expected)
+    assert set(history["tse_code"]) == set(expected)
+
+
+def test_reads_every_column_across_compact_and_plain_snapshots(tmp_path):
+    data = clean_entire_market_data(make_market_watch_payload(100))
+    store = SnapshotStore(tmp_path)
+    store.append(clean_entire_market_data(make_market_watch_payload(100), compact=True), START)
+    store.append(data, START + pd.Timedelta(minutes=1))
+
+    history = store.read()
+    assert len(history) == 2 * len(data)
+    compact, plain = (frame.drop(columns="snapshot_time").reset_index(drop=True)
+                      for _, frame in history.groupby("snapshot_time"))
+    pd.testing.assert_frame_equal(compact, plain)
+    assert (plain["end_date"] == data.sort_values(["ua_tse_code", "tse_code"])["end_date"].to_numpy()).all()
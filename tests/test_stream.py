@@ -0,0 +1,108 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.transport import Transport
+from tseopt.data_source.tsetmc.api import get_all_options_data
+from tseopt.data_source.tsetmc.stream import ColumnBuffers, iter_json_array_items
+
+KEY = "instrumentOptMarketWatch"
+PAYLOAD = make_market_watch_payload(50)
+
+
+def _body(items) -> bytes:
+    return json.dumps({"status": "ok", KEY: items}, ensure_ascii=False).encode()
+
+
+def _split(body: bytes, size: int) -> list[bytes]:
+    return [body[start: start + size] for start in range(0, len(body), size)]
+
+
+class MarketWatchServer:
+    """
+    Serves `body` for every market-watch request with chunked transfer encoding, `chunk_size` bytes
+    per chunk, like the live endpoint does for a large payload.
+    """
+
+    def __init__(self, body: bytes, chunk_size: int = 7) -> None:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in _split(server.body, chunk_size):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        self.body = body
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def transport(self) -> Transport:
+        base = f"http://127.0.0.1:{self._server.server_port}"
+
+        class LocalTransport(Transport):
+            def request(self, method: str, url: str, **kwargs):
+                return super().request(method, url.replace("https://cdn.tsetmc.com", base), **kwargs)
+
+        return LocalTransport(retries=0)
+
+    def __enter__(self) -> "MarketWatchServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 10_000_000])
+def test_tokens_split_across_chunks(size):
+    # Persian tickers put multi-byte characters on the chunk boundaries as well.
+    assert list(iter_json_array_items(_split(_body(PAYLOAD), size), KEY)) == PAYLOAD
+
+
+@pytest.mark.parametrize("items", [None, []])
+def test_null_or_empty_array(items):
+    assert list(iter_json_array_items(_split(_body(items), 3), KEY)) == []
+
+
+@pytest.mark.parametrize("cut", [10, len(_body(PAYLOAD)) // 2, len(_body(PAYLOAD)) - 3])
+def test_truncated_stream_raises(cut):
+    with pytest.raises(ValueError):
+        list(iter_json_array_items(_split(_body(PAYLOAD)[:cut], 5), KEY))
+
+
+def test_column_buffers_align_missing_fields():
+    buffers = ColumnBuffers().extend([{"a": 1}, {"a": 2, "b": 3}, {"b": 4}])
+    assert buffers.columns == {"a": [1, 2, None], "b": [None, 3, 4]}
+    assert len(buffers) == 3
+
+
+@pytest.mark.parametrize("items", [PAYLOAD, []])
+def test_streamed_frame_equals_the_loaded_one(items):
+    with MarketWatchServer(_body(items)) as server:
+        transport = server.transport
+        pd.testing.assert_frame_equal(
+            get_all_options_data(stream=True, transport=transport), get_all_options_data(transport=transport)
+        )
+
+
+def test_truncated_response_raises():
+    with MarketWatchServer(_body(PAYLOAD)[:-100]) as server:
+        with pytest.raises(ValueError):
+            get_all_options_data(stream=True, transport=server.transport)
@@ -0,0 +1,55 @@
+import json
+from urllib.parse import unquote
+
+import pytest
+import requests
+
+from benchmarks.synthetic import make_tadbir_detail_payload
+from tseopt.data_source.tadbir.api import BulkDataError, Tadbir, TadbirCleanedData
+
+
+class FailingTransport:
+    """
+    Fails every Tadbir bulk request that asks for an ISIN in `failing` and echoes the other ISINs.
+    """
+
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = failing
+
+    def get(self, url: str, **kwargs):
+        isins = json.loads(unquote(url.split("?", 1)[1]))["arr"].split(",")
+        if self.failing.intersection(isins):
+            raise requests.ConnectionError(url)
+
+        class Response:
+            def raise_for_status(self) -> None:
+                pass
+
+            def json(self) -> list[dict]:
+                return [{"nc": isin} for isin in isins]
+
+        return Response()
+
+
+@pytest.mark.parametrize("chunk_size", [2, 10])
+def test_failed_chunks_raise_bulk_data_error(chunk_size):
+    tadbir = Tadbir(transport=FailingTransport({"A"}))
+    with pytest.raises(BulkDataError) as error:
+        tadbir.get_last_bulk_data_chunks(["A", "B", "C", "D"], chunk_size=chunk_size)
+    assert list(error.value.errors) == [(0, min(chunk_size, 4))]
+    assert isinstance(error.value.errors[(0, min(chunk_size, 4))], requests.ConnectionError)
+    assert error.value.chunks[0] is None
+    if chunk_size == 2:
+        assert error.value.chunks[1] == [{"nc": "C"}, {"nc": "D"}]
+
+
+def test_no_isins_make_no_requests():
+    assert Tadbir(transport=FailingTransport({"A"})).get_last_bulk_data_chunks([]) == []
+
+
+def test_order_book_frame_is_indexed_by_isin_and_level():
+    details = {isin: make_tadbir_detail_payload(isin, n_levels=3) for isin in ("A", "B")}
+    order_book = TadbirCleanedData._order_book_frame(details)
+    assert order_book.index.names == ["isin", "level"]
+    assert order_book.index.tolist() == [(isin, level) for isin in ("A", "B") for level in (1, 2, 3)]
+    assert "NSCCode" not in order_book.columns
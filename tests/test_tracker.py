@@ -0,0 +1,53 @@
+import copy
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.tracker import MarketWatchTracker
+from tseopt.use_case.options_chains import Chains
+
+
+def _tracked_chains(raw_data):
+    tracker = MarketWatchTracker()
+    chains = Chains(tracker.apply(raw_data).snapshot)
+    tracker.subscribe(chains.apply_delta)
+    return tracker, chains
+
+
+def test_quote_change_is_not_structural():
+    raw_data = make_market_watch_payload(200, n_underlyings=4)
+    tracker, chains = _tracked_chains(raw_data)
+    ua_tse_code = chains.ua_tse_codes[0]
+    chains.options(ua_tse_code)
+
+    updated = copy.deepcopy(raw_data)
+    updated[0]["pMeDem_C"] += 10
+    delta = tracker.apply(updated)
+
+    assert not delta.structure_changed
+    tse_code = updated[0]["insCode_C"]
+    options = chains.options(updated[0]["uaInsCode"])
+    assert options.loc[tse_code, "bid_price"] == updated[0]["pMeDem_C"]
+
+
+def test_key_column_change_moves_the_contract():
+    raw_data = make_market_watch_payload(200, n_underlyings=4)
+    tracker, chains = _tracked_chains(raw_data)
+    ua_tse_code = raw_data[0]["uaInsCode"]
+    old_end_date = raw_data[0]["endDate"]
+    chains.options(ua_tse_code)
+
+    updated = copy.deepcopy(raw_data)
+    updated[0]["endDate"] = "20991231"
+    delta = tracker.apply(updated)
+
+    assert delta.structure_changed
+    chains_by_date = {
+        end_date: set(chain["tse_code"])
+        for code, end_date, chain in chains.iter_date_chains()
+        if code == ua_tse_code
+    }
+    moved = {updated[0]["insCode_C"], updated[0]["insCode_P"]}
+    assert chains_by_date["20991231"] == moved
+    assert not moved & chains_by_date[old_end_date]
+
+    options = chains.options(ua_tse_code)
+    assert set(options["tse_code"].iloc[-2:]) == moved
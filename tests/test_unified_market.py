@@ -0,0 +1,117 @@
+import copy
+import json
+import threading
+from urllib.parse import unquote
+
+import requests
+
+from benchmarks.synthetic import make_market_watch_payload, make_tadbir_bulk_payload
+from tseopt.storage.isin_index import ISINIndex
+from tseopt.use_case.unified_market import UnifiedOptionMarket
+
+PAYLOAD = make_market_watch_payload(5)
+TSE_CODES = [record["insCode" + suffix] for record in PAYLOAD for suffix in ("_C", "_P")]
+
+
+class FakeResponse:
+    def __init__(self, payload) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeMarketTransport:
+    """
+    Answers the TSETMC market watch and instrument info, and Tadbir bulk quotes, locally. The
+    instrument info of the codes in `broken` fails, and so does every Tadbir chunk holding an ISIN
+    in `failing`; Tadbir quotes the bid prices in `bids`. Every requested code is recorded.
+    """
+
+    def __init__(self, broken: tuple[str, ...] = ()) -> None:
+        self.payload = copy.deepcopy(PAYLOAD)
+        self.broken = set(broken)
+        self.failing: set[str] = set()
+        self.bids: dict[str, float] = {}
+        self.info_requests: list[str] = []
+        self.quoted: list[str] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        if "GetInstrumentOptionMarketWatch" in url:
+            return FakeResponse({"instrumentOptMarketWatch": copy.deepcopy(self.payload)})
+        if "GetInstrumentInfo" in url:
+            tse_code = url.rsplit("/", 1)[-1]
+            with self._lock:
+                self.info_requests.append(tse_code)
+            if tse_code in self.broken:
+                raise requests.ConnectionError(tse_code)
+            return FakeResponse({"instrumentInfo": {"instrumentID": f"IR{tse_code}"}})
+        isins = json.loads(unquote(url.split("?", 1)[1]))["arr"].split(",")
+        if self.failing.intersection(isins):
+            raise requests.ConnectionError(",".join(isins))
+        with self._lock:
+            self.quoted += isins
+        records = make_tadbir_bulk_payload(len(isins))
+        for record, isin in zip(records, isins):
+            record |= {"nc": isin, "ic": isin[2:]}
+            if isin in self.bids:
+                record["bbp"] = self.bids[isin]
+        return FakeResponse(records)
+
+
+def test_first_refresh_quotes_the_persisted_isins_without_resolving(tmp_path):
+    path = tmp_path / "isin_index.json"
+    path.write_text(json.dumps({tse_code: f"IR{tse_code}" for tse_code in TSE_CODES}))
+    transport = FakeMarketTransport()
+
+    market = UnifiedOptionMarket(isin_index=ISINIndex(path, transport=transport), transport=transport)
+    data = market.refresh()
+
+    assert transport.info_requests == []
+    assert sorted(transport.quoted) == sorted(f"IR{tse_code}" for tse_code in TSE_CODES)
+    assert data["tadbir_updated_at"].notna().all()
+
+
+def test_unresolved_codes_are_retried_after_a_backoff():
+    broken = TSE_CODES[0]
+    transport = FakeMarketTransport(broken=(broken,))
+    index = ISINIndex(retry_delay=3600, transport=transport)
+    market = UnifiedOptionMarket(isin_index=index, transport=transport)
+
+    market.refresh()
+    market.refresh()
+    assert sorted(transport.info_requests) == sorted(TSE_CODES)
+    assert broken not in index
+
+    index._failures[broken] = (1, 0.0)  # the retry delay has passed
+    transport.broken.clear()
+    data = market.refresh()
+    assert transport.info_requests.count(broken) == 2
+    assert data.loc[broken, "isin"] == f"IR{broken}"
+
+
+def test_a_failed_chunk_does_not_make_its_old_quotes_new():
+    tse_code = TSE_CODES[0]
+    isin = f"IR{tse_code}"
+    transport = FakeMarketTransport()
+    transport.payload[0]["pMeDem_C"] = 1000
+    transport.bids[isin] = 1000
+    market = UnifiedOptionMarket(chunk_size=2, transport=transport)
+    market.refresh()
+    market.refresh()
+
+    # TSETMC moves the bid while the Tadbir chunk of the contract fails ...
+    transport.payload[0]["pMeDem_C"] = 4242
+    transport.failing.add(isin)
+    assert market.refresh().loc[tse_code, "bid_price"] == 4242
+    assert "tadbir" in market.last_errors
+
+    # ... and the recovered chunk still quotes the old bid, which must not win.
+    transport.failing.clear()
+    data = market.refresh()
+    assert data.loc[tse_code, "bid_price"] == 4242
+    assert market.field_sources.loc[tse_code, "bid_price"] == "tsetmc"
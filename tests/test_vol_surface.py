@@ -0,0 +1,50 @@
+import pytest
+
+from benchmarks.synthetic import make_market_watch_payload
+from tseopt.data_source.tsetmc.api import clean_entire_market_data
+from tseopt.use_case import vol_surface
+from tseopt.use_case.options_chains import Chains
+from tseopt.use_case.vol_surface import VolatilitySurface
+
+CHAINS = Chains(clean_entire_market_data(make_market_watch_payload(600, n_underlyings=5)))
+
+
+def test_unchanged_quotes_are_not_refitted():
+    surface = VolatilitySurface(max_workers=1)
+    assert len(surface.update(CHAINS)) == 5
+    assert surface.update(CHAINS) == []
+
+
+def test_a_failed_fit_is_retried(monkeypatch):
+    surface = VolatilitySurface(max_workers=1)
+    fit_underlying = vol_surface.fit_underlying
+    calls = []
+
+    def failing(task):
+        calls.append(task[0])
+        if len(calls) == 2:
+            raise RuntimeError("fit failed")
+        return fit_underlying(task)
+
+    monkeypatch.setattr(vol_surface, "fit_underlying", failing)
+    with pytest.raises(RuntimeError):
+        surface.update(CHAINS)
+    assert len(surface.ua_tse_codes) == 1
+
+    monkeypatch.setattr(vol_surface, "fit_underlying", fit_underlying)
+    assert sorted(surface.update(CHAINS)) == sorted(set(CHAINS.ua_tse_codes) - {calls[0]})
+    assert len(surface.ua_tse_codes) == 5
+
+
+def test_a_non_finite_fit_is_retried(monkeypatch):
+    surface = VolatilitySurface(max_workers=1)
+    fit_underlying = vol_surface.fit_underlying
+
+    def diverging(task):
+        ua_tse_code, smiles = fit_underlying(task)
+        return ua_tse_code, [smile._replace(rmse=float("nan")) for smile in smiles]
+
+    monkeypatch.setattr(vol_surface, "fit_underlying", diverging)
+    surface.update(CHAINS)
+    monkeypatch.setattr(vol_surface, "fit_underlying", fit_underlying)
+    assert len(surface.update(CHAINS)) == 5
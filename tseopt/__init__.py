@@ -1,4 +1,9 @@
 from tseopt.data_source.mercantile_exchange.api import make_a_mercantile_data_object
 from tseopt.data_source.tadbir.api import tadbir_api
 from tseopt.data_source.tsetmc.api import get_all_options_data
+from tseopt.data_source.tsetmc.tracker import MarketWatchTracker
+from tseopt.data_source.tsetmc.trading_calendar import TradingCalendar
 from tseopt.data_source.tsetmc.limit_order_book.api import fetch_historical_lob, take_lob_screenshot
+from tseopt.data_source.tsetmc.limit_order_book.replay import LOBReplay
+from tseopt.data_source.tsetmc.limit_order_book.book_array import LOBArray
+from tseopt.data_source.tsetmc.limit_order_book.async_api import fetch_historical_lob_many
@@ -1,15 +1,19 @@
 import time
 
-import requests
+import pandas as pd
 
-from tseopt.data_source.mercantile_exchange import schema
+from tseopt.data_source.mercantile_exchange import frames, schema
 from tseopt.data_source.mercantile_exchange.descriptor import Token
+from tseopt.data_source.transport import Transport, default_transport
 
 
 class MercantileExchangeAPI:
 
     _BASE_URL: str = "https://cdn.ime.co.ir/realTimeServer/"
 
+    def __init__(self, transport: Transport = default_transport) -> None:
+        self._transport = transport
+
     @property
     def _timestamp(self) -> str:
         return str(time.time()).replace(".", "")[:13]
@@ -20,7 +24,7 @@ class MercantileExchangeAPI:
 
     def _send_request(self, action: str, method: str, **kwargs) -> schema.APIResponse:
         url = self._BASE_URL + action
-        response = requests.request(method=method, url=url, **kwargs)
+        response = self._transport.request(method=method, url=url, **kwargs)
         response.raise_for_status()
         return response.json()
 
@@ -88,21 +92,48 @@ class MercantileExchange:
 
 
 class MercantileData:
+    """
+    The latest state of every market. Poll messages are merged into it: contracts are upserted by
+    their id, so a market or contract missing from one poll response keeps its last known state.
+    """
+
     def __init__(self, mercantile_exchange: MercantileExchange) -> None:
         self._api = mercantile_exchange
-        self._data: list[schema.Markets] = []
+        self._markets: dict[str, schema.GeneralDataType] = {}
+        self._contracts: dict[str, dict] = {}
 
     def update_data(self, timeout: int = 20) -> None:
-        self._data = self._api.get_data(timeout=timeout)
+        self.apply_messages(self._api.get_data(timeout=timeout))
+
+    def apply_messages(self, markets: list[schema.Markets] | None) -> None:
+        """
+        Merge poll messages, e.g. the `M` field of a poll response, into the market state.
+        """
+        for record in markets or []:
+            self.apply_update(record["M"], record["A"][0] if record.get("A") else None)
+
+    def apply_update(self, market_name: schema.MarketNames, data: schema.GeneralDataType) -> None:
+        """
+        Merge the data of one market, e.g. an update yielded by a MercantileExchangeFeed subscription.
+        """
+        key = schema.MARKET_KEYS.get(market_name)
+        if key is None or not isinstance(data, list):
+            self._markets[market_name] = data
+            return
+
+        contracts = self._contracts.setdefault(market_name, {})
+        for contract in data:
+            contracts[contract[key]] = contract
+        # Materialized once per update, so every property access is a dict lookup.
+        self._markets[market_name] = list(contracts.values())
 
     def _get_specific_market(self, market_name: schema.MarketNames) -> schema.GeneralDataType:
-        if self._data == []:
+        if not self._markets:
             raise ValueError("There is no data. Please ensure that you have updated the data using the update_data method.")
-        for record in self._data:
-            if record["M"] == market_name:
-                return record["A"][0]
-        else:
-            raise ValueError("Invalid market_name")
+        try:
+            return self._markets[market_name]
+        except KeyError:
+            raise ValueError("Invalid market_name") from None
 
     @property
     def gavahi(self) -> list[schema.Type1Data]:
@@ -137,11 +168,68 @@ class MercantileData:
         return self._get_specific_market("updateMarketsInfo")
 
 
+class MercantileCleanedData:
+    """
+    Typed, column-renamed DataFrames of the markets of a MercantileData object.
+
+    Every market keeps its own converter, so the numeric buffers are reused across polls. The
+    returned frames are copied out of those buffers; copy=False skips the copy, but then every
+    frame is overwritten by the next conversion of the same market (see
+    `MarketFrameConverter.convert`) and must be consumed before it.
+    """
+
+    def __init__(self, mercantile_data: MercantileData, copy: bool = True) -> None:
+        self.mercantile_data = mercantile_data
+        self._copy = copy
+        self._converters: dict[str, frames.MarketFrameConverter] = {
+            "gavahi": frames.make_type1_converter(),
+            "sandoq": frames.make_type1_converter(),
+            "salaf": frames.make_type1_converter(),
+            "cdc": frames.make_cdc_converter(),
+            "future": frames.make_future_converter(),
+            "markets_info": frames.make_market_info_converter(),
+        }
+
+    def update_data(self, timeout: int = 20) -> None:
+        self.mercantile_data.update_data(timeout=timeout)
+
+    def _convert(self, market: str) -> pd.DataFrame:
+        return self._converters[market].convert(getattr(self.mercantile_data, market), copy=self._copy)
+
+    @property
+    def gavahi(self) -> pd.DataFrame:
+        return self._convert("gavahi")
+
+    @property
+    def sandoq(self) -> pd.DataFrame:
+        return self._convert("sandoq")
+
+    @property
+    def salaf(self) -> pd.DataFrame:
+        return self._convert("salaf")
+
+    @property
+    def cdc(self) -> pd.DataFrame:
+        return self._convert("cdc")
+
+    @property
+    def future(self) -> pd.DataFrame:
+        return self._convert("future")
+
+    @property
+    def markets_info(self) -> pd.DataFrame:
+        return self._convert("markets_info")
+
+
 def make_a_mercantile_data_object() -> MercantileData:
     me = MercantileExchange(mercantile_exchange_api=_mercantile_exchange_api)
     return MercantileData(me)
 
 
+def make_a_mercantile_cleaned_data_object(copy: bool = True) -> MercantileCleanedData:
+    return MercantileCleanedData(make_a_mercantile_data_object(), copy=copy)
+
+
 if __name__ == "__main__":
     md = make_a_mercantile_data_object()
     md.update_data()
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from tseopt.data_source.mercantile_exchange import schema
+from tseopt.data_source.mercantile_exchange.api import (
+    MercantileExchange, MercantileExchangeAPI, _mercantile_exchange_api
+)
+
+logger = logging.getLogger(__name__)
+
+MarketUpdate = tuple[schema.MarketNames, schema.GeneralDataType]
+
+
+def _coalesce(market_name: str, pending: schema.GeneralDataType, data: schema.GeneralDataType) -> schema.GeneralDataType:
+    """
+    Merge a market update into an unconsumed one: contracts are upserted by their id, as
+    `MercantileData.apply_update` does; markets without contracts keep the newer data.
+    """
+    key = schema.MARKET_KEYS.get(market_name)
+    if key is None or not isinstance(pending, list) or not isinstance(data, list):
+        return data
+    contracts = {contract[key]: contract for contract in pending}
+    contracts.update((contract[key], contract) for contract in data)
+    return list(contracts.values())
+
+
+class MarketSubscription:
+    """
+    Async iterator over the (market_name, data) updates of the subscribed markets.
+
+    Updates are partial, so none is dropped: at most one update per market is pending, and a new
+    update of a market the consumer has not read yet is merged into the pending one. A slow consumer
+    therefore sees fewer but complete updates, and the buffer is bounded by the number of markets.
+    Feed every update into `MercantileData.apply_update` to keep the full state of the markets.
+    """
+
+    def __init__(self, market_names: Iterable[schema.MarketNames] | None) -> None:
+        self.market_names = frozenset(market_names) if market_names is not None else None
+        self._pending: dict[str, schema.GeneralDataType] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._error: BaseException | None = None
+
+    def wants(self, market_name: str) -> bool:
+        return self.market_names is None or market_name in self.market_names
+
+    def put(self, market_name: schema.MarketNames, data: schema.GeneralDataType) -> None:
+        if market_name in self._pending:
+            data = _coalesce(market_name, self._pending[market_name], data)
+        self._pending[market_name] = data
+        self._ready.set()
+
+    def close(self, error: BaseException | None = None) -> None:
+        """
+        End the iteration once the pending updates are consumed; with `error`, raise it instead.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        self._ready.set()
+
+    def __aiter__(self) -> "MarketSubscription":
+        return self
+
+    async def __anext__(self) -> MarketUpdate:
+        while not self._pending:
+            if self._closed:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        market_name = next(iter(self._pending))
+        return market_name, self._pending.pop(market_name)
+
+
+class MercantileExchangeFeed:
+    """
+    Runs the SignalR negotiate/connect/start/poll loop of the Mercantile Exchange in the background
+    and publishes every market update to the subscribers.
+
+    The blocking long-poll requests run in a worker thread, so the event loop is never parked in I/O.
+    The connection is re-established with exponential backoff whenever a request or a response
+    fails (the error is logged and kept in `last_error`) or the server asks the client to reconnect
+    (e.g. an expired connection token). If the loop itself ever stops on an error, every
+    subscription raises it instead of waiting forever.
+
+    Updates carry only the contracts that changed; merge them into a MercantileData to keep the
+    full state of the markets.
+
+    Examples:
+    --------
+    >>> mercantile_data = MercantileData(mercantile_exchange=None)
+    >>> async with MercantileExchangeFeed() as feed:
+    ...     async for market_name, data in feed.subscribe(["updateFutureMarketsInfo"]):
+    ...         mercantile_data.apply_update(market_name, data)
+    ...         print(len(mercantile_data.future))
+    """
+
+    def __init__(
+            self,
+            mercantile_exchange_api: MercantileExchangeAPI = _mercantile_exchange_api,
+            poll_timeout: int = 20,
+            reconnect_delay: float = 1.0,
+            max_reconnect_delay: float = 30.0
+    ) -> None:
+        self._api = mercantile_exchange_api
+        self._poll_timeout = poll_timeout
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._subscriptions: list[MarketSubscription] = []
+        self._task: asyncio.Task | None = None
+        self._failure: BaseException | None = None
+        self.reconnects = 0
+        self.last_error: Exception | None = None
+
+    def subscribe(self, market_names: Iterable[schema.MarketNames] | None = None) -> MarketSubscription:
+        """
+        Subscribe to the updates of `market_names` (all markets by default).
+        """
+        subscription = MarketSubscription(market_names)
+        if self._failure is not None:
+            subscription.close(self._failure)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: MarketSubscription) -> None:
+        self._subscriptions.remove(subscription)
+        subscription.close()
+
+    def _publish(self, markets: list[schema.Markets]) -> None:
+        for record in markets or []:
+            market_name = record.get("M")
+            data = record["A"][0] if record.get("A") else None
+            for subscription in self._subscriptions:
+                if subscription.wants(market_name):
+                    subscription.put(market_name, data)
+
+    def _connect(self) -> MercantileExchange:
+        exchange = MercantileExchange(mercantile_exchange_api=self._api)
+        exchange._initialize_tokens()
+        return exchange
+
+    async def _run(self) -> None:
+        exchange = None
+        delay = self._reconnect_delay
+        while True:
+            try:
+                if exchange is None:
+                    exchange = await asyncio.to_thread(self._connect)
+                response: schema.PollResponse = await asyncio.to_thread(
+                    self._api.send_poll_request,
+                    exchange.connection_token,
+                    message_id=exchange.message_id,
+                    timeout=self._poll_timeout,
+                )
+                if response.get("C"):
+                    exchange.message_id = response["C"]
+                self._publish(response.get("M"))
+            except Exception as e:
+                # Expired tokens (HTTP errors), failed negotiations and malformed responses alike.
+                logger.warning("Mercantile Exchange feed failed, reconnecting in %.1f s: %r", delay, e)
+                self.last_error = e
+                exchange = None
+                self.reconnects += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._max_reconnect_delay)
+                continue
+
+            delay = self._reconnect_delay
+            if response.get("D") or response.get("T"):
+                # The server dropped the connection or asks for a reconnect.
+                exchange = None
+                self.reconnects += 1
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self._failure = task.exception()
+        logger.error("Mercantile Exchange feed stopped: %r", self._failure)
+        for subscription in self._subscriptions:
+            subscription.close(self._failure)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._failure = None
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            self._task.add_done_callback(self._on_done)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # Already logged and raised to the subscribers by _on_done.
+                pass
+            self._task = None
+        for subscription in self._subscriptions:
+            subscription.close()
+
+    async def __aenter__(self) -> "MercantileExchangeFeed":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
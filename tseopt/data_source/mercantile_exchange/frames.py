@@ -0,0 +1,131 @@
+import types
+from typing import Union, get_args, get_origin, get_type_hints
+
+import numpy as np
+import pandas as pd
+
+from tseopt.data_source.mercantile_exchange import schema
+
+_NUMERIC_DTYPES: dict[type, np.dtype] = {int: np.dtype(np.int64), float: np.dtype(np.float64), bool: np.dtype(bool)}
+
+
+def _column_kind(field: str, annotation) -> np.dtype | str:
+    """
+    The dtype of a field: int64/float64/bool for numbers, float64 for optional numbers (None -> NaN),
+    "category" for low-cardinality text and "object" for any other text.
+    """
+    optional = get_origin(annotation) in (Union, types.UnionType) and type(None) in get_args(annotation)
+    if optional:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if annotation in _NUMERIC_DTYPES:
+        if optional or annotation is float:
+            return np.dtype(np.float64)
+        return _NUMERIC_DTYPES[annotation]
+    if field.strip("_").endswith(schema.CATEGORICAL_FIELD_SUFFIXES):
+        return "category"
+    return "object"
+
+
+class MarketFrameConverter:
+    """
+    Converts the contract list of one market into a typed, column-renamed DataFrame.
+
+    The field -> (column, dtype) mapping is compiled once from the market's TypedDict. Every numeric
+    column is converted straight into a new array, or with `copy=False` into preallocated arrays that
+    are reused by every poll and only grow when a market gets more contracts. An int column holding
+    fractional values becomes float64 rather than truncated.
+    """
+
+    def __init__(self, typed_dict: type, column_names: dict[str, str]) -> None:
+        annotations = get_type_hints(typed_dict)
+        self._columns: list[tuple[str, str, np.dtype | str]] = [
+            (field, column_names[field], _column_kind(field, annotations[field])) for field in annotations
+        ]
+        self._buffers: dict[str, np.ndarray] = {}
+        self._capacity = 0
+
+    @property
+    def dtypes(self) -> dict[str, np.dtype | str]:
+        return {column: kind for _, column, kind in self._columns}
+
+    def _reserve(self, n: int) -> None:
+        if n <= self._capacity:
+            return
+        self._capacity = max(n, 2 * self._capacity)
+        self._buffers = {
+            column: np.empty(self._capacity, dtype=kind)
+            for _, column, kind in self._columns if isinstance(kind, np.dtype)
+        }
+
+    def _fill(self, column: str, kind: np.dtype, values: list, reuse: bool) -> np.ndarray:
+        """
+        The values as an array of `kind`, written into the column's reusable buffer if `reuse` is True.
+        """
+        if kind.kind == "f" or None not in values:
+            try:
+                if kind.kind == "i":
+                    array = np.asarray(values)
+                    if array.dtype.kind == "f" and not np.array_equal(array, np.trunc(array)):
+                        # Fractional values in a field declared as int: keep them instead of truncating.
+                        return array
+                    values = array
+                if not reuse:
+                    return np.asarray(values, dtype=kind)
+                buffer = self._buffers[column]
+                buffer[:len(values)] = values
+                return buffer[:len(values)]
+            except (TypeError, ValueError):
+                pass
+        # Missing or malformed values in the column: fall back to float64 with NaN.
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+    def convert(self, records: list[dict] | None, copy: bool = True) -> pd.DataFrame:
+        """
+        Parameters:
+        ----------
+        records : list[dict] | None
+            The contracts of the market, as returned by MercantileData.
+        copy : bool
+            Give the frame its own numeric columns. With copy=False they are written into the
+            converter's reusable buffers instead, which saves an allocation per column and poll.
+            Warning: with copy=False the numeric columns of the returned frame are views of the
+            converter's buffers and are overwritten by the next conversion, while its text columns
+            keep their values, so an old frame silently mixes two polls. Only use it when the frame
+            is consumed before the next conversion.
+
+        Returns:
+        -------
+        pd.DataFrame
+            One row per contract and one column per field of the market schema, in schema order.
+        """
+        records = records or []
+        if not copy:
+            self._reserve(len(records))
+        data = {}
+        for field, column, kind in self._columns:
+            values = [record.get(field) for record in records]
+            if isinstance(kind, np.dtype):
+                if kind.kind == "f":
+                    values = [np.nan if value is None else value for value in values]
+                data[column] = self._fill(column, kind, values, reuse=not copy)
+            elif kind == "category":
+                data[column] = pd.Categorical(values)
+            else:
+                data[column] = np.array(values, dtype=object)
+        return pd.DataFrame(data, copy=False)
+
+
+def make_type1_converter() -> MarketFrameConverter:
+    return MarketFrameConverter(schema.Type1Data, schema.TYPE1_COLUMN_NAMES)
+
+
+def make_cdc_converter() -> MarketFrameConverter:
+    return MarketFrameConverter(schema.CDCData, schema.CDC_COLUMN_NAMES)
+
+
+def make_future_converter() -> MarketFrameConverter:
+    return MarketFrameConverter(schema.FutureData, schema.FUTURE_COLUMN_NAMES)
+
+
+def make_market_info_converter() -> MarketFrameConverter:
+    return MarketFrameConverter(schema.UpdateMarketInfo, schema.MARKET_INFO_COLUMN_NAMES)
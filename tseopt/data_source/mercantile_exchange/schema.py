@@ -1,4 +1,5 @@
-from typing import TypedDict, Literal, TypeAlias
+import re
+from typing import TypedDict, Literal, TypeAlias, get_type_hints
 
 
 class NegotiateResponse(TypedDict):
@@ -419,6 +420,15 @@ MarketNames: TypeAlias = Literal[
 
 GeneralDataType: TypeAlias = list[Type1Data | CDCData | FutureData | UpdateMarketInfo] | None | AllMarketData
 
+# The field identifying a contract in the markets whose data is a list of contracts
+MARKET_KEYS: dict[str, str] = {
+    "updateGavahiMarketsInfo": "ID",
+    "updateSandoqMarketsInfo": "ID",
+    "updateSalafMarketsInfo": "ID",
+    "updateCDCMarketsInfo": "ContractID",
+    "updateFutureMarketsInfo": "ContractID",
+}
+
 
 class Markets(TypedDict):
     H: Literal["marketsHub"]
@@ -432,3 +442,29 @@ class PollResponse(TypedDict):
 
 
 APIResponse = NegotiateResponse | ConnectResponse | StartResponse | PollResponse
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name.strip("_")).lower().replace("__", "_")
+
+
+def _column_names(typed_dict: type) -> dict[str, str]:
+    """
+    Map every field of `typed_dict` to a snake_case column name. Fields that only differ by a
+    leading underscore (e.g. `_StrikeLevel` and `StrikeLevel`) keep the underscore on the duplicate.
+    """
+    fields = sorted(get_type_hints(typed_dict), key=lambda field: field.startswith("_"))
+    names: dict[str, str] = {}
+    for field in fields:
+        name = _snake_case(field)
+        names[field] = name if name not in names.values() else "_" + name
+    return names
+
+
+TYPE1_COLUMN_NAMES: dict[str, str] = _column_names(Type1Data)
+CDC_COLUMN_NAMES: dict[str, str] = _column_names(CDCData)
+FUTURE_COLUMN_NAMES: dict[str, str] = _column_names(FutureData)
+MARKET_INFO_COLUMN_NAMES: dict[str, str] = _column_names(UpdateMarketInfo)
+
+# Low-cardinality text fields, stored as categoricals
+CATEGORICAL_FIELD_SUFFIXES: tuple[str, ...] = ("Desc", "Color", "Color1", "Visibility", "Category", "Group")
@@ -1,13 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from operator import itemgetter
+
 import pandas as pd
 import requests
 
 from tseopt.data_source.tadbir import schema
+from tseopt.data_source.transport import Transport, default_transport
+
+
+class BulkDataError(Exception):
+    """
+    Raised when some chunks of a bulk request failed.
+
+    Attributes:
+        errors: The exception of every failed chunk, keyed by its (start, end) slice of the ISIN list.
+        chunks: The response of every chunk in input order; None for the failed ones.
+    """
+
+    def __init__(
+            self,
+            errors: dict[tuple[int, int], Exception],
+            chunks: list[list[schema.BulkDataOutput] | None]
+    ) -> None:
+        self.errors = errors
+        self.chunks = chunks
+        failed = ", ".join(f"[{start}:{end}]" for start, end in sorted(errors))
+        super().__init__(f"Failed to fetch {len(errors)} of {len(chunks)} chunks from Tadbir: {failed}")
+
+
+class DetailDataError(Exception):
+    """
+    Raised when the detail data of some ISINs could not be fetched.
+
+    Attributes:
+        errors: The exception of every failed ISIN.
+        details: The response of every ISIN that succeeded.
+    """
+
+    def __init__(self, errors: dict[str, Exception], details: dict[str, schema.DetailDataOutput]) -> None:
+        self.errors = errors
+        self.details = details
+        super().__init__(f"Failed to fetch the detail data of {len(errors)} of "
+                         f"{len(errors) + len(details)} ISINs from Tadbir: {', '.join(sorted(errors))}")
 
 
 class Tadbir:
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Transport = default_transport, timeout: float = 10) -> None:
         self.__base_url = "https://core.tadbirrlc.com//"
+        self._transport = transport
+        self._timeout = timeout
 
     def _make_bulk_data_url(self, isin_list: list[str]) -> str:
         type_: str = "getstockprice2"
@@ -27,48 +70,105 @@ class Tadbir:
     def _get_last_bulk_data_direct(self, isin_list: list[str]) -> list[schema.BulkDataOutput]:
         url = self._make_bulk_data_url(isin_list)
         try:
-            response = requests.get(url)
+            response = self._transport.get(url, timeout=self._timeout)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"An error occurred while fetching data from Tadbir: {e}")
             raise
 
-    def get_last_bulk_data(self, isin_list: list[str]) -> list[dict]:
-        length = len(isin_list)
-        if length <= 500:
-            return self._get_last_bulk_data_direct(isin_list)
+    def get_last_bulk_data_chunks(
+            self,
+            isin_list: list[str],
+            chunk_size: int = 500,
+            max_workers: int = 4
+    ) -> list[list[schema.BulkDataOutput]]:
+        """
+        Fetch the bulk data of `isin_list` in chunks of `chunk_size` ISINs, `max_workers` chunks at a time.
 
-        response = []
-        for start in range(0, length, 500):
-            end = min(start + 500, length)
-            partial_response = self._get_last_bulk_data_direct(isin_list[start: end])
-            # print(start, end)
-            response.extend(partial_response)
-        return response
+        Returns the response of every chunk, in the order of `isin_list`.
+
+        Raises:
+            BulkDataError: If at least one chunk failed; it holds the successful chunks as well.
+        """
+        bounds = [(start, min(start + chunk_size, len(isin_list))) for start in range(0, len(isin_list), chunk_size)]
+        chunks: list[list[schema.BulkDataOutput] | None] = [None] * len(bounds)
+        errors: dict[tuple[int, int], Exception] = {}
+        if len(bounds) == 1:
+            # A single request needs no thread pool, but fails the same way.
+            try:
+                chunks[0] = self._get_last_bulk_data_direct(isin_list)
+            except requests.RequestException as e:
+                errors[bounds[0]] = e
+        elif bounds:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(bounds)))) as executor:
+                futures = {
+                    executor.submit(self._get_last_bulk_data_direct, isin_list[start: end]): (i, (start, end))
+                    for i, (start, end) in enumerate(bounds)
+                }
+                for future in as_completed(futures):
+                    i, bound = futures[future]
+                    try:
+                        chunks[i] = future.result()
+                    except requests.RequestException as e:
+                        errors[bound] = e
+
+        if errors:
+            raise BulkDataError(errors=errors, chunks=chunks)
+        return chunks
+
+    def get_last_bulk_data(self, isin_list: list[str], chunk_size: int = 500, max_workers: int = 4) -> list[dict]:
+        return list(chain.from_iterable(self.get_last_bulk_data_chunks(isin_list, chunk_size, max_workers)))
 
     def get_detail_data(self, isin: str) -> schema.DetailDataOutput:
         url = self._make_detail_data_url(isin)
         try:
-            response = requests.get(url)
+            response = self._transport.get(url, timeout=self._timeout)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"An error occurred while fetching data from Tadbir: {e}")
             raise
 
+    def get_detail_data_many(self, isins: list[str], concurrency: int = 8) -> dict[str, schema.DetailDataOutput]:
+        """
+        Fetch the detail data of `isins`, `concurrency` requests at a time.
+
+        Returns the response of every ISIN, in the order of `isins`.
+
+        Raises:
+            DetailDataError: If at least one ISIN failed; it holds the successful responses as well.
+        """
+        isins = list(dict.fromkeys(isins))
+        details: dict[str, schema.DetailDataOutput] = {}
+        errors: dict[str, Exception] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(isins)))) as executor:
+            futures = {executor.submit(self.get_detail_data, isin): isin for isin in isins}
+            for future in as_completed(futures):
+                try:
+                    details[futures[future]] = future.result()
+                except requests.RequestException as e:
+                    errors[futures[future]] = e
+
+        details = {isin: details[isin] for isin in isins if isin in details}
+        if errors:
+            raise DetailDataError(errors=errors, details=details)
+        return details
+
 
 class TadbirCleanedData:
 
     def __init__(self, tadbir: Tadbir) -> None:
         self.__tadbir = tadbir
 
-    def get_last_bulk_data(self, isin_list: list[str]) -> pd.DataFrame:
+    def get_last_bulk_data(self, isin_list: list[str], chunk_size: int = 500, max_workers: int = 4) -> pd.DataFrame:
         """
         isin_list: List of ISINs, e.g., ["IRO9AHRM6981", "IRO9AHRM6911", "IRO9IKCO81M1"]
+        chunk_size: Number of ISINs per request.
+        max_workers: Number of chunks fetched concurrently.
         """
-        raw_data = self.__tadbir.get_last_bulk_data(isin_list)
-        data = pd.DataFrame(raw_data)
+        chunks = self.__tadbir.get_last_bulk_data_chunks(isin_list, chunk_size=chunk_size, max_workers=max_workers)
+        data = pd.concat([pd.DataFrame(chunk) for chunk in chunks], ignore_index=True) if chunks else pd.DataFrame()
         return data.rename(columns=schema.BULK_DATA_COLUMN_NAMES)
 
     def get_detail_data(self, isin: str) -> dict:
@@ -85,6 +185,35 @@ class TadbirCleanedData:
         }
         return output
 
+    @staticmethod
+    def _order_book_frame(details: dict[str, schema.DetailDataOutput]) -> pd.DataFrame:
+        levels = [
+            (isin, level)
+            for isin, raw_data in details.items()
+            for level in sorted((raw_data.get("symbolqueue") or {}).get("Value") or [], key=itemgetter("Place"))
+        ]
+        # The isin column comes from the keys of `details`; the NSCCode of every level repeats it.
+        fields = [field for field in schema.OrderBookLevel.__annotations__ if field != "NSCCode"]
+        data = {"isin": [isin for isin, _ in levels]}
+        data |= {field: [level.get(field) for _, level in levels] for field in fields}
+        order_book = pd.DataFrame(data).rename(columns=schema.ORDER_BOOK_COLUMN_NAMES)
+        return order_book.set_index(["isin", "level"])
+
+    def get_detail_data_many(self, isins: list[str], concurrency: int = 8) -> dict[str, pd.DataFrame]:
+        """
+        isins: List of ISINs, e.g., ["IRO9AHRM6981", "IRO9AHRM6911"]
+        concurrency: Number of ISINs fetched concurrently.
+
+        Returns a dict with:
+            - 'symbol_info': One row per ISIN, indexed by ISIN, with the columns of get_detail_data.
+            - 'order_book': One row per ISIN and order-book level, indexed by ('isin', 'level').
+        """
+        details = self.__tadbir.get_detail_data_many(isins, concurrency=concurrency)
+        symbol_info = pd.DataFrame.from_records(
+            [raw_data["symbolinfo"] for raw_data in details.values()], index=pd.Index(list(details), name="isin")
+        ).rename(columns=schema.SYMBOL_INFO_COLUMN_NAMES)
+        return {"symbol_info": symbol_info, "order_book": self._order_book_frame(details)}
+
 
 tadbir = Tadbir()
 tadbir_api = TadbirCleanedData(tadbir)
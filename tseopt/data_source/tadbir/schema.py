@@ -206,4 +206,23 @@ SYMBOL_INFO_COLUMN_NAMES: dict[str, str] = {
     "op": "openPositionNum",
     "cs": "contractSize",
     "sp": "strikePrice",
-}
\ No newline at end of file
+}
+
+ORDER_BOOK_COLUMN_NAMES: dict[str, str] = {
+    "Place": "level",
+}
+
+
+# Cleaned bulk-data columns that have a TSETMC market-watch counterpart
+MARKET_WATCH_COLUMN_NAMES: dict[str, str] = {
+    "LastTradedPrice": "last_price",
+    "ClosingPrice": "close_price",
+    "PreClosingPrice": "yesterday_price",
+    "TotalNumberOfTrades": "trades_num",
+    "TotalNumberOfSharesTraded": "trades_volume",
+    "TotalTradeValue": "trades_value",
+    "BestBuyPrice": "bid_price",
+    "BestBuyQuantity": "bid_volume",
+    "BestSellPrice": "ask_price",
+    "BestSellQuantity": "ask_volume",
+}
@@ -0,0 +1,89 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class Transport:
+    """
+    Pooled HTTP transport shared by the data sources.
+
+    One keep-alive `requests.Session` is kept per host, so consecutive polls reuse the same
+    TCP/TLS connections. Every request gets a default timeout, gzip negotiation and
+    retry-with-backoff on connection errors and transient HTTP statuses.
+    """
+
+    def __init__(
+            self,
+            pool_size: int = 10,
+            timeout: float = 10,
+            retries: int = 3,
+            backoff_factor: float = 0.3,
+            status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504),
+    ) -> None:
+        """
+        Parameters:
+        ----------
+        pool_size : int
+            Maximum number of keep-alive connections kept per host.
+        timeout : float
+            Default timeout in seconds for requests that do not pass their own.
+        retries : int
+            Number of retries of idempotent requests; POST requests are never retried.
+        backoff_factor : float
+            Sleep `backoff_factor * 2 ** (retry - 1)` seconds between retries.
+        status_forcelist : tuple[int, ...]
+            HTTP statuses that trigger a retry.
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            raise_on_status=False,
+        )
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _make_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=self._retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        return session
+
+    def session(self, url: str) -> requests.Session:
+        """
+        Return the pooled session of the host of `url`.
+        """
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._sessions[host] = self._make_session()
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session(url).request(method=method, url=url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+default_transport = Transport()
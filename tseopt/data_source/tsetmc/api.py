@@ -1,17 +1,33 @@
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+from operator import itemgetter
+from typing import get_type_hints
+
+import numpy as np
 import pandas as pd
 import requests
 from fake_useragent import UserAgent
 
+from tseopt.data_source.transport import Transport, default_transport
 from tseopt.data_source.tsetmc import schema
+from tseopt.data_source.tsetmc.stream import ColumnBuffers, iter_json_array_items
 
 fake_user_agent = UserAgent()
 
 
-def fetch_option_data(market_num: schema.MarketNum, timeout: float = 10) -> list[schema.OptionData]:
-    url = f"https://cdn.tsetmc.com/api/Instrument/GetInstrumentOptionMarketWatch/{market_num}"
+def _option_market_watch_url(market_num: schema.MarketNum) -> str:
+    return f"https://cdn.tsetmc.com/api/Instrument/GetInstrumentOptionMarketWatch/{market_num}"
+
+
+def fetch_option_data(
+        market_num: schema.MarketNum,
+        timeout: float = 10,
+        transport: Transport = default_transport
+) -> list[schema.OptionData]:
+    url = _option_market_watch_url(market_num)
     headers = {'User-Agent': fake_user_agent.random}
     try:
-        response = requests.get(url=url, headers=headers, timeout=timeout)
+        response = transport.get(url=url, headers=headers, timeout=timeout)
         response.raise_for_status()
         json_response: schema.OptionDataOutput = response.json()
         return json_response.get("instrumentOptMarketWatch")
@@ -20,36 +36,251 @@ def fetch_option_data(market_num: schema.MarketNum, timeout: float = 10) -> list
         raise
 
 
-def fetch_entire_market_data(timeout: float = 10) -> list[schema.OptionData]:
-    return fetch_option_data(schema.MarketNum.BOTH, timeout=timeout)
+def stream_option_data(
+        market_num: schema.MarketNum,
+        timeout: float = 10,
+        chunk_size: int = 64 * 1024,
+        transport: Transport = default_transport
+) -> Iterator[schema.OptionData]:
+    """
+    Yield the market-watch records one by one while the response body is still being downloaded.
+    """
+    url = _option_market_watch_url(market_num)
+    headers = {'User-Agent': fake_user_agent.random}
+    try:
+        with transport.get(url=url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_json_array_items(response.iter_content(chunk_size=chunk_size), "instrumentOptMarketWatch")
+    except requests.RequestException as e:
+        print(f"An error occurred while fetching option data: {e}")
+        raise
 
 
-def clean_entire_market_data(raw_data: list[schema.OptionData]) -> pd.DataFrame:
-    df = pd.DataFrame(raw_data)
+def fetch_entire_market_data(timeout: float = 10, transport: Transport = default_transport) -> list[schema.OptionData]:
+    return fetch_option_data(schema.MarketNum.BOTH, timeout=timeout, transport=transport)
 
-    general_columns = [column for column in df.columns if (not column.endswith("_P")) and (not column.endswith("_C"))]
-    specific_columns = [column.replace("_C", "") for column in df.columns if column.endswith("_C")]
 
-    calls = df[general_columns + [column + "_C" for column in specific_columns]]
-    calls.columns = [column.replace("_C", "") for column in calls.columns]
-    calls = calls.rename(columns=schema.SPECIFIC_COLUMN_NAMES)
-    calls['option_type'] = 'call'
+def fetch_entire_market_columns(timeout: float = 10, transport: Transport = default_transport) -> dict[str, list]:
+    """
+    Stream the entire market-watch payload straight into per-field column buffers.
+    """
+    records = stream_option_data(schema.MarketNum.BOTH, timeout=timeout, transport=transport)
+    return ColumnBuffers().extend(records).columns
 
-    puts = df[general_columns + [column + "_P" for column in specific_columns]]
-    puts.columns = [column.replace("_P", "") for column in puts.columns]
-    puts = puts.rename(columns=schema.SPECIFIC_COLUMN_NAMES)
-    puts['option_type'] = 'put'
 
-    # Concatenate the calls and puts DataFrames
-    result_df = pd.concat([calls, puts], ignore_index=True)
-    result_df.rename(columns=schema.GENERAL_COLUMN_NAMES, inplace=True)
-    return result_df
+def fetch_instrument_info(
+        tse_code: str,
+        timeout: float = 10,
+        transport: Transport = default_transport
+) -> schema.InstrumentInfo:
+    """
+    Static information of one instrument, e.g. its ISIN ('instrumentID') and ticker.
+    """
+    url = f"https://cdn.tsetmc.com/api/Instrument/GetInstrumentInfo/{tse_code}"
+    headers = {'User-Agent': fake_user_agent.random}
+    try:
+        response = transport.get(url=url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        json_response: schema.InstrumentInfoOutput = response.json()
+        return json_response.get("instrumentInfo")
+    except requests.RequestException as e:
+        print(f"An error occurred while fetching instrument info: {e}")
+        raise
+
+
+_CALL_SUFFIX = "_C"
+_PUT_SUFFIX = "_P"
+OPTION_TYPES: list[str] = ["call", "put"]
+_DATE_COLUMNS = ("begin_date", "end_date")
+_DATE_FORMAT = "%Y%m%d"
+# Integer columns that are multiplied together (e.g. price * volume * contract_size) keep int64.
+_WIDE_INTEGER_COLUMNS = ("contract_size",)
+_WIDE_INTEGER_SUFFIXES = ("_price", "_volume", "_value")
 
+# numpy dtype of every raw field, resolved once from the schema annotations
+_RAW_DTYPES: dict[str, np.dtype] = {
+    key: np.dtype({int: np.int64, float: np.float64}.get(annotation, object))
+    for key, annotation in get_type_hints(schema.OptionData).items()
+}
 
-def get_all_options_data(timeout: float = 10) -> pd.DataFrame:
+
+@lru_cache(maxsize=8)
+def _market_watch_layout(
+        raw_columns: tuple[str, ...]
+) -> tuple[list[tuple[str, str]], list[tuple[str, str, str]]]:
+    """
+    Resolve the raw market-watch columns into (raw, name) pairs for the general columns and
+    (raw_call, raw_put, name) triples for the call/put specific columns.
+    The layout only depends on the payload keys, so it is computed once per distinct key set.
+    """
+    general = [
+        (column, schema.GENERAL_COLUMN_NAMES.get(column, column))
+        for column in raw_columns
+        if not column.endswith((_CALL_SUFFIX, _PUT_SUFFIX))
+    ]
+    specific = []
+    for column in raw_columns:
+        if column.endswith(_CALL_SUFFIX):
+            base = column.removesuffix(_CALL_SUFFIX)
+            specific.append((column, base + _PUT_SUFFIX, schema.SPECIFIC_COLUMN_NAMES.get(base, base)))
+    return general, specific
+
+
+def _transpose(raw_data: list[schema.OptionData]) -> dict[str, Sequence]:
+    """
+    Column-oriented view of the records over the union of their keys; a field missing from a record is None.
+    """
+    if not raw_data:
+        return {}
+    keys = tuple(raw_data[0])
+    # Records as long as the first one that hold all its keys have exactly its keys.
+    if len(set(map(len, raw_data))) == 1:
+        try:
+            return dict(zip(keys, zip(*map(itemgetter(*keys), raw_data))))
+        except KeyError:
+            pass
+    # Records with different key sets, aligned the same way as the streamed path.
+    return ColumnBuffers().extend(raw_data).columns
+
+
+def _stack(raw_column: str, first: Sequence, second: Sequence) -> np.ndarray:
+    dtype = _RAW_DTYPES.get(raw_column)
+    if dtype is None:
+        return np.concatenate((np.asarray(first), np.asarray(second)))
+
+    if dtype.kind in "iu":
+        output = np.concatenate((np.asarray(first), np.asarray(second)))
+        if output.dtype.kind in "iu":
+            return output.astype(dtype, copy=False)
+        if output.dtype.kind == "f":
+            # Fractional values in a field declared as int: keep them as floats instead of truncating.
+            return output.astype(dtype) if np.array_equal(output, np.trunc(output)) else output
+    else:
+        n = len(first)
+        output = np.empty(n + len(second), dtype=dtype)
+        try:
+            output[:n] = first
+            output[n:] = second
+            return output
+        except (TypeError, ValueError):
+            pass
+    # Missing values in a numeric field: keep them as NaN.
+    return pd.to_numeric(np.concatenate((np.asarray(first, dtype=object), np.asarray(second, dtype=object))),
+                         errors="coerce")
+
+
+def compact_market_data(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    A copy of a cleaned market-watch frame with a smaller memory footprint, for keeping many
+    snapshots in memory:
+    - 'begin_date' and 'end_date' become datetime64; unparsable dates become NaT.
+    - Text columns whose values repeat (at most half of them distinct), such as 'ua_tse_code',
+      'ua_ticker' and 'name', become categoricals.
+    - Price, volume and value columns and 'contract_size' stay int64, so products such as
+      price * volume * contract_size cannot overflow. Other integer columns (counts, days,
+      open positions) become int32 where their values fit; int32 is the floor, so sums and
+      differences of them stay safe.
+    - Float columns become float32 where that loses nothing.
+    - Text columns that are not converted keep their dtype: the Arrow-backed str dtype on pandas 3,
+      object on pandas 2, where unique identifiers such as 'tse_code' and 'ticker' stay the
+      largest columns.
+    See `memory_report` to compare the footprint with the original frame; a synthetic snapshot shrinks
+    by about 1.4x on pandas 3 and 1.8x on pandas 2.2 (benchmarks/compact_market_data.py).
+    """
+    columns = {}
+    for column in data.columns:
+        series = data[column]
+        dtype = series.dtype
+        if column in _DATE_COLUMNS:
+            columns[column] = pd.to_datetime(series, format=_DATE_FORMAT, errors="coerce")
+        elif isinstance(dtype, pd.CategoricalDtype):
+            columns[column] = series
+        elif dtype.kind in "iu":
+            wide = column in _WIDE_INTEGER_COLUMNS or column.endswith(_WIDE_INTEGER_SUFFIXES)
+            int32 = np.iinfo(np.int32)
+            fits = len(series) == 0 or (int32.min <= series.min() and series.max() <= int32.max)
+            columns[column] = series.astype(np.int32) if fits and not wide else series
+        elif dtype.kind == "f":
+            values = series.to_numpy()
+            downcast = values.astype(np.float32)
+            same = np.array_equal(downcast, values, equal_nan=True)
+            columns[column] = pd.Series(downcast, index=series.index) if same else series
+        elif pd.api.types.is_string_dtype(dtype) and 2 * series.nunique() <= len(series):
+            columns[column] = series.astype("category")
+        else:
+            columns[column] = series
+    return pd.DataFrame(columns, index=data.index)
+
+
+def memory_report(data: pd.DataFrame, baseline: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Memory footprint of every column of `data` (strings included), with a 'total' row.
+
+    If `baseline` is given, e.g. the frame `data` was compacted from, its footprint and the ratio
+    baseline / data are reported for the columns both frames have.
+    """
+    report = pd.DataFrame({
+        "dtype": data.dtypes.astype(str),
+        "bytes": data.memory_usage(index=False, deep=True),
+    })
+    report.loc["total"] = ["", report["bytes"].sum()]
+    if baseline is not None:
+        baseline_bytes = baseline.memory_usage(index=False, deep=True).reindex(report.index[:-1])
+        report["baseline_bytes"] = baseline_bytes
+        report.loc["total", "baseline_bytes"] = baseline_bytes.sum()
+        report["ratio"] = report["baseline_bytes"] / report["bytes"]
+    return report
+
+
+def clean_market_watch_columns(raw_columns: dict[str, Sequence], compact: bool = False) -> pd.DataFrame:
+    """
+    Unpivot column-oriented market-watch data (raw field name -> values) into one row per option contract.
+
+    The first half of the output holds the calls and the second half the puts, in the order of
+    the raw records. Every output column is written once into a preallocated array.
+    If `compact` is True, the frame is passed through `compact_market_data`.
+    """
+    general, specific = _market_watch_layout(tuple(raw_columns))
+    n = len(next(iter(raw_columns.values()), ()))
+
+    columns: dict[str, np.ndarray | pd.Categorical] = {}
+    for raw, name in general:
+        values = raw_columns[raw]
+        columns[name] = _stack(raw, values, values)
+    for call, put, name in specific:
+        columns[name] = _stack(call, raw_columns[call], raw_columns[put])
+    columns["option_type"] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(OPTION_TYPES), dtype=np.int8), n), categories=OPTION_TYPES
+    )
+    data = pd.DataFrame(columns, copy=False)
+    return compact_market_data(data) if compact else data
+
+
+def clean_entire_market_data(raw_data: list[schema.OptionData], compact: bool = False) -> pd.DataFrame:
+    """
+    Unpivot the raw market-watch records into one row per option contract.
+    See `clean_market_watch_columns`.
+    """
+    return clean_market_watch_columns(_transpose(raw_data), compact=compact)
+
+
+def get_all_options_data(
+        timeout: float = 10,
+        stream: bool = False,
+        transport: Transport = default_transport,
+        compact: bool = False
+) -> pd.DataFrame:
     """
     Fetch and clean the entire option market data.
 
+    Parameters:
+        timeout (float): Timeout of the request in seconds.
+        stream (bool): Decode the response incrementally into column buffers instead of loading the
+            whole JSON body first. This lowers the peak memory of a snapshot.
+        transport (Transport): The pooled HTTP transport used for the request.
+        compact (bool): Return categoricals for repeated text, datetime64 dates and narrower count and float
+            columns instead of the default dtypes, see `compact_market_data`.
+
     Returns:
         pd.DataFrame: A DataFrame containing the following columns:
             - 'contract_size': Size of the contract.
@@ -57,8 +288,8 @@ def get_all_options_data(timeout: float = 10) -> pd.DataFrame:
             - 'ua_ticker': Ticker symbol for the underlying asset used in the market.
             - 'ua_close_price': Closing price of the underlying asset.
             - 'ua_yesterday_price': Closing price of the underlying asset from the previous day.
-            - 'begin_date': Start date of the option contract.
-            - 'end_date': Expiration date of the option contract.
+            - 'begin_date': Start date of the option contract, as 'YYYYMMDD'.
+            - 'end_date': Expiration date of the option contract, as 'YYYYMMDD'.
             - 'strike_price': Strike price for the option.
             - 'days_to_maturity': Number of days remaining until expiration.
             - 'tse_code': Unique identifier for the option.
@@ -77,10 +308,12 @@ def get_all_options_data(timeout: float = 10) -> pd.DataFrame:
             - 'ask_price': Lowest price a seller is willing to accept for the option.
             - 'ask_volume': Volume of the option available at the ask price.
             - 'yesterday_open_positions': Number of open positions from the previous day.
-            - 'option_type': Type of the option (e.g., call or put).
+            - 'option_type': Type of the option, a categorical of 'call' and 'put'.
     """
-    raw_data = fetch_entire_market_data(timeout)
-    return clean_entire_market_data(raw_data)
+    if stream:
+        return clean_market_watch_columns(fetch_entire_market_columns(timeout, transport=transport), compact=compact)
+    raw_data = fetch_entire_market_data(timeout, transport=transport)
+    return clean_entire_market_data(raw_data, compact=compact)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,18 @@
 from datetime import time, date
 
-import jdatetime
+import numpy as np
 import pandas as pd
-import requests
 
+from tseopt.data_source.transport import Transport, default_transport
+from tseopt.data_source.tsetmc.trading_calendar import (
+    TRADING_WEEKDAYS, TradingCalendar, default_calendar, yyyymmdd_to_datetime64
+)
+from tseopt.storage.lob_cache import LOBCache
+from tseopt.data_source.tsetmc.limit_order_book.replay import LOBReplay
 from tseopt.data_source.tsetmc.limit_order_book.schemas import RawLOBLevel, columns_name
 
+BEST_LIMITS_URL = "https://cdn.tsetmc.com/api/BestLimits/{tse_code}/{date}"
+
 
 def convert_to_time_format(time_value: int) -> time:
     """
@@ -30,7 +37,27 @@ def convert_to_time_format(time_value: int) -> time:
     return pd.to_datetime(time_str, format='%H%M%S').time()
 
 
-def fetch_lob_data(tse_code: str, date: str) -> list[RawLOBLevel]:
+def hhmmss_to_timedelta(time_values: np.ndarray | pd.Series) -> np.ndarray:
+    """
+    Vectorized conversion of integers in HHMMSS format to time-of-day timedeltas.
+
+    Examples:
+    --------
+    >>> hhmmss_to_timedelta(np.array([90000, 123456]))
+    array([32400, 45296], dtype='timedelta64[s]')
+    """
+    time_values = np.asarray(time_values, dtype=np.int64)
+    hours, rest = np.divmod(time_values, 10000)
+    minutes, seconds = np.divmod(rest, 100)
+    return (hours * 3600 + minutes * 60 + seconds).astype("timedelta64[s]")
+
+
+def fetch_lob_data(
+        tse_code: str,
+        date: str,
+        timeout: float = 10,
+        transport: Transport = default_transport
+) -> list[RawLOBLevel]:
     """
     Fetch the limit order book data for a given TSE code and date.
 
@@ -40,6 +67,10 @@ def fetch_lob_data(tse_code: str, date: str) -> list[RawLOBLevel]:
         The TSE code for which to fetch the order book data.
     date : str
         The date for which to fetch the order book data in YYYYMMDD format.
+    timeout : float
+        Timeout of the request in seconds.
+    transport : Transport
+        The pooled HTTP transport used for the request.
 
     Returns:
     -------
@@ -64,9 +95,9 @@ def fetch_lob_data(tse_code: str, date: str) -> list[RawLOBLevel]:
       'number': 5, 'qTitMeDem': 15000, 'zOrdMeDem': 2, 'pMeDem': 25050.0, 
       'pMeOf': 26490.0, 'zOrdMeOf': 2, 'qTitMeOf': 8000, 'insCode': None}, ...]
     """
-    url = f"https://cdn.tsetmc.com/api/BestLimits/{tse_code}/{date}"
+    url = BEST_LIMITS_URL.format(tse_code=tse_code, date=date)
 
-    response = requests.get(url)
+    response = transport.get(url, timeout=timeout)
     response.raise_for_status()
 
     json_response = response.json()
@@ -82,15 +113,22 @@ def fetch_lob_data(tse_code: str, date: str) -> list[RawLOBLevel]:
 
 
 def process_raw_data(raw_data: list[RawLOBLevel]) -> pd.DataFrame:
+    """
+    Convert the raw best-limits history into a frame sorted by time and level.
+
+    The 'time' column holds the time of day as a timedelta and 'datetime' the full event timestamp.
+    """
     data = pd.DataFrame(raw_data)
     data.rename(columns=columns_name, inplace=True)
-    data['time'] = data['hEven'].apply(convert_to_time_format)
-    columns = list(columns_name.values()) + ["time"]
+    time_of_day = hhmmss_to_timedelta(data['hEven'])
+    data['time'] = time_of_day
+    data['datetime'] = yyyymmdd_to_datetime64(data['dEven']) + time_of_day
+    columns = list(columns_name.values()) + ["time", "datetime"]
     return data[columns].sort_values(by=["time", "level"]).reset_index(drop=True)
 
 
 class HistoricalLOBInput:
-    def __init__(self, tse_code: str, jalali_date: str) -> None:
+    def __init__(self, tse_code: str, jalali_date: str, calendar: TradingCalendar = default_calendar) -> None:
         """
         Parameters:
         ----------
@@ -98,6 +136,8 @@ class HistoricalLOBInput:
             The TSE code for the financial instrument.
         jalali_date : str
             The Jalali date in the format 'YYYY-MM-DD'.
+        calendar : TradingCalendar
+            The trading calendar the date is converted and validated with.
 
         Raises:
         -------
@@ -105,6 +145,7 @@ class HistoricalLOBInput:
             If the provided Jalali date is invalid or not a trading day.
         """
         self.tse_code = tse_code
+        self.calendar = calendar
         self.date = self.jalali_to_gregorian(jalali_date)
 
     def jalali_to_gregorian(self, jalali_date: str) -> str:
@@ -124,18 +165,9 @@ class HistoricalLOBInput:
         Raises:
         -------
         ValueError
-            If the date does not fall on a trading day.
+            If the date is invalid or does not fall on a trading day of the calendar.
         """
-        year, month, day = map(int, jalali_date.split('-'))
-        jalali_date_obj = jdatetime.date(year, month, day)
-
-        # Convert to Gregorian date
-        gregorian_date_obj = jalali_date_obj.togregorian()
-
-        # Validate the trading day
-        self.validate_date(gregorian_date_obj)
-
-        return gregorian_date_obj.strftime('%Y%m%d')
+        return self.calendar.validate(jalali_date)
 
     @staticmethod
     def validate_date(gregorian_date: date) -> None:
@@ -152,12 +184,19 @@ class HistoricalLOBInput:
         ValueError
             If the date is not a trading day (Saturday to Wednesday).
         """
-        weekday = gregorian_date.weekday()
-        if weekday not in [5, 0, 1, 2]:  # Saturday (5), Sunday (6), Monday (0), Tuesday (1), Wednesday (2)
+        if gregorian_date.weekday() not in TRADING_WEEKDAYS:
             raise ValueError("The date is not a trading day.")
 
 
-def fetch_historical_lob(*, tse_code: str, jalali_date: str) -> pd.DataFrame:
+def fetch_historical_lob(
+        *,
+        tse_code: str,
+        jalali_date: str,
+        timeout: float = 10,
+        transport: Transport = default_transport,
+        cache: LOBCache | None = None,
+        calendar: TradingCalendar = default_calendar
+) -> pd.DataFrame:
     """
     Parameters:
     ----------
@@ -165,15 +204,39 @@ def fetch_historical_lob(*, tse_code: str, jalali_date: str) -> pd.DataFrame:
         The TSE code for the financial instrument.
     jalali_date : str
         The Jalali date in the format 'YYYY-MM-DD'.
+    timeout : float
+        Timeout of the request in seconds.
+    transport : Transport
+        The pooled HTTP transport used for the request.
+    cache : LOBCache | None
+        On-disk cache of past days; a cached day is returned without any request.
+    calendar : TradingCalendar
+        The trading calendar the date is converted and validated with.
 
     Raises:
     -------
     ValueError
         If the provided Jalali date is invalid or not a trading day.
     """
-    inp = HistoricalLOBInput(tse_code=tse_code, jalali_date=jalali_date)
-    raw_data = fetch_lob_data(inp.tse_code, inp.date)
-    return process_raw_data(raw_data)
+    inp = HistoricalLOBInput(tse_code=tse_code, jalali_date=jalali_date, calendar=calendar)
+    return _fetch_processed_lob(inp, timeout=timeout, transport=transport, cache=cache)
+
+
+def _fetch_processed_lob(
+        inp: HistoricalLOBInput,
+        timeout: float,
+        transport: Transport,
+        cache: LOBCache | None
+) -> pd.DataFrame:
+    if cache is not None:
+        data = cache.get(inp.tse_code, inp.date)
+        if data is not None:
+            return data
+
+    data = process_raw_data(fetch_lob_data(inp.tse_code, inp.date, timeout=timeout, transport=transport))
+    if cache is not None:
+        cache.put(inp.tse_code, inp.date, data)
+    return data
 
 
 def take_lob_screenshot(entire_data: pd.DataFrame, specific_time: str) -> pd.DataFrame:
@@ -189,12 +252,9 @@ def take_lob_screenshot(entire_data: pd.DataFrame, specific_time: str) -> pd.Dat
     -------
     pd.DataFrame
 
+    Use LOBReplay directly to take many screenshots of the same day.
     """
-    specific_time += ":00"
-    specific_time_obj = pd.to_datetime(specific_time).time()
-
-    filter_lob = entire_data[entire_data["time"] <= specific_time_obj]
-    return filter_lob.groupby('level').last().reset_index()
+    return LOBReplay(entire_data).at(specific_time)
 
 
 if __name__ == "__main__":
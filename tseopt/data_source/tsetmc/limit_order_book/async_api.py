@@ -0,0 +1,140 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from tseopt.data_source.transport import Transport, default_transport
+from tseopt.data_source.tsetmc.limit_order_book.api import BEST_LIMITS_URL, HistoricalLOBInput, _fetch_processed_lob
+from tseopt.data_source.tsetmc.trading_calendar import TradingCalendar, default_calendar
+from tseopt.storage.lob_cache import LOBCache
+
+
+class HostRateLimiter:
+    """
+    Space the start of requests to the same host at least `1 / rate` seconds apart.
+    """
+
+    def __init__(self, rate: float | None) -> None:
+        """
+        Parameters:
+        ----------
+        rate : float | None
+            Maximum number of requests started per second per host; None disables the limit.
+        """
+        self._interval = 1 / rate if rate else 0.0
+        self._next_start: dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self._interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self._interval
+        await asyncio.sleep(start - now)
+
+
+async def fetch_historical_lob_many(
+        pairs: Iterable[tuple[str, str]],
+        concurrency: int = 8,
+        rate_limit: float | None = 20,
+        ordered: bool = False,
+        return_exceptions: bool = False,
+        timeout: float = 10,
+        transport: Transport = default_transport,
+        cache: LOBCache | None = None,
+        calendar: TradingCalendar = default_calendar
+) -> AsyncIterator[tuple[tuple[str, str], pd.DataFrame | Exception]]:
+    """
+    Concurrently download the historical limit order book of many (tse_code, jalali_date) pairs.
+
+    Closing the generator early (breaking out of the loop or `aclose()`) cancels the pending pairs
+    and returns at once. Requests already running in a worker thread cannot be interrupted: they
+    finish in the background within `timeout` and their results are discarded.
+
+    Parameters:
+    ----------
+    pairs : Iterable[tuple[str, str]]
+        (tse_code, jalali_date) pairs, the Jalali date in the format 'YYYY-MM-DD'.
+    concurrency : int
+        Maximum number of requests in flight. Use a transport whose pool_size is at least this
+        value so every worker keeps its own connection alive.
+    rate_limit : float | None
+        Maximum number of requests started per second against the TSETMC host.
+    ordered : bool
+        Yield the results in the order of `pairs` instead of as soon as each one completes.
+    return_exceptions : bool
+        Yield a failed pair together with its exception instead of raising it, so one missing day
+        does not abort a long backfill.
+    timeout : float
+        Timeout of every request in seconds.
+    transport : Transport
+        The pooled HTTP transport used for the requests.
+    cache : LOBCache | None
+        On-disk cache of past days; cached days are returned without any request.
+    calendar : TradingCalendar
+        The trading calendar the dates are converted and validated with.
+
+    Yields:
+    ------
+    tuple[tuple[str, str], pd.DataFrame | Exception]
+        The (tse_code, jalali_date) pair and the output of `fetch_historical_lob` for it.
+
+    Raises:
+    -------
+    ValueError
+        If one of the Jalali dates is invalid or not a trading day.
+
+    Examples:
+    --------
+    >>> pairs = [("17091434834979599", "1403-10-23"), ("17091434834979599", "1403-10-24")]
+    >>> async for (tse_code, jalali_date), lob in fetch_historical_lob_many(pairs, concurrency=4):
+    ...     print(tse_code, jalali_date, len(lob))
+
+    Backfill every trading day of a month:
+    >>> pairs = [("17091434834979599", day) for day in default_calendar.iter_trading_days("1403-10-01", "1403-10-30")]
+    """
+    pairs = list(pairs)
+    inputs = [
+        HistoricalLOBInput(tse_code=tse_code, jalali_date=jalali_date, calendar=calendar)
+        for tse_code, jalali_date in pairs
+    ]
+    host = urlsplit(BEST_LIMITS_URL).netloc
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = HostRateLimiter(rate_limit)
+
+    def download(inp: HistoricalLOBInput) -> pd.DataFrame:
+        return _fetch_processed_lob(inp, timeout=timeout, transport=transport, cache=cache)
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tseopt-lob")
+
+    async def fetch_one(index: int) -> tuple[int, pd.DataFrame | Exception]:
+        async with semaphore:
+            if cache is None or not cache.contains(inputs[index].tse_code, inputs[index].date):
+                await rate_limiter.wait(host)
+            try:
+                return index, await loop.run_in_executor(executor, download, inputs[index])
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return index, e
+
+    tasks = [asyncio.ensure_future(fetch_one(index)) for index in range(len(inputs))]
+    try:
+        if not ordered:
+            for future in asyncio.as_completed(tasks):
+                index, result = await future
+                yield pairs[index], result
+        else:
+            for index, task in enumerate(tasks):
+                _, result = await task
+                yield pairs[index], result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Do not wait for requests already running in the worker threads.
+        executor.shutdown(wait=False, cancel_futures=True)
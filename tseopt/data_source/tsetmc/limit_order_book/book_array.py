@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIELDS: tuple[str, ...] = ("bid_price", "bid_volume", "bid_number", "ask_price", "ask_volume", "ask_number")
+
+
+class LOBArray:
+    """
+    Dense order book: `values[snapshot, level, field]` with a datetime64 index over the snapshots.
+
+    Every snapshot holds the full book, so features such as the spread or the depth imbalance
+    are plain array operations. Levels without any event yet are NaN.
+    """
+
+    def __init__(self, values: np.ndarray, times: np.ndarray, levels: np.ndarray, fields: tuple[str, ...] = FIELDS):
+        self.values = values
+        self.times = times
+        self.levels = levels
+        self.fields = tuple(fields)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_frame(cls, entire_data: pd.DataFrame) -> "LOBArray":
+        """
+        Build the per-event grid: one snapshot after every event.
+
+        Parameters:
+        ----------
+        entire_data : pd.DataFrame
+            The output of the fetch_historical_lob function.
+        """
+        data = entire_data.sort_values(by="datetime", kind="stable")
+        times = data["datetime"].to_numpy(dtype="datetime64[ns]")
+        levels = np.unique(data["level"].to_numpy())
+        level_index = np.searchsorted(levels, data["level"].to_numpy())
+
+        n = len(data)
+        events = np.full((n, len(levels), len(FIELDS)), np.nan)
+        events[np.arange(n), level_index] = data[list(FIELDS)].to_numpy(dtype=np.float64)
+
+        # Forward-fill every level with the row of its latest event.
+        has_event = np.zeros((n, len(levels)), dtype=bool)
+        has_event[np.arange(n), level_index] = True
+        last_event = np.where(has_event, np.arange(n)[:, None], 0)
+        np.maximum.accumulate(last_event, axis=0, out=last_event)
+        values = events[last_event, np.arange(len(levels))[None, :]]
+        return cls(values=values, times=times, levels=levels)
+
+    def field(self, name: str) -> np.ndarray:
+        """
+        The (snapshot, level) array of one field.
+        """
+        return self.values[:, :, self.fields.index(name)]
+
+    def at(self, times: np.ndarray | pd.DatetimeIndex) -> "LOBArray":
+        """
+        The book as of every datetime of `times`.
+        """
+        times = np.asarray(times, dtype="datetime64[ns]")
+        positions = np.searchsorted(self.times, times, side="right") - 1
+        values = self.values[np.maximum(positions, 0)]
+        values[positions < 0] = np.nan
+        return LOBArray(values=values, times=times, levels=self.levels, fields=self.fields)
+
+    def resample(self, seconds: int = 1) -> "LOBArray":
+        """
+        The book every `seconds` seconds from the first to the last event.
+        """
+        step = np.timedelta64(seconds, "s")
+        start = self.times[0].astype("datetime64[s]")
+        return self.at(np.arange(start, self.times[-1] + step, step).astype("datetime64[ns]"))
+
+    @property
+    def spread(self) -> np.ndarray:
+        return self.field("ask_price")[:, 0] - self.field("bid_price")[:, 0]
+
+    @property
+    def mid_price(self) -> np.ndarray:
+        return (self.field("ask_price")[:, 0] + self.field("bid_price")[:, 0]) / 2
+
+    @property
+    def microprice(self) -> np.ndarray:
+        bid_price, ask_price = self.field("bid_price")[:, 0], self.field("ask_price")[:, 0]
+        bid_volume, ask_volume = self.field("bid_volume")[:, 0], self.field("ask_volume")[:, 0]
+        return (bid_price * ask_volume + ask_price * bid_volume) / (bid_volume + ask_volume)
+
+    def depth_imbalance(self, depth: int | None = None) -> np.ndarray:
+        """
+        (bid volume - ask volume) / (bid volume + ask volume) over the first `depth` levels (all by default).
+        """
+        bid_volume = np.nansum(self.field("bid_volume")[:, :depth], axis=1)
+        ask_volume = np.nansum(self.field("ask_volume")[:, :depth], axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (bid_volume - ask_volume) / (bid_volume + ask_volume)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Long frame with one row per (snapshot, level), the inverse of the dense layout.
+        """
+        n, n_levels, _ = self.values.shape
+        frame = pd.DataFrame(self.values.reshape(n * n_levels, -1), columns=list(self.fields))
+        frame.insert(0, "level", np.tile(self.levels, n))
+        frame.insert(0, "datetime", np.repeat(self.times, n_levels))
+        return frame
+
+    def save(self, directory: str | Path) -> None:
+        """
+        Write `values.npy`, which can be memory-mapped, and the `index.npz`/`fields.json` describing it.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "values.npy", self.values)
+        np.savez(directory / "index.npz", times=self.times, levels=self.levels)
+        (directory / "fields.json").write_text(json.dumps(list(self.fields)))
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap_mode: str | None = "r") -> "LOBArray":
+        directory = Path(directory)
+        values = np.load(directory / "values.npy", mmap_mode=mmap_mode)
+        with np.load(directory / "index.npz") as index:
+            times, levels = index["times"], index["levels"]
+        fields = tuple(json.loads((directory / "fields.json").read_text()))
+        return cls(values=values, times=times, levels=levels, fields=fields)
@@ -0,0 +1,102 @@
+from collections.abc import Iterable
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+TimeLike = str | time | pd.Timedelta
+
+
+def to_time_of_day(value: TimeLike) -> pd.Timedelta:
+    """
+    Convert 'HH:MM', 'HH:MM:SS', a datetime.time or a Timedelta to a time-of-day Timedelta.
+
+    Examples:
+    --------
+    >>> to_time_of_day("10:50")
+    Timedelta('0 days 10:50:00')
+    """
+    if isinstance(value, str):
+        return pd.Timedelta(value + ":00" if value.count(":") == 1 else value)
+    if isinstance(value, time):
+        return pd.Timedelta(hours=value.hour, minutes=value.minute, seconds=value.second)
+    return pd.Timedelta(value)
+
+
+class LOBReplay:
+    """
+    As-of index over a day of best-limits events.
+
+    The events are indexed once per level by time (sorted arrays), so the book at any time,
+    or at a whole vector of times, is found with `searchsorted` instead of filtering the day.
+    """
+
+    def __init__(self, entire_data: pd.DataFrame) -> None:
+        """
+        Parameters:
+        ----------
+        entire_data : pd.DataFrame
+            The output of the fetch_historical_lob function.
+        """
+        self._data = entire_data.reset_index(drop=True)
+        self._columns = ["level"] + [column for column in self._data.columns if column != "level"]
+
+        times = self._data["time"].to_numpy(dtype="timedelta64[ns]")
+        levels = self._data["level"].to_numpy()
+        # lexsort is stable, so events at the same time keep their order within a level.
+        order = np.lexsort((times, levels))
+        sorted_levels = levels[order]
+
+        self.levels: np.ndarray = np.unique(sorted_levels)
+        starts = np.searchsorted(sorted_levels, self.levels, side="left")
+        ends = np.append(starts[1:], len(order))
+        self._rows = [order[start:end] for start, end in zip(starts, ends)]
+        self._times = [times[rows] for rows in self._rows]
+
+    def _positions(self, times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the row of the last event at or before every time, for every level, with the
+        index of the time each row belongs to; levels without an event yet are left out.
+        """
+        snapshot, rows, level_order = [], [], []
+        for i, (level_rows, level_times) in enumerate(zip(self._rows, self._times)):
+            positions = np.searchsorted(level_times, times, side="right") - 1
+            valid = np.flatnonzero(positions >= 0)
+            snapshot.append(valid)
+            rows.append(level_rows[positions[valid]])
+            level_order.append(np.full(len(valid), i))
+
+        snapshot = np.concatenate(snapshot) if snapshot else np.empty(0, dtype=np.intp)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+        level_order = np.concatenate(level_order) if level_order else np.empty(0, dtype=np.intp)
+        order = np.lexsort((level_order, snapshot))
+        return snapshot[order], rows[order]
+
+    def at(self, specific_time: TimeLike) -> pd.DataFrame:
+        """
+        The book at `specific_time`: the last event of every level at or before it.
+        """
+        target = np.array([to_time_of_day(specific_time).to_timedelta64()], dtype="timedelta64[ns]")
+        _, rows = self._positions(target)
+        return self._data.take(rows)[self._columns].reset_index(drop=True)
+
+    def at_many(self, times: Iterable[TimeLike]) -> pd.DataFrame:
+        """
+        The book at every time of `times` in one call, as a long frame with a 'snapshot_time' column.
+        """
+        if getattr(times, "dtype", None) is not None and times.dtype.kind == "m":
+            targets = np.asarray(times, dtype="timedelta64[ns]")
+        else:
+            targets = pd.to_timedelta([to_time_of_day(value) for value in times]).to_numpy(dtype="timedelta64[ns]")
+        snapshot, rows = self._positions(targets)
+        book = self._data.take(rows)[self._columns].reset_index(drop=True)
+        book.insert(0, "snapshot_time", targets[snapshot])
+        return book
+
+    def resample(self, freq: str = "1min", start: TimeLike | None = None, end: TimeLike | None = None) -> pd.DataFrame:
+        """
+        The book every `freq` between `start` and `end` (the first and last event by default).
+        """
+        start = to_time_of_day(start) if start is not None else self._data["time"].min()
+        end = to_time_of_day(end) if end is not None else self._data["time"].max()
+        return self.at_many(pd.timedelta_range(start=start, end=end, freq=freq))
@@ -51,6 +51,18 @@ class OptionDataOutput(TypedDict):
     instrumentOptMarketWatch: list[OptionData]
 
 
+class InstrumentInfo(TypedDict):
+    insCode: str
+    instrumentID: str
+    cIsin: str
+    lVal18AFC: str
+    lVal30: str
+
+
+class InstrumentInfoOutput(TypedDict):
+    instrumentInfo: InstrumentInfo
+
+
 class MarketNum(IntEnum):
     BOURSE = 1
     FARA_BOURSE = 2
@@ -0,0 +1,101 @@
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_WHITESPACE_OR_COMMA = re.compile(r"[\s,]*")
+
+
+def iter_json_array_items(chunks: Iterable[bytes], key: str) -> Iterator[dict[str, Any]]:
+    """
+    Incrementally decode the objects of the JSON array stored under `key` in a streamed response.
+
+    Only the objects that are not yet complete are kept in memory, so records become available
+    as soon as their bytes arrive instead of after the whole body has been downloaded.
+
+    Parameters:
+    ----------
+    chunks : Iterable[bytes]
+        The raw response body, e.g. `response.iter_content(chunk_size=...)`.
+    key : str
+        The name of the top-level member holding the array, e.g. "instrumentOptMarketWatch".
+
+    Raises:
+    ------
+    ValueError
+        If the stream ends before the array is closed or does not contain `key`.
+
+    Examples:
+    --------
+    >>> list(iter_json_array_items([b'{"items": [{"a": 1}, ', b'{"a": 2}]}'], "items"))
+    [{'a': 1}, {'a': 2}]
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    opening = re.compile(r'"%s"\s*:\s*(\[|null)' % re.escape(key))
+
+    buffer = ""
+    position = 0
+    in_array = False
+    chunks = iter(chunks)
+
+    while True:
+        if not in_array:
+            match = opening.search(buffer)
+            if match is not None:
+                if match.group(1) == "null":
+                    return
+                in_array = True
+                position = match.end()
+                continue
+        else:
+            position = _WHITESPACE_OR_COMMA.match(buffer, position).end()
+            if position < len(buffer):
+                if buffer[position] == "]":
+                    return
+                try:
+                    item, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    pass  # the object is split across chunks
+                else:
+                    yield item
+                    continue
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError(f"The response ended before the '{key}' array was complete.")
+        buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+
+
+class ColumnBuffers:
+    """
+    Column-oriented accumulator for homogeneous records: each record is appended field by field,
+    so the row dicts themselves do not have to be kept.
+    """
+
+    def __init__(self) -> None:
+        self.columns: dict[str, list] = {}
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, record: dict[str, Any]) -> None:
+        columns = self.columns
+        if record.keys() == columns.keys():
+            for key, value in record.items():
+                columns[key].append(value)
+        else:
+            for key in record:
+                if key not in columns:
+                    columns[key] = [None] * self._length
+            for key, column in columns.items():
+                column.append(record.get(key))
+        self._length += 1
+
+    def extend(self, records: Iterable[dict[str, Any]]) -> "ColumnBuffers":
+        for record in records:
+            self.append(record)
+        return self
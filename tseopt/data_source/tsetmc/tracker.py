@@ -0,0 +1,155 @@
+import time
+from collections.abc import Callable, Iterator
+from functools import cached_property
+
+import pandas as pd
+
+from tseopt.data_source.transport import Transport, default_transport
+from tseopt.data_source.tsetmc import schema
+from tseopt.data_source.tsetmc.api import clean_entire_market_data, fetch_entire_market_data
+
+# Columns that place a contract in a chain; a change to any of them moves the contract.
+KEY_COLUMNS: list[str] = ["ua_tse_code", "option_type", "end_date", "strike_price"]
+
+
+class MarketDelta:
+    """
+    The difference between two consecutive market-watch snapshots.
+
+    Attributes:
+        changed: The new rows of every contract that changed or appeared, indexed by tse_code.
+        previous: The old rows of every contract that changed or disappeared, indexed by tse_code.
+        added: tse_codes of the contracts that appeared.
+        removed: tse_codes of the contracts that disappeared (e.g. expired).
+        snapshot: The full market after the delta, indexed by tse_code.
+    """
+
+    def __init__(
+            self,
+            changed: pd.DataFrame,
+            previous: pd.DataFrame,
+            added: pd.Index,
+            removed: pd.Index,
+            snapshot: pd.DataFrame
+    ) -> None:
+        self.changed = changed
+        self.previous = previous
+        self.added = added
+        self.removed = removed
+        self.snapshot = snapshot
+
+    @property
+    def is_empty(self) -> bool:
+        return self.changed.empty and self.removed.empty
+
+    @cached_property
+    def structure_changed(self) -> bool:
+        """
+        True if contracts appeared or disappeared, or one of the KEY_COLUMNS of an existing contract
+        changed, not only their quotes.
+        """
+        if not (self.added.empty and self.removed.empty):
+            return True
+        common = self.changed.index.intersection(self.previous.index)
+        columns = [column for column in KEY_COLUMNS if column in self.changed and column in self.previous]
+        if common.empty or not columns:
+            return False
+        new, old = self.changed.loc[common, columns], self.previous.loc[common, columns]
+        return not (new == old).all(axis=None)
+
+    def __repr__(self) -> str:
+        return (f"MarketDelta(changed={len(self.changed)}, added={len(self.added)}, "
+                f"removed={len(self.removed)}, snapshot={len(self.snapshot)})")
+
+
+class MarketWatchTracker:
+    """
+    Keeps the last market-watch snapshot and turns every new raw payload into a MarketDelta.
+
+    Raw records are compared with the previous ones before cleaning, so only the records that
+    changed are unpivoted and written into the snapshot.
+    """
+
+    def __init__(self, timeout: float = 10, transport: Transport = default_transport) -> None:
+        self._timeout = timeout
+        self._transport = transport
+        self._records: dict[str, schema.OptionData] = {}
+        self._snapshot: pd.DataFrame | None = None
+        self._subscribers: list[Callable[[MarketDelta], None]] = []
+
+    @property
+    def snapshot(self) -> pd.DataFrame:
+        if self._snapshot is None:
+            raise ValueError("There is no data. Please ensure that you have polled the market using the poll method.")
+        return self._snapshot
+
+    def subscribe(self, callback: Callable[[MarketDelta], None]) -> None:
+        """
+        Call `callback` with every non-empty delta, e.g. `OptionMarket.apply_delta` or `Chains.apply_delta`.
+        """
+        self._subscribers.append(callback)
+
+    @staticmethod
+    def _key(record: schema.OptionData) -> str:
+        # One raw record holds the call and the put of the same strike and expiry.
+        return record["insCode_C"]
+
+    def apply(self, raw_data: list[schema.OptionData]) -> MarketDelta:
+        """
+        Apply a raw market-watch payload (the output of `fetch_entire_market_data`).
+        """
+        records = {self._key(record): record for record in raw_data}
+        previous_records = self._records
+        changed_records = [
+            record for key, record in records.items() if previous_records.get(key) != record
+        ]
+        removed_records = [record for key, record in previous_records.items() if key not in records]
+
+        changed = clean_entire_market_data(changed_records)
+        changed.index = pd.Index(changed["tse_code"] if "tse_code" in changed else [], name=None)
+
+        if self._snapshot is None:
+            previous = changed.iloc[:0]
+            added = changed.index
+            removed = pd.Index([])
+            snapshot = changed
+        else:
+            old = self._snapshot
+            if not changed_records:
+                changed = old.iloc[:0]
+            else:
+                # A raw record holds a call and a put, so drop the side that did not change.
+                common = changed.index.intersection(old.index)
+                new_rows, old_rows = changed.loc[common], old.loc[common, changed.columns]
+                same = ((new_rows == old_rows) | (new_rows.isna() & old_rows.isna())).all(axis=1)
+                changed = changed.drop(index=common[same.to_numpy()])
+            removed = pd.Index([record[key] for record in removed_records for key in ("insCode_C", "insCode_P")])
+            added = changed.index.difference(old.index)
+            stale = old.index.isin(changed.index) | old.index.isin(removed)
+            previous = old[stale]
+            snapshot = pd.concat([old[~stale], changed]) if len(changed) else old[~stale]
+
+        self._records = records
+        self._snapshot = snapshot
+        delta = MarketDelta(changed=changed, previous=previous, added=added, removed=removed, snapshot=snapshot)
+        if not delta.is_empty:
+            for callback in self._subscribers:
+                callback(delta)
+        return delta
+
+    def poll(self) -> MarketDelta:
+        """
+        Fetch the entire market and apply it.
+        """
+        return self.apply(fetch_entire_market_data(self._timeout, transport=self._transport))
+
+    def feed(self, interval: float = 5) -> Iterator[MarketDelta]:
+        """
+        Poll the market every `interval` seconds and yield the non-empty deltas.
+        """
+        while True:
+            started = time.monotonic()
+            delta = self.poll()
+            if not delta.is_empty:
+                yield delta
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,267 @@
+import re
+from collections.abc import Iterable, Iterator
+
+import jdatetime
+import numpy as np
+import pandas as pd
+
+# Python weekdays the market is open on: Saturday (5), Sunday (6), Monday (0), Tuesday (1), Wednesday (2)
+TRADING_WEEKDAYS: tuple[int, ...] = (5, 6, 0, 1, 2)
+
+# Official holidays on a fixed Jalali (month, day). Lunar holidays move every year; add them with
+# `TradingCalendar.add_holidays`.
+FIXED_HOLIDAYS: tuple[tuple[int, int], ...] = (
+    (1, 1), (1, 2), (1, 3), (1, 4),  # Nowruz
+    (1, 12),  # Islamic Republic Day
+    (1, 13),  # Nature Day
+    (3, 14), (3, 15),
+    (11, 22),  # Revolution Day
+    (12, 29),  # Oil Nationalization Day
+)
+
+_MONTH_LENGTHS = np.array([31] * 6 + [30] * 5 + [29])
+_JALALI_PATTERN = r"^\s*(\d{4})\D?(\d{1,2})\D?(\d{1,2})\s*$"
+
+
+def yyyymmdd_to_datetime64(date_values: np.ndarray | pd.Series) -> np.ndarray:
+    """
+    Vectorized conversion of integers in YYYYMMDD format to dates.
+
+    Examples:
+    --------
+    >>> yyyymmdd_to_datetime64(np.array([20241218]))
+    array(['2024-12-18'], dtype='datetime64[D]')
+    """
+    date_values = np.asarray(date_values, dtype=np.int64)
+    years, rest = np.divmod(date_values, 10000)
+    months, days = np.divmod(rest, 100)
+    month_starts = (years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (months - 1)
+    return month_starts.astype("datetime64[D]") + (days - 1)
+
+
+def _digits(values: pd.Series) -> np.ndarray:
+    """
+    'YYYY-MM-DD', 'YYYY/MM/DD' or 'YYYYMMDD' strings as YYYYMMDD integers; every distinct string is
+    parsed once.
+    """
+    codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype=str).str.extract(_JALALI_PATTERN)
+    if parts.isna().any(axis=None):
+        invalid = uniques[parts.isna().any(axis=1).to_numpy()][0]
+        raise ValueError(f"Invalid date: {invalid!r}")
+    years, months, days = (parts[i].astype(np.int64).to_numpy() for i in range(3))
+    return (years * 10000 + months * 100 + days)[codes]
+
+
+def _jalali_int(value: str | int) -> int:
+    """
+    One Jalali date as a YYYYMMDD integer, without the overhead of the vectorized parser.
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    match = re.match(_JALALI_PATTERN, value)
+    if match is None:
+        raise ValueError(f"Invalid date: {value!r}")
+    year, month, day = map(int, match.groups())
+    return year * 10000 + month * 100 + day
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else values).ravel()
+
+
+def to_datetime64(values) -> np.ndarray:
+    """
+    Vectorized conversion of Gregorian dates to datetime64[D]: datetimes, YYYYMMDD integers such as
+    the 'dEven' column of the order book, or strings such as the 'begin_date'/'end_date' columns of
+    the market watch.
+
+    Examples:
+    --------
+    >>> to_datetime64(["20241218", "2024-12-19"])
+    array(['2024-12-18', '2024-12-19'], dtype='datetime64[D]')
+    """
+    array = _as_array(values)
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[D]")
+    if array.dtype.kind in "iu":
+        return yyyymmdd_to_datetime64(array)
+    if len(array) and isinstance(array[0], str):
+        return yyyymmdd_to_datetime64(_digits(pd.Series(array, dtype=str)))
+    return pd.to_datetime(array).to_numpy().astype("datetime64[D]")
+
+
+def format_jalali(jalali: np.ndarray | Iterable[int], sep: str = "-") -> np.ndarray:
+    """
+    Vectorized formatting of YYYYMMDD Jalali integers as 'YYYY-MM-DD' strings.
+
+    Examples:
+    --------
+    >>> format_jalali([14030924])
+    array(['1403-09-24'], dtype=object)
+    """
+    digits = pd.Series(np.asarray(jalali, dtype=np.int64)).astype(str)
+    formatted = digits.str[:4] + sep + digits.str[4:6] + sep + digits.str[6:]
+    return formatted.to_numpy(dtype=object)
+
+
+class TradingCalendar:
+    """
+    Jalali <-> Gregorian lookup table and trading days of the Tehran Stock Exchange.
+
+    Every day of the Jalali years [first_year, last_year] is converted once when the calendar is
+    built, so whole date columns are converted with one array lookup instead of one `jdatetime` call
+    per date. A day is a trading day if it falls on one of `TRADING_WEEKDAYS` and is not a holiday.
+
+    Examples:
+    --------
+    >>> calendar = TradingCalendar()
+    >>> calendar.to_gregorian(["1403-09-28"])
+    array(['2024-12-18'], dtype='datetime64[D]')
+    >>> calendar.to_jalali(market_data["end_date"])
+    >>> list(calendar.iter_trading_days("1403-09-22", "1403-09-28"))
+    ['1403-09-24', '1403-09-25', '1403-09-26', '1403-09-27', '1403-09-28']
+    """
+
+    def __init__(
+            self,
+            first_year: int = 1380,
+            last_year: int = 1430,
+            holidays: Iterable[str | int] = (),
+            fixed_holidays: Iterable[tuple[int, int]] = FIXED_HOLIDAYS
+    ) -> None:
+        """
+        Parameters:
+        ----------
+        first_year, last_year : int
+            The Jalali years covered by the calendar, inclusive.
+        holidays : Iterable[str | int]
+            Extra Jalali holidays, as 'YYYY-MM-DD' strings or YYYYMMDD integers.
+        fixed_holidays : Iterable[tuple[int, int]]
+            Jalali (month, day) pairs that are holidays every year.
+        """
+        jalali = []
+        for year in range(first_year, last_year + 1):
+            lengths = _MONTH_LENGTHS.copy()
+            lengths[-1] += jdatetime.date(year, 1, 1).isleap()
+            months = np.repeat(np.arange(1, 13), lengths)
+            days = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + 1
+            jalali.append(year * 10000 + months * 100 + days)
+
+        self.first_year = first_year
+        self.last_year = last_year
+        self._jalali = np.concatenate(jalali)
+        self._first_day = np.datetime64(jdatetime.date(first_year, 1, 1).togregorian(), "D")
+        self.days = self._first_day + np.arange(len(self._jalali))
+
+        # 1970-01-01 was a Thursday (3).
+        weekdays = (self.days.astype(np.int64) + 3) % 7
+        month_days = self._jalali % 10000
+        fixed = np.isin(month_days, [month * 100 + day for month, day in fixed_holidays])
+        self._weekday_open = np.isin(weekdays, TRADING_WEEKDAYS)
+        self._holiday = fixed
+        self._update()
+        self.add_holidays(holidays)
+
+    def _update(self) -> None:
+        self._trading = self._weekday_open & ~self._holiday
+        # Number of trading days up to and including every day.
+        self._trading_count = np.cumsum(self._trading)
+
+    def _positions(self, days: np.ndarray) -> np.ndarray:
+        positions = (days - self._first_day).astype(np.int64)
+        out_of_range = np.isnat(days) | (positions < 0) | (positions >= len(self.days))
+        if out_of_range.any():
+            raise ValueError(
+                f"Date {days[out_of_range][0]} is outside the calendar (Jalali years {self.first_year} to {self.last_year})."
+            )
+        return positions
+
+    def _jalali_positions(self, jalali) -> np.ndarray:
+        array = _as_array(jalali)
+        if array.dtype.kind not in "iu":
+            array = _digits(pd.Series(array, dtype=str))
+        positions = np.searchsorted(self._jalali, array)
+        found = positions < len(self._jalali)
+        found[found] = self._jalali[positions[found]] == array[found]
+        if not found.all():
+            raise ValueError(f"Invalid Jalali date or outside the calendar: {array[~found][0]}")
+        return positions
+
+    def to_gregorian(self, jalali) -> np.ndarray:
+        """
+        Vectorized conversion of Jalali dates ('YYYY-MM-DD', 'YYYY/MM/DD' or YYYYMMDD) to datetime64[D].
+        """
+        return self.days[self._jalali_positions(jalali)]
+
+    def to_jalali(self, gregorian) -> np.ndarray:
+        """
+        Vectorized conversion of Gregorian dates (see `to_datetime64`) to YYYYMMDD Jalali integers.
+        Use `format_jalali` to get strings.
+        """
+        return self._jalali[self._positions(to_datetime64(gregorian))]
+
+    def is_trading_day(self, gregorian) -> np.ndarray:
+        return self._trading[self._positions(to_datetime64(gregorian))]
+
+    def count_trading_days(self, start, end) -> np.ndarray:
+        """
+        Vectorized number of trading days after the Gregorian dates `start` and up to `end`, inclusive;
+        e.g. the trading days left until the 'end_date' of every contract.
+        """
+        start_positions = self._positions(to_datetime64(start))
+        end_positions = self._positions(to_datetime64(end))
+        return self._trading_count[end_positions] - self._trading_count[start_positions]
+
+    def add_holidays(self, holidays: Iterable[str | int]) -> None:
+        """
+        Mark Jalali dates ('YYYY-MM-DD' strings or YYYYMMDD integers) as holidays, e.g. the lunar
+        holidays of a year.
+        """
+        holidays = list(holidays)
+        if holidays:
+            self._holiday[self._jalali_positions(holidays)] = True
+            self._update()
+
+    def holidays(self, year: int) -> list[str]:
+        """
+        The holidays of a Jalali year that fall on a weekday the market would otherwise be open.
+        """
+        in_year = self._jalali // 10000 == year
+        return format_jalali(self._jalali[in_year & self._weekday_open & self._holiday]).tolist()
+
+    def trading_days(self, start: str | int, end: str | int) -> np.ndarray:
+        """
+        The Gregorian trading days between the Jalali dates `start` and `end`, inclusive.
+        """
+        first, last = self._jalali_positions([start, end])
+        return self.days[first: last + 1][self._trading[first: last + 1]]
+
+    def iter_trading_days(self, start: str | int, end: str | int) -> Iterator[str]:
+        """
+        Yield the trading days between the Jalali dates `start` and `end`, inclusive, as Jalali
+        'YYYY-MM-DD' strings, e.g. to backfill order books with `fetch_historical_lob_many`.
+        """
+        first, last = self._jalali_positions([start, end])
+        jalali = self._jalali[first: last + 1][self._trading[first: last + 1]]
+        yield from format_jalali(jalali)
+
+    def validate(self, jalali_date: str | int) -> str:
+        """
+        The Gregorian date of a Jalali trading day, in the format 'YYYYMMDD'.
+
+        Raises:
+        -------
+        ValueError
+            If the date is invalid, outside the calendar or not a trading day.
+        """
+        jalali = _jalali_int(jalali_date)
+        position = int(np.searchsorted(self._jalali, jalali))
+        if position == len(self._jalali) or self._jalali[position] != jalali:
+            raise ValueError(f"Invalid Jalali date or outside the calendar: {jalali}")
+        if not self._trading[position]:
+            raise ValueError("The date is not a trading day.")
+        return str(self.days[position]).replace("-", "")
+
+
+default_calendar = TradingCalendar()
@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+
+from tseopt.data_source.transport import Transport, default_transport
+from tseopt.data_source.tsetmc.api import fetch_instrument_info
+
+
+class ISINIndex:
+    """
+    Persistent two-way mapping between TSETMC instrument codes (tse_code) and ISINs.
+
+    TSETMC identifies contracts by tse_code and Tadbir by ISIN. The mapping of a contract never
+    changes, so it is resolved once per contract (from TSETMC's instrument info, or learned from any
+    Tadbir response, which carries both) and kept in a JSON file across sessions.
+    """
+
+    def __init__(
+            self,
+            path: str | Path | None = None,
+            timeout: float = 10,
+            max_workers: int = 8,
+            retry_delay: float = 60,
+            max_retry_delay: float = 3600,
+            transport: Transport = default_transport
+    ) -> None:
+        """
+        Parameters:
+        ----------
+        path : str | Path | None
+            JSON file the mapping is loaded from and saved to; None keeps it in memory only.
+        timeout : float
+            Timeout of every instrument-info request in seconds.
+        max_workers : int
+            Number of instrument-info requests in flight while resolving unknown tse_codes.
+        retry_delay, max_retry_delay : float
+            A tse_code that could not be resolved is not requested again for `retry_delay` seconds,
+            doubled after every further failure up to `max_retry_delay`.
+        transport : Transport
+            The pooled HTTP transport used for the requests.
+        """
+        self.path = Path(path) if path is not None else None
+        self._timeout = timeout
+        self._max_workers = max_workers
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._isins: dict[str, str] = {}
+        self._tse_codes: dict[str, str] = {}
+        self._failures: dict[str, tuple[int, float]] = {}  # tse_code -> (failures, monotonic retry time)
+        if self.path is not None and self.path.exists():
+            self.update(json.loads(self.path.read_text(encoding="utf-8")))
+
+    def __len__(self) -> int:
+        return len(self._isins)
+
+    def __contains__(self, tse_code: str) -> bool:
+        return tse_code in self._isins
+
+    def isin(self, tse_code: str) -> str | None:
+        return self._isins.get(tse_code)
+
+    def tse_code(self, isin: str) -> str | None:
+        return self._tse_codes.get(isin)
+
+    def isins(self, tse_codes: Iterable[str]) -> dict[str, str]:
+        """
+        The known ISIN of every tse_code in `tse_codes`; unknown ones are left out.
+        """
+        isins = self._isins
+        return {tse_code: isins[tse_code] for tse_code in tse_codes if tse_code in isins}
+
+    def update(self, pairs: dict[str, str] | Iterable[tuple[str, str]]) -> int:
+        """
+        Add (tse_code, isin) pairs; returns the number of new tse_codes.
+        """
+        pairs = pairs.items() if isinstance(pairs, dict) else pairs
+        added = 0
+        with self._lock:
+            for tse_code, isin in pairs:
+                if not tse_code or not isin:
+                    continue
+                added += tse_code not in self._isins
+                self._isins[tse_code] = isin
+                self._failures.pop(tse_code, None)
+                self._tse_codes[isin] = tse_code
+        return added
+
+    def resolve(self, tse_codes: Iterable[str]) -> dict[str, str]:
+        """
+        The ISIN of every tse_code in `tse_codes`, fetching the unknown ones from TSETMC concurrently.
+
+        Codes that could not be resolved (e.g. a failed request) are left out and requested again once
+        their retry delay has passed (see `retry_delay`). The index is saved when new codes were resolved.
+        """
+        tse_codes = list(dict.fromkeys(tse_codes))
+        missing = self.pending(tse_codes)
+        if missing:
+            resolved = []
+            with ThreadPoolExecutor(max_workers=max(1, min(self._max_workers, len(missing)))) as executor:
+                futures = {
+                    executor.submit(fetch_instrument_info, tse_code, self._timeout, self._transport): tse_code
+                    for tse_code in missing
+                }
+                for future in as_completed(futures):
+                    try:
+                        info = future.result()
+                    except requests.RequestException:
+                        info = None
+                    if info and info.get("instrumentID"):
+                        resolved.append((futures[future], info["instrumentID"]))
+                    else:
+                        self._failed(futures[future])
+            if self.update(resolved):
+                self.save()
+        return self.isins(tse_codes)
+
+    def pending(self, tse_codes: Iterable[str]) -> list[str]:
+        """
+        The tse_codes of `tse_codes` that are unknown and not waiting for a retry, i.e. the ones
+        `resolve` would request now.
+        """
+        now = time.monotonic()
+        failures = self._failures
+        return [
+            tse_code for tse_code in tse_codes
+            if tse_code not in self._isins and (tse_code not in failures or failures[tse_code][1] <= now)
+        ]
+
+    def _failed(self, tse_code: str) -> None:
+        with self._lock:
+            count = self._failures.get(tse_code, (0, 0.0))[0] + 1
+            delay = min(self._retry_delay * 2 ** min(count - 1, 32), self._max_retry_delay)
+            self._failures[tse_code] = (count, time.monotonic() + delay)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = json.dumps(self._isins, ensure_ascii=False, sort_keys=True)
+        temporary = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+        temporary.write_text(payload, encoding="utf-8")
+        os.replace(temporary, self.path)
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class LOBCache:
+    """
+    On-disk cache of processed historical limit order books, keyed by (tse_code, Gregorian date).
+
+    Every day is stored as one compressed `.npz` of its columns, named by a hash of the key.
+    The cache is bounded by `max_bytes`; the least recently used days are evicted first.
+    Only past days are cached, since the book of the current day is still changing.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = 2 * 1024 ** 3, offline: bool = False) -> None:
+        """
+        Parameters:
+        ----------
+        directory : str | Path
+            Where the cached days are stored.
+        max_bytes : int
+            Maximum total size of the cache on disk.
+        offline : bool
+            Never touch the network: a day that is not cached raises ValueError.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _path(self, tse_code: str, gregorian_date: str) -> Path:
+        digest = hashlib.sha256(f"{tse_code}/{gregorian_date}".encode()).hexdigest()
+        return self.directory / f"{digest[:32]}.npz"
+
+    @staticmethod
+    def is_cacheable(gregorian_date: str) -> bool:
+        return gregorian_date < date.today().strftime("%Y%m%d")
+
+    def contains(self, tse_code: str, gregorian_date: str) -> bool:
+        return self._path(tse_code, gregorian_date).exists()
+
+    def get(self, tse_code: str, gregorian_date: str) -> pd.DataFrame | None:
+        """
+        The cached frame of the day, or None on a miss (a ValueError when offline).
+        """
+        path = self._path(tse_code, gregorian_date)
+        try:
+            with np.load(path, allow_pickle=False) as columns:
+                data = pd.DataFrame({name: columns[name] for name in columns.files})
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            if self.offline:
+                raise ValueError(f"The order book of {tse_code} on {gregorian_date} is not cached (offline mode).")
+            return None
+
+        os.utime(path)  # the modification time is the LRU clock
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, tse_code: str, gregorian_date: str, data: pd.DataFrame) -> None:
+        if not self.is_cacheable(gregorian_date):
+            return
+        path = self._path(tse_code, gregorian_date)
+        temporary = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temporary, "wb") as file:
+            np.savez_compressed(file, **{column: data[column].to_numpy() for column in data.columns})
+        os.replace(temporary, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = [(entry.stat(), entry) for entry in self.directory.glob("*.npz")]
+            total = sum(stat.st_size for stat, _ in entries)
+            for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= stat.st_size
+                self.evictions += 1
+
+    @property
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.directory.glob("*.npz"))
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "size": self.size,
+        }
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*.npz"):
+            entry.unlink(missing_ok=True)
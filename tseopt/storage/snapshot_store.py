@@ -0,0 +1,136 @@
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from tseopt.data_source.tsetmc.api import _DATE_COLUMNS, _DATE_FORMAT
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover
+    pa = ds = None
+
+SNAPSHOT_TIME = "snapshot_time"
+_SORT_COLUMNS = ["ua_tse_code", "tse_code"]
+# Rows per Parquet row group; reads by underlying asset skip the groups whose ua_tse_code range misses them.
+_ROWS_PER_GROUP = 1024
+
+
+def _canonical_type(data_type: "pa.DataType") -> "pa.DataType":
+    """
+    The stored type of a column: categoricals as their values, every integer as int64, every float
+    as float64 and every string as string, so plain and compact snapshots share one schema.
+    """
+    if pa.types.is_dictionary(data_type):
+        data_type = data_type.value_type
+    if pa.types.is_integer(data_type):
+        return pa.int64()
+    if pa.types.is_floating(data_type):
+        return pa.float64()
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return pa.string()
+    return data_type
+
+
+def _require_pyarrow() -> None:
+    if ds is None:
+        raise ImportError("SnapshotStore requires pyarrow. Install it with `pip install tseopt[store]`.")
+
+
+class SnapshotStore:
+    """
+    Append-only Parquet store of cleaned market-watch snapshots.
+
+    Every snapshot gets a 'snapshot_time' column and is written as one file under `root/date=YYYY-MM-DD/`,
+    sorted by underlying asset. Reads by date only open the matching partitions, reads by underlying
+    asset skip the row groups that cannot match, and reads of a few columns only decode those columns.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        _require_pyarrow()
+        self.root = Path(root)
+        self._partitioning = ds.partitioning(
+            pa.schema([("date", pa.string())]), flavor="hive"
+        )
+
+    def append(self, snapshot: pd.DataFrame, snapshot_time: datetime | None = None) -> None:
+        """
+        Write one snapshot, e.g. the output of get_all_options_data or MarketWatchTracker.snapshot.
+        """
+        snapshot_time = pd.Timestamp(snapshot_time if snapshot_time is not None else datetime.now())
+        data = snapshot.sort_values([column for column in _SORT_COLUMNS if column in snapshot], kind="stable")
+        data = data.reset_index(drop=True)
+        data.insert(0, SNAPSHOT_TIME, snapshot_time)
+        data["date"] = snapshot_time.strftime("%Y-%m-%d")
+        for column in _DATE_COLUMNS:
+            # Compact frames hold the dates as datetime64; they are stored as in the plain frames.
+            if column in data and pd.api.types.is_datetime64_any_dtype(data[column]):
+                data[column] = data[column].dt.strftime(_DATE_FORMAT)
+
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        schema = pa.schema([field.with_type(_canonical_type(field.type)) for field in table.schema])
+        table = table.cast(schema)
+        ds.write_dataset(
+            table,
+            base_dir=self.root,
+            format="parquet",
+            partitioning=self._partitioning,
+            basename_template=f"part-{snapshot_time.strftime('%H%M%S%f')}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=_ROWS_PER_GROUP,
+        )
+
+    def _dataset(self) -> "ds.Dataset":
+        return ds.dataset(self.root, format="parquet", partitioning=self._partitioning)
+
+    def read(
+            self,
+            columns: list[str] | None = None,
+            ua_tse_codes: Iterable[str] | None = None,
+            tse_codes: Iterable[str] | None = None,
+            start: datetime | str | None = None,
+            end: datetime | str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read the stored rows, optionally restricted to some underlying assets, contracts and a
+        [start, end] snapshot time range, with only the given `columns` (plus 'snapshot_time').
+        """
+        if not self.root.exists():
+            return pd.DataFrame(columns=[SNAPSHOT_TIME] + list(columns or []))
+
+        conditions = []
+        if ua_tse_codes is not None:
+            conditions.append(ds.field("ua_tse_code").isin(list(ua_tse_codes)))
+        if tse_codes is not None:
+            conditions.append(ds.field("tse_code").isin(list(tse_codes)))
+        if start is not None:
+            start = pd.Timestamp(start)
+            conditions.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+            conditions.append(ds.field(SNAPSHOT_TIME) >= pa.scalar(start.to_datetime64()))
+        if end is not None:
+            end = pd.Timestamp(end)
+            conditions.append(ds.field("date") <= end.strftime("%Y-%m-%d"))
+            conditions.append(ds.field(SNAPSHOT_TIME) <= pa.scalar(end.to_datetime64()))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        if columns is not None:
+            columns = [SNAPSHOT_TIME] + [column for column in columns if column != SNAPSHOT_TIME]
+        table = self._dataset().to_table(columns=columns, filter=expression)
+        data = table.to_pandas()
+        if "date" in data:
+            data = data.drop(columns="date")
+        return data.sort_values(SNAPSHOT_TIME, kind="stable").reset_index(drop=True)
+
+    def snapshot_times(self) -> pd.DatetimeIndex:
+        """
+        The times of all stored snapshots.
+        """
+        if not self.root.exists():
+            return pd.DatetimeIndex([])
+        table = self._dataset().to_table(columns=[SNAPSHOT_TIME])
+        return pd.DatetimeIndex(pd.unique(table.column(SNAPSHOT_TIME).to_numpy())).sort_values()
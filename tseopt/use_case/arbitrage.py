@@ -0,0 +1,238 @@
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+from tseopt.use_case.pricing import DAYS_IN_YEAR
+
+_GROUP_KEYS = ["ua_tse_code", "end_date"]
+_KEYS = _GROUP_KEYS + ["strike_price"]
+_COLUMNS = _KEYS + ["ua_ticker", "ticker", "contract_size", "ua_last_price", "days_to_maturity",
+                    "bid_price", "bid_volume", "ask_price", "ask_volume"]
+
+
+class Strategy(str, Enum):
+    CONVERSION = "conversion"              # buy the underlying and the put, sell the call
+    REVERSAL = "reversal"                  # sell the underlying and the put, buy the call
+    BULL_CALL_SPREAD = "bull_call_spread"  # buy the lower call for less than the higher one
+    BEAR_CALL_SPREAD = "bear_call_spread"  # call spread credit above the strike distance
+    BEAR_PUT_SPREAD = "bear_put_spread"    # buy the higher put for less than the lower one
+    BULL_PUT_SPREAD = "bull_put_spread"    # put spread credit above the strike distance
+    CALL_BUTTERFLY = "call_butterfly"      # the middle call is priced above the wings (non-convex)
+    PUT_BUTTERFLY = "put_butterfly"        # the middle put is priced above the wings (non-convex)
+    LONG_BOX = "long_box"                  # the box costs less than its discounted payoff
+    SHORT_BOX = "short_box"                # the box sells for more than its discounted payoff
+
+
+class _Side:
+    """
+    The contracts of one option type sorted by (ua_tse_code, end_date, strike_price), as arrays, with
+    the group id of every (ua_tse_code, end_date) chain. Missing quotes (zero prices) are NaN.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        data = data.sort_values(_KEYS, kind="stable").drop_duplicates(_KEYS)
+        self.columns = {column: data[column].to_numpy() for column in _COLUMNS}
+        for price, volume in (("bid_price", "bid_volume"), ("ask_price", "ask_volume")):
+            quote = data[price].to_numpy(dtype=np.float64)
+            quoted = (quote > 0) & (data[volume].to_numpy() > 0)
+            self.columns[price] = np.where(quoted, quote, np.nan)
+            self.columns[volume] = np.where(quoted, data[volume].to_numpy(dtype=np.float64), 0.0)
+        new_chain = np.zeros(len(data), dtype=bool)
+        new_chain[:1] = True
+        for key in _GROUP_KEYS:
+            column = self.columns[key]
+            new_chain[1:] |= column[1:] != column[:-1]
+        self.group = np.cumsum(new_chain)
+
+    def __len__(self) -> int:
+        return len(self.group)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def neighbours(self, k: int) -> np.ndarray:
+        """
+        Positions i whose contract at i + k is in the same chain, i.e. the strike k steps higher.
+        """
+        if len(self) <= k:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.group[:-k] == self.group[k:])
+
+
+def _discount(days_to_maturity: np.ndarray, risk_free_rate: float) -> np.ndarray:
+    return np.exp(-risk_free_rate * days_to_maturity.astype(np.float64) / DAYS_IN_YEAR)
+
+
+def _signals(
+        strategy: Strategy,
+        base: _Side,
+        rows: np.ndarray,
+        profit: np.ndarray,
+        volume: np.ndarray,
+        legs: list[tuple[str, _Side, np.ndarray] | tuple[str, _Side, np.ndarray, np.ndarray]],
+        strikes: list[np.ndarray],
+        n_contracts: float,
+        fee_per_contract: float,
+        min_profit: float
+) -> pd.DataFrame | None:
+    """
+    The opportunities of one strategy: `rows` index `base` and every other array is aligned with them.
+    A leg may carry a fourth array, the quantity of that option per strategy unit (1 if omitted).
+    """
+    contract_size = base["contract_size"][rows].astype(np.float64)
+    profit_per_contract = profit * contract_size - fee_per_contract * n_contracts
+    selected = np.flatnonzero(profit_per_contract > min_profit)
+    if selected.size == 0:
+        return None
+
+    rows = rows[selected]
+    strikes = [strike[selected] for strike in strikes] + [np.full(len(rows), np.nan)] * (3 - len(strikes))
+    legs_text = None
+    for sign, side, positions, *quantity in legs:
+        leg = side["ticker"][positions[selected]].astype(str)
+        if quantity:
+            leg = np.char.add(np.char.mod("%.4g*", quantity[0][selected]), leg)
+        leg = np.char.add(sign, leg)
+        legs_text = leg if legs_text is None else np.char.add(np.char.add(legs_text, " "), leg)
+    return pd.DataFrame({
+        "strategy": strategy.value,
+        "ua_tse_code": base["ua_tse_code"][rows],
+        "ua_ticker": base["ua_ticker"][rows],
+        "end_date": base["end_date"][rows],
+        "days_to_maturity": base["days_to_maturity"][rows],
+        "strike_low": strikes[0],
+        "strike_mid": strikes[1],
+        "strike_high": strikes[2],
+        "legs": legs_text,
+        "profit": profit[selected],
+        "profit_per_contract": profit_per_contract[selected],
+        "volume": volume[selected],
+    })
+
+
+def scan_arbitrage(
+        market_data: pd.DataFrame,
+        risk_free_rate: float = 0.3,
+        fee_per_contract: float = 0.0,
+        min_profit: float = 0.0
+) -> pd.DataFrame:
+    """
+    Scan the entire option market for static arbitrage at the quoted bid and ask prices.
+
+    Every option is bought at its ask and sold at its bid; contracts without a quote on the needed
+    side are skipped. Calls and puts are aligned on (ua_tse_code, end_date, strike_price) once, and
+    spreads, butterflies and boxes are built from adjacent strikes of the same chain. The underlying
+    has no quoted bid/ask in the market watch, so put-call parity uses its last price.
+
+    Parameters:
+        market_data (pd.DataFrame): The output of get_all_options_data.
+        risk_free_rate (float): Annual, continuously compounded rate used to discount the strikes.
+        fee_per_contract (float): Cost of trading one option contract, subtracted once per option leg.
+        min_profit (float): Only report opportunities whose profit per contract exceeds this value.
+
+    Returns:
+        pd.DataFrame: One row per opportunity, most profitable first, with the columns:
+            - 'strategy': The Strategy value.
+            - 'ua_tse_code', 'ua_ticker', 'end_date', 'days_to_maturity': The chain.
+            - 'strike_low', 'strike_mid', 'strike_high': The strikes used (NaN when not needed).
+            - 'legs': The option tickers, '+' bought at the ask and '-' sold at the bid. Butterfly wings
+              carry their quantity per middle option, e.g. '+0.4*low -mid +0.6*high' for unevenly
+              spaced strikes.
+            - 'profit': Locked-in profit per unit of the underlying, discounted to today.
+            - 'profit_per_contract': 'profit' times the contract size, net of fees.
+            - 'volume': The number of strategy units the quoted volumes allow.
+            - 'total_profit': 'profit_per_contract' times 'volume'.
+    """
+    is_call = (market_data["option_type"] == "call").to_numpy()
+    calls = _Side(market_data.loc[is_call, _COLUMNS])
+    puts = _Side(market_data.loc[~is_call, _COLUMNS])
+    frames = []
+
+    with np.errstate(invalid="ignore"):
+        # Put-call parity: C - P = S - K * exp(-rT)
+        pairs = pd.merge(
+            pd.DataFrame({key: calls[key] for key in _KEYS} | {"call": np.arange(len(calls))}),
+            pd.DataFrame({key: puts[key] for key in _KEYS} | {"put": np.arange(len(puts))}),
+            on=_KEYS, sort=False
+        )
+        c, p = pairs["call"].to_numpy(), pairs["put"].to_numpy()
+        s = calls["ua_last_price"][c].astype(np.float64)
+        discounted_k = calls["strike_price"][c] * _discount(calls["days_to_maturity"][c], risk_free_rate)
+        frames.append(_signals(
+            Strategy.CONVERSION, calls, c, calls["bid_price"][c] - puts["ask_price"][p] - s + discounted_k,
+            np.minimum(calls["bid_volume"][c], puts["ask_volume"][p]),
+            [("-", calls, c), ("+", puts, p)], [calls["strike_price"][c]], 2, fee_per_contract, min_profit,
+        ))
+        frames.append(_signals(
+            Strategy.REVERSAL, calls, c, puts["bid_price"][p] - calls["ask_price"][c] + s - discounted_k,
+            np.minimum(puts["bid_volume"][p], calls["ask_volume"][c]),
+            [("+", calls, c), ("-", puts, p)], [calls["strike_price"][c]], 2, fee_per_contract, min_profit,
+        ))
+
+        # Vertical spreads of adjacent strikes: 0 <= C(K1) - C(K2) <= (K2 - K1) * exp(-rT), likewise for puts
+        for side, strategies in ((calls, (Strategy.BULL_CALL_SPREAD, Strategy.BEAR_CALL_SPREAD)),
+                                 (puts, (Strategy.BEAR_PUT_SPREAD, Strategy.BULL_PUT_SPREAD))):
+            low = side.neighbours(1)
+            high = low + 1
+            width = (side["strike_price"][high] - side["strike_price"][low]) * _discount(
+                side["days_to_maturity"][low], risk_free_rate)
+            # The option that should be dearer: the lower-strike call, the higher-strike put.
+            dear, cheap = (low, high) if side is calls else (high, low)
+            strikes = [side["strike_price"][low], side["strike_price"][high]]
+            frames.append(_signals(
+                strategies[0], side, low, side["bid_price"][cheap] - side["ask_price"][dear],
+                np.minimum(side["bid_volume"][cheap], side["ask_volume"][dear]),
+                [("+", side, dear), ("-", side, cheap)], strikes, 2, fee_per_contract, min_profit,
+            ))
+            frames.append(_signals(
+                strategies[1], side, low, side["bid_price"][dear] - side["ask_price"][cheap] - width,
+                np.minimum(side["bid_volume"][dear], side["ask_volume"][cheap]),
+                [("-", side, dear), ("+", side, cheap)], strikes, 2, fee_per_contract, min_profit,
+            ))
+
+        # Butterflies of adjacent strikes: the middle option must not exceed the weighted wings.
+        for side, strategy in ((calls, Strategy.CALL_BUTTERFLY), (puts, Strategy.PUT_BUTTERFLY)):
+            low = side.neighbours(2)
+            mid, high = low + 1, low + 2
+            k1, k2, k3 = (side["strike_price"][i].astype(np.float64) for i in (low, mid, high))
+            weight = (k3 - k2) / (k3 - k1)
+            profit = side["bid_price"][mid] - weight * side["ask_price"][low] - (1 - weight) * side["ask_price"][high]
+            # One unit sells one middle option against `weight` low and `1 - weight` high wings.
+            volume = np.minimum.reduce([side["bid_volume"][mid], side["ask_volume"][low] / weight,
+                                        side["ask_volume"][high] / (1 - weight)])
+            frames.append(_signals(
+                strategy, side, low, profit, volume,
+                [("+", side, low, weight), ("-", side, mid), ("+", side, high, 1 - weight)], [k1, k2, k3], 2,
+                fee_per_contract, min_profit,
+            ))
+
+        # Boxes of adjacent strikes among the strikes quoted on both sides: payoff K2 - K1 at expiry.
+        lower = np.flatnonzero(calls.group[c[:-1]] == calls.group[c[1:]])
+        c1, c2, p1, p2 = c[lower], c[lower + 1], p[lower], p[lower + 1]
+        width = (calls["strike_price"][c2] - calls["strike_price"][c1]) * _discount(
+            calls["days_to_maturity"][c1], risk_free_rate)
+        strikes = [calls["strike_price"][c1], calls["strike_price"][c2]]
+        frames.append(_signals(
+            Strategy.LONG_BOX, calls, c1,
+            width - (calls["ask_price"][c1] - calls["bid_price"][c2] + puts["ask_price"][p2] - puts["bid_price"][p1]),
+            np.minimum.reduce([calls["ask_volume"][c1], calls["bid_volume"][c2],
+                               puts["ask_volume"][p2], puts["bid_volume"][p1]]),
+            [("+", calls, c1), ("-", calls, c2), ("+", puts, p2), ("-", puts, p1)], strikes, 4, fee_per_contract, min_profit,
+        ))
+        frames.append(_signals(
+            Strategy.SHORT_BOX, calls, c1,
+            calls["bid_price"][c1] - calls["ask_price"][c2] + puts["bid_price"][p2] - puts["ask_price"][p1] - width,
+            np.minimum.reduce([calls["bid_volume"][c1], calls["ask_volume"][c2],
+                               puts["bid_volume"][p2], puts["ask_volume"][p1]]),
+            [("-", calls, c1), ("+", calls, c2), ("-", puts, p2), ("+", puts, p1)], strikes, 4, fee_per_contract, min_profit,
+        ))
+
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return pd.DataFrame(columns=["strategy", "ua_tse_code", "ua_ticker", "end_date", "days_to_maturity",
+                                     "strike_low", "strike_mid", "strike_high", "legs", "profit",
+                                     "profit_per_contract", "volume", "total_profit"])
+    output = pd.concat(frames, ignore_index=True)
+    output["total_profit"] = output["profit_per_contract"] * output["volume"]
+    return output.sort_values("profit_per_contract", ascending=False, kind="stable").reset_index(drop=True)
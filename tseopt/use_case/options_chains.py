@@ -1,9 +1,16 @@
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
 from enum import Enum
 from functools import cached_property
+from itertools import repeat
 
+import numpy as np
 import pandas as pd
 
+from tseopt.data_source.tsetmc.tracker import MarketDelta
+from tseopt.data_source.tsetmc.trading_calendar import TradingCalendar, default_calendar, format_jalali
+from tseopt.use_case.shared_frame import SharedFrame, apply_to_rows
+
 
 class OptionType(str, Enum):
     CALL = "call"
@@ -11,17 +18,61 @@ class OptionType(str, Enum):
     BOTH = "both"
 
 
+class _ChainIndex:
+    """
+    The market frame sorted once by `prefix + [group_key] + order_keys`, with the row offsets of
+    every prefix and of every group inside it, so each chain is an O(1) slice.
+    """
+
+    def __init__(self, market_data: pd.DataFrame, prefix: list[str], group_key: str, order_keys: list[str]) -> None:
+        keys = prefix + [group_key]
+        self.data = market_data.sort_values(by=keys + order_keys, kind="stable")
+        n = len(self.data)
+        columns = [self.data[key].to_numpy() for key in keys]
+
+        starts = np.zeros(n, dtype=bool)
+        starts[:1] = True
+        for column in columns:
+            starts[1:] |= column[1:] != column[:-1]
+        group_starts = np.flatnonzero(starts)
+        group_stops = np.append(group_starts[1:], n)
+
+        self.spans: dict[tuple, tuple[int, int]] = {}
+        self.groups: dict[tuple, list[tuple[object, int, int]]] = {}
+        for start, stop in zip(group_starts.tolist(), group_stops.tolist()):
+            key = tuple(column[start] for column in columns)
+            prefix_key, group_value = key[:-1], key[-1]
+            self.groups.setdefault(prefix_key, []).append((group_value, start, stop))
+            prefix_start, _ = self.spans.get(prefix_key, (start, stop))
+            self.spans[prefix_key] = (prefix_start, stop)
+
+    def update(self, rows: pd.DataFrame) -> None:
+        """
+        Overwrite the values of existing rows in place; the sort keys of `rows` must be unchanged.
+        """
+        self.data.loc[rows.index, rows.columns] = rows
+
+    def span(self, prefix_key: tuple) -> pd.DataFrame:
+        start, stop = self.spans.get(prefix_key, (0, 0))
+        return self.data.iloc[start:stop]
+
+    def chains(self, prefix_key: tuple) -> Iterator[tuple[object, pd.DataFrame]]:
+        for group_value, start, stop in self.groups.get(prefix_key, []):
+            yield group_value, self.data.iloc[start:stop].reset_index(drop=True)
+
+
 class Chains:
 
-    def __init__(self, market_data: pd.DataFrame):
+    def __init__(self, market_data: pd.DataFrame, calendar: TradingCalendar = default_calendar):
         self._market_data = market_data
+        self.calendar = calendar
 
     @cached_property
     def underlying_asset_info(self) -> pd.DataFrame:
         ua_info = (
             self._market_data
             .groupby("ua_tse_code")
-            .agg({"ua_ticker": "max", "trades_value": "sum"})
+            .agg({"ua_ticker": "first", "trades_value": "sum"})
             .reset_index()
         )
         ua_info.sort_values(by="trades_value", ascending=False, inplace=True)
@@ -31,33 +82,157 @@ class Chains:
     def ua_tse_codes(self) -> list[str]:
         return self.underlying_asset_info["ua_tse_code"].tolist()
 
-    def options(self, ua_tse_code: str, option_type: OptionType = OptionType.BOTH) -> pd.DataFrame:
-        if ua_tse_code not in self.ua_tse_codes:
+    _INDEXES = ("_date_index", "_both_date_index", "_strike_price_index", "_both_strike_price_index")
+
+    def apply_delta(self, delta: MarketDelta) -> None:
+        """
+        Update the chains from a MarketWatchTracker delta. The chains must have been built from the
+        tracker's snapshot. Quote changes are written into the existing indexes; new or removed
+        contracts, or a change to the expiry, strike price, type or underlying asset of a contract,
+        rebuild them.
+        """
+        self._market_data = delta.snapshot
+        for name in ("underlying_asset_info", "ua_tse_codes"):
+            self.__dict__.pop(name, None)
+
+        if delta.structure_changed:
+            for name in self._INDEXES + ("_ua_tse_code_set",):
+                self.__dict__.pop(name, None)
+            return
+        for name in self._INDEXES:
+            if name in self.__dict__:
+                self.__dict__[name].update(delta.changed)
+
+    @cached_property
+    def _ua_tse_code_set(self) -> frozenset[str]:
+        return frozenset(self.ua_tse_codes)
+
+    @cached_property
+    def _date_index(self) -> _ChainIndex:
+        return _ChainIndex(self._market_data, ["ua_tse_code", "option_type"], "end_date", ["strike_price"])
+
+    @cached_property
+    def _both_date_index(self) -> _ChainIndex:
+        return _ChainIndex(self._market_data, ["ua_tse_code"], "end_date", ["strike_price", "option_type"])
+
+    @cached_property
+    def _strike_price_index(self) -> _ChainIndex:
+        return _ChainIndex(self._market_data, ["ua_tse_code", "option_type"], "strike_price", ["end_date"])
+
+    @cached_property
+    def _both_strike_price_index(self) -> _ChainIndex:
+        return _ChainIndex(self._market_data, ["ua_tse_code"], "strike_price", ["end_date", "option_type"])
+
+    def _validate(self, ua_tse_code: str, option_type: OptionType) -> OptionType:
+        if ua_tse_code not in self._ua_tse_code_set:
             raise ValueError(f"Invalid ua_tse_code: {ua_tse_code}")
+        return OptionType(option_type)
 
-        data = self._market_data[self._market_data["ua_tse_code"] == ua_tse_code]
+    @staticmethod
+    def _prefix_key(ua_tse_code: str, option_type: OptionType) -> tuple:
+        if option_type == OptionType.BOTH:
+            return (ua_tse_code,)
+        return ua_tse_code, option_type.value
 
-        if option_type != OptionType.BOTH:
-            return data[data["option_type"] == option_type]
-        return data
+    def options(self, ua_tse_code: str, option_type: OptionType = OptionType.BOTH) -> pd.DataFrame:
+        """
+        The options of one underlying asset, sorted by end_date and strike_price.
+        """
+        option_type = self._validate(ua_tse_code, option_type)
+        index = self._both_date_index if option_type == OptionType.BOTH else self._date_index
+        return index.span(self._prefix_key(ua_tse_code, option_type))
 
     def make_date_chains(
             self,
             ua_tse_code: str,
             option_type: OptionType = OptionType.BOTH
     ) -> Iterator[pd.DataFrame]:
-        options = self.options(ua_tse_code, option_type=option_type)
-        for date in options["end_date"].sort_values().unique():
-            yield options[options["end_date"] == date].sort_values(by="strike_price").reset_index(drop=True)
+        option_type = self._validate(ua_tse_code, option_type)
+        index = self._both_date_index if option_type == OptionType.BOTH else self._date_index
+        for _, chain in index.chains(self._prefix_key(ua_tse_code, option_type)):
+            yield chain
 
     def make_strike_price_chains(
             self,
             ua_tse_code: str,
             option_type: OptionType = OptionType.BOTH
     ) -> Iterator[pd.DataFrame]:
-        options = self.options(ua_tse_code, option_type=option_type)
-        for strike_price in options["strike_price"].sort_values().unique():
-            yield options[options["strike_price"] == strike_price].sort_values(by="end_date").reset_index(drop=True)
+        option_type = self._validate(ua_tse_code, option_type)
+        index = self._both_strike_price_index if option_type == OptionType.BOTH else self._strike_price_index
+        for _, chain in index.chains(self._prefix_key(ua_tse_code, option_type)):
+            yield chain
+
+    def iter_date_chains(self, option_type: OptionType = OptionType.BOTH) -> Iterator[tuple[str, str, pd.DataFrame]]:
+        """
+        Yield (ua_tse_code, end_date, chain) for every underlying asset, in the order of `ua_tse_codes`.
+        """
+        option_type = OptionType(option_type)
+        index = self._both_date_index if option_type == OptionType.BOTH else self._date_index
+        for ua_tse_code in self.ua_tse_codes:
+            for end_date, chain in index.chains(self._prefix_key(ua_tse_code, option_type)):
+                yield ua_tse_code, end_date, chain
+
+    def iter_strike_price_chains(
+            self,
+            option_type: OptionType = OptionType.BOTH
+    ) -> Iterator[tuple[str, int, pd.DataFrame]]:
+        """
+        Yield (ua_tse_code, strike_price, chain) for every underlying asset, in the order of `ua_tse_codes`.
+        """
+        option_type = OptionType(option_type)
+        index = self._both_strike_price_index if option_type == OptionType.BOTH else self._strike_price_index
+        for ua_tse_code in self.ua_tse_codes:
+            for strike_price, chain in index.chains(self._prefix_key(ua_tse_code, option_type)):
+                yield ua_tse_code, strike_price, chain
+
+    def expiries(self, as_of: object = None) -> pd.DataFrame:
+        """
+        One row per (ua_tse_code, end_date), in the order of `ua_tse_codes` and end_date, with:
+        - 'jalali_end_date': The end date as a Jalali 'YYYY-MM-DD' string.
+        - 'trading_days_to_maturity': Trading days after `as_of` (today by default) up to the end date.
+        - 'n_options': Number of option contracts expiring on that date.
+        """
+        groups = self._both_date_index.groups
+        rows = [
+            (ua_tse_code, end_date, stop - start)
+            for ua_tse_code in self.ua_tse_codes
+            for end_date, start, stop in groups.get((ua_tse_code,), [])
+        ]
+        expiries = pd.DataFrame(rows, columns=["ua_tse_code", "end_date", "n_options"])
+        as_of = np.datetime64("today", "D") if as_of is None else as_of
+        end_dates = expiries["end_date"]
+        expiries.insert(2, "jalali_end_date", format_jalali(self.calendar.to_jalali(end_dates)))
+        expiries.insert(3, "trading_days_to_maturity",
+                        self.calendar.count_trading_days(np.repeat(as_of, len(expiries)), end_dates))
+        return expiries
+
+    def map(self, func: Callable[[pd.DataFrame], object], executor: Executor | None = None) -> dict[str, object]:
+        """
+        Apply `func` to the options of every underlying asset, sorted by end_date and strike_price.
+
+        The market is partitioned by underlying once. With a ProcessPoolExecutor, it is written to a
+        shared-memory block and every worker reads its own underlying's rows from there, so only the
+        block name, a row range and `func` are pickled per task. `func` must then be picklable, e.g. a
+        module-level function or a functools.partial of one. Other executors, such as a
+        ThreadPoolExecutor, receive the partitions directly. Without an executor, `func` runs in this
+        process.
+
+        Returns the result of every underlying, keyed by ua_tse_code, in the order of `ua_tse_codes`.
+        """
+        index = self._both_date_index
+        spans = [index.spans[(ua_tse_code,)] for ua_tse_code in self.ua_tse_codes]
+        if executor is None:
+            return {ua_tse_code: func(index.data.iloc[start:stop])
+                    for ua_tse_code, (start, stop) in zip(self.ua_tse_codes, spans)}
+
+        if not isinstance(executor, ProcessPoolExecutor):
+            futures = [executor.submit(func, index.data.iloc[start:stop]) for start, stop in spans]
+            return {ua_tse_code: future.result() for ua_tse_code, future in zip(self.ua_tse_codes, futures)}
+
+        with SharedFrame.create(index.data) as shared:
+            starts, stops = zip(*spans) if spans else ((), ())
+            results = executor.map(apply_to_rows, repeat(shared.name), starts, stops, repeat(func))
+            return dict(zip(self.ua_tse_codes, results))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+DAYS_IN_YEAR = 365
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+class PriceSource(str, Enum):
+    MID = "mid"
+    LAST = "last"
+    BID = "bid"
+    ASK = "ask"
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * np.square(x)) / _SQRT_2PI
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal CDF to double precision (Hart, 1968), vectorized without SciPy.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    exponential = np.exp(-0.5 * z * z)
+
+    numerator = 3.52624965998911e-02 * z + 0.700383064443688
+    for coefficient in (6.37396220353165, 33.912866078383, 112.079291497871, 221.213596169931, 220.206867912376):
+        numerator = numerator * z + coefficient
+    denominator = 8.83883476483184e-02 * z + 1.75566716318264
+    for coefficient in (16.064177579207, 86.7807322029461, 296.564248779674, 637.333633378831,
+                        793.826512519948, 440.413735824752):
+        denominator = denominator * z + coefficient
+    near = exponential * numerator / denominator
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = z + 0.65
+        for n in (4, 3, 2, 1):
+            fraction = z + n / fraction
+        far = exponential / fraction / 2.506628274631
+
+    tail = np.where(z < 7.07106781186547, near, np.where(z > 37, 0.0, far))
+    return np.where(x > 0, 1 - tail, tail)
+
+
+def _d1_d2(s, k, t, r, sigma) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma_sqrt_t = sigma * np.sqrt(t)
+        d1 = (np.log(s / k) + (r + 0.5 * sigma * sigma) * t) / sigma_sqrt_t
+    return d1, d1 - sigma_sqrt_t
+
+
+def black_scholes_price(s, k, t, r, sigma, is_call) -> np.ndarray:
+    """
+    Black-Scholes price of European options; every argument may be an array (t in years).
+    """
+    d1, d2 = _d1_d2(s, k, t, r, sigma)
+    discounted_k = k * np.exp(-r * t)
+    call = s * norm_cdf(d1) - discounted_k * norm_cdf(d2)
+    put = discounted_k * norm_cdf(-d2) - s * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def black_scholes_greeks(s, k, t, r, sigma, is_call) -> dict[str, np.ndarray]:
+    """
+    Delta, gamma, vega (per 1.00 of volatility) and theta (per calendar day) of European options.
+    """
+    d1, d2 = _d1_d2(s, k, t, r, sigma)
+    sqrt_t = np.sqrt(t)
+    pdf_d1 = norm_pdf(d1)
+    discounted_k = k * np.exp(-r * t)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1)
+        gamma = pdf_d1 / (s * sigma * sqrt_t)
+        vega = s * pdf_d1 * sqrt_t
+        decay = -s * pdf_d1 * sigma / (2 * sqrt_t)
+        theta = np.where(is_call, decay - r * discounted_k * norm_cdf(d2), decay + r * discounted_k * norm_cdf(-d2))
+    return {"delta": delta, "gamma": gamma, "vega": vega, "theta": theta / DAYS_IN_YEAR}
+
+
+def implied_volatility(
+        price, s, k, t, r, is_call,
+        tol: float = 1e-10,
+        max_iter: int = 100,
+        lower: float = 1e-4,
+        upper: float = 10.0
+) -> np.ndarray:
+    """
+    Implied volatility of European options by a vectorized, bracketed Newton iteration.
+
+    Newton steps that leave the current bracket fall back to bisection. Prices outside the
+    no-arbitrage bounds, non-positive prices, expired contracts and contracts that have not converged
+    after `max_iter` iterations give NaN.
+    """
+    price, s, k, t, r, is_call = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (price, s, k, t, r)), np.asarray(is_call, dtype=bool)
+    )
+    discounted_k = k * np.exp(-r * t)
+    lower_bound = np.where(is_call, np.maximum(s - discounted_k, 0), np.maximum(discounted_k - s, 0))
+    upper_bound = np.where(is_call, s, discounted_k)
+    valid = (t > 0) & (s > 0) & (k > 0) & (price > lower_bound) & (price < upper_bound)
+
+    sigma = np.full(price.shape, np.nan)
+    index = np.flatnonzero(valid)
+    if index.size == 0:
+        return sigma
+
+    target, s_, k_, t_, r_, call_ = (a.ravel()[index] for a in (price, s, k, t, r, is_call))
+    lo = np.full(index.size, lower)
+    hi = np.full(index.size, upper)
+    # Brenner-Subrahmanyam guess, clipped into the bracket
+    x = np.clip(np.sqrt(2 * np.pi / t_) * target / s_, lower * 2, upper / 2)
+
+    # Only the contracts that have not converged yet are iterated.
+    active = np.arange(index.size)
+    for _ in range(max_iter):
+        x_a, s_a, k_a, t_a, r_a = x[active], s_[active], k_[active], t_[active], r_[active]
+        diff = black_scholes_price(s_a, k_a, t_a, r_a, x_a, call_[active]) - target[active]
+        above = diff > 0
+        hi_a = np.where(above, x_a, hi[active])
+        lo_a = np.where(above, lo[active], x_a)
+        d1, _ = _d1_d2(s_a, k_a, t_a, r_a, x_a)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = x_a - diff / (s_a * norm_pdf(d1) * np.sqrt(t_a))
+        step = np.where((newton >= lo_a) & (newton <= hi_a), newton, 0.5 * (lo_a + hi_a))
+        priced = np.abs(diff) <= 1e-12 * s_a
+        step = np.where(priced, x_a, step)
+
+        x[active], lo[active], hi[active] = step, lo_a, hi_a
+        done = priced | (np.abs(step - x_a) <= tol) | (hi_a - lo_a <= tol)
+        active = active[~done]
+        if active.size == 0:
+            break
+    x[active] = np.nan
+
+    sigma.ravel()[index] = x
+    return sigma
+
+
+def _reference_price(market_data: pd.DataFrame, price_source: PriceSource) -> np.ndarray:
+    bid = market_data["bid_price"].to_numpy(dtype=np.float64)
+    ask = market_data["ask_price"].to_numpy(dtype=np.float64)
+    last = market_data["last_price"].to_numpy(dtype=np.float64)
+    if price_source == PriceSource.BID:
+        return bid
+    if price_source == PriceSource.ASK:
+        return ask
+    if price_source == PriceSource.LAST:
+        return last
+    quoted = (bid > 0) & (ask > 0)
+    return np.where(quoted, 0.5 * (bid + ask), last)
+
+
+def price_options(
+        market_data: pd.DataFrame,
+        risk_free_rate: float = 0.3,
+        price_source: PriceSource = PriceSource.MID
+) -> pd.DataFrame:
+    """
+    Implied volatility and greeks of every contract of the market in one batched call.
+
+    Parameters:
+        market_data (pd.DataFrame): The output of get_all_options_data.
+        risk_free_rate (float): Annual, continuously compounded risk-free rate.
+        price_source (PriceSource): The option price the greeks are computed from; "mid" uses the
+            bid/ask midpoint when both sides are quoted and the last price otherwise.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the index of `market_data` and the following columns:
+            - 'iv': Implied volatility of the `price_source` price.
+            - 'bid_iv': Implied volatility of the bid price.
+            - 'ask_iv': Implied volatility of the ask price.
+            - 'delta', 'gamma', 'vega', 'theta': Black-Scholes greeks at 'iv'; vega per 1.00 of
+              volatility and theta per calendar day.
+    """
+    s = market_data["ua_last_price"].to_numpy(dtype=np.float64)
+    k = market_data["strike_price"].to_numpy(dtype=np.float64)
+    t = market_data["days_to_maturity"].to_numpy(dtype=np.float64) / DAYS_IN_YEAR
+    is_call = (market_data["option_type"] == "call").to_numpy()
+
+    iv = implied_volatility(_reference_price(market_data, PriceSource(price_source)), s, k, t, risk_free_rate, is_call)
+    output = {
+        "iv": iv,
+        "bid_iv": implied_volatility(_reference_price(market_data, PriceSource.BID), s, k, t, risk_free_rate, is_call),
+        "ask_iv": implied_volatility(_reference_price(market_data, PriceSource.ASK), s, k, t, risk_free_rate, is_call),
+    }
+    output |= black_scholes_greeks(s, k, t, risk_free_rate, iv, is_call)
+    return pd.DataFrame(output, index=market_data.index)
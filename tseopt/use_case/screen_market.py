@@ -1,46 +1,120 @@
+import numpy as np
 import pandas as pd
 
+from tseopt.data_source.tsetmc.tracker import MarketDelta
+
+
+def top_k(values: np.ndarray, n: int, largest: bool = True) -> np.ndarray:
+    """
+    Positions of the `n` largest (or smallest) values, ordered, by partial selection instead of a full sort.
+    """
+    n = min(n, len(values))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    keys = -values if largest else values
+    selected = np.argpartition(keys, n - 1)[:n]
+    return selected[np.argsort(keys[selected], kind="stable")]
+
 
 class OptionMarket:
+    """
+    Screen statistics of the entire option market.
+
+    The columns the statistics need are extracted once per snapshot and every result is cached
+    until the snapshot changes (see `apply_delta`).
+    """
 
     def __init__(self, entire_option_market_data: pd.DataFrame) -> None:
         self.__data = entire_option_market_data
+        self.__total_trade_value = None
+        self.__cache: dict = {}
+
+    def apply_delta(self, delta: MarketDelta) -> None:
+        """
+        Update the market from a MarketWatchTracker delta; the total trade value is adjusted by the
+        changed rows only.
+        """
+        if self.__total_trade_value is not None:
+            self.__total_trade_value += delta.changed["trades_value"].sum() - delta.previous["trades_value"].sum()
+        self.__data = delta.snapshot
+        self.__cache.clear()
+
+    def _cached(self, key: tuple, compute):
+        if key not in self.__cache:
+            self.__cache[key] = compute()
+        return self.__cache[key]
 
     @property
-    def total_trade_value(self) -> int:
-        return self.__data["trades_value"].sum()
+    def _columns(self) -> dict[str, np.ndarray]:
+        def extract() -> dict[str, np.ndarray]:
+            data = self.__data
+            trades_value = data["trades_value"].to_numpy(dtype=np.float64)
+            is_call = (data["option_type"] == "call").to_numpy()
+            ua_codes, ua_tickers = pd.factorize(data["ua_ticker"], sort=True)
+            # Contracts without an underlying ticker (code -1) are left out of the per-underlying sums.
+            call_sums, put_sums = is_call & (ua_codes >= 0), ~is_call & (ua_codes >= 0)
+            return {
+                "ticker": data["ticker"].to_numpy(),
+                "trades_value": trades_value,
+                "new_positions": (data["open_positions"] - data["yesterday_open_positions"]).to_numpy(),
+                "call_rows": np.flatnonzero(is_call),
+                "put_rows": np.flatnonzero(~is_call),
+                "ua_call_value": np.bincount(ua_codes[call_sums], weights=trades_value[call_sums],
+                                             minlength=len(ua_tickers)),
+                "ua_put_value": np.bincount(ua_codes[put_sums], weights=trades_value[put_sums],
+                                            minlength=len(ua_tickers)),
+                "ua_ticker": np.asarray(ua_tickers),
+            }
+        return self._cached(("columns",), extract)
 
     @property
+    def total_trade_value(self) -> int:
+        if self.__total_trade_value is None:
+            self.__total_trade_value = self.__data["trades_value"].sum()
+        return self.__total_trade_value
+
     def extreme_changes_in_open_positions(self, n: int = 5) -> dict:
-        data = self.__data.copy()
-        data["new_positions"] = data["open_positions"] - data["yesterday_open_positions"]
-        best = data.sort_values(by="new_positions", ascending=False).head(n)
-        worst = data.sort_values(by="new_positions", ascending=True).head(n)
-        output = {
-            "best": best[["ticker", "new_positions"]].to_dict("records"),
-            "worst": worst[["ticker", "new_positions"]].to_dict("records"),
-        }
-        return output
+        def compute() -> dict:
+            columns = self._columns
+            new_positions = columns["new_positions"]
+
+            def records(rows: np.ndarray) -> list[dict]:
+                frame = pd.DataFrame({"ticker": columns["ticker"][rows], "new_positions": new_positions[rows]})
+                return frame.to_dict("records")
+
+            return {
+                "best": records(top_k(new_positions, n, largest=True)),
+                "worst": records(top_k(new_positions, n, largest=False)),
+            }
+        return self._cached(("extreme_changes_in_open_positions", n), compute)
 
-    @property
     def most_trade_value(self, n: int = 5) -> dict:
-        data = self.__data.sort_values(by="trades_value", ascending=False).copy()
-        call = data[["ticker", "trades_value"]][data["option_type"] == "call"].head(n)
-        put = data[["ticker", "trades_value"]][data["option_type"] == "put"].head(n)
-        return {"call": call.to_dict("records"), "put": put.to_dict("records")}
+        def compute() -> dict:
+            columns = self._columns
+            trades_value = columns["trades_value"]
+            output = {}
+            for option_type in ("call", "put"):
+                rows = columns[f"{option_type}_rows"]
+                rows = rows[top_k(trades_value[rows], n)]
+                frame = pd.DataFrame({"ticker": columns["ticker"][rows], "trades_value": trades_value[rows]})
+                output[option_type] = frame.to_dict("records")
+            return output
+        return self._cached(("most_trade_value", n), compute)
 
-    @property
-    def most_trade_value_by_underlying_asset(self) -> dict:
-        g = self.__data.groupby(['ua_ticker', 'option_type'])
-        data = g.agg({"trades_value": "sum"})
-        data = data.pivot_table(index='ua_ticker', columns='option_type', values='trades_value',
-                                fill_value=0).reset_index()
-        data.columns.name = None
-        data["total"] = data["call"] + data["put"]
-        return data.sort_values("total", ascending=False).head(5).to_dict("records")
+    def most_trade_value_by_underlying_asset(self, n: int = 5) -> list[dict]:
+        def compute() -> list[dict]:
+            columns = self._columns
+            total = columns["ua_call_value"] + columns["ua_put_value"]
+            rows = top_k(total, n)
+            frame = pd.DataFrame({
+                "ua_ticker": columns["ua_ticker"][rows],
+                "call": columns["ua_call_value"][rows],
+                "put": columns["ua_put_value"][rows],
+                "total": total[rows],
+            })
+            return frame.to_dict("records")
+        return self._cached(("most_trade_value_by_underlying_asset", n), compute)
 
 
 def convert_to_billion_toman(numbers: pd.Series | pd.DataFrame) -> pd.Series | pd.DataFrame:
     return (numbers/1e10).round(2).astype(str) + " B Toman"
-
-
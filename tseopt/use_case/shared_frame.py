@@ -0,0 +1,132 @@
+import pickle
+import struct
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+_HEADER = struct.Struct("<Q")
+_ALIGNMENT = 64
+_INDEX = "__index__"
+
+# Blocks attached by this (worker) process, reused by every partition of the same block.
+_attached: dict[str, "SharedFrame"] = {}
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class SharedFrame:
+    """
+    A DataFrame laid out column by column in one shared-memory block, so worker processes can read
+    row ranges of it without the frame being pickled.
+
+    Numeric, boolean and datetime columns are stored as raw arrays. Text and other object columns are
+    stored as integer codes, and their distinct values are pickled once into the block header together
+    with the layout. A worker attaches to the block by name and rebuilds only the rows it needs.
+    """
+
+    def __init__(self, shm: SharedMemory, layout: dict, owner: bool) -> None:
+        self.shm = shm
+        self.layout = layout
+        self._owner = owner
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, data: pd.DataFrame) -> "SharedFrame":
+        columns = {_INDEX: pd.Series(data.index, copy=False)} | {column: data[column] for column in data.columns}
+        arrays, specs = [], []
+        for column, series in columns.items():
+            dtype = series.dtype
+            if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+                array, values = series.to_numpy(), None
+            elif isinstance(dtype, pd.CategoricalDtype):
+                array, values = series.cat.codes.to_numpy(), None
+            else:
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                array, values = codes.astype(np.int32), np.asarray(uniques, dtype=object)
+            arrays.append(np.ascontiguousarray(array))
+            specs.append({"column": column, "dtype": dtype, "array_dtype": array.dtype.str, "values": values})
+
+        layout = {"n_rows": len(data), "specs": specs, "name": data.index.name}
+        offset = 0
+        for spec, array in zip(specs, arrays):
+            spec["offset"] = offset
+            offset = _aligned(offset + array.nbytes)
+        header = pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL)
+        data_offset = _aligned(_HEADER.size + len(header))
+
+        shm = SharedMemory(create=True, size=max(1, data_offset + offset))
+        _HEADER.pack_into(shm.buf, 0, data_offset)
+        shm.buf[_HEADER.size: _HEADER.size + len(header)] = header
+        for spec, array in zip(specs, arrays):
+            start = data_offset + spec["offset"]
+            shm.buf[start: start + array.nbytes] = array.view(np.uint8).ravel()
+        layout["data_offset"] = data_offset
+        return cls(shm, layout, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrame":
+        """
+        Attach to a block created by another process; cached per process for the latest block only.
+        """
+        if name in _attached:
+            return _attached[name]
+        for other in _attached.values():
+            other.close()
+        _attached.clear()
+
+        # Worker processes share the resource tracker of their parent, which unlinks the block.
+        shm = SharedMemory(name=name)
+        (data_offset,) = _HEADER.unpack_from(shm.buf, 0)
+        layout = pickle.loads(shm.buf[_HEADER.size: data_offset])
+        layout["data_offset"] = data_offset
+        _attached[name] = frame = cls(shm, layout, owner=False)
+        return frame
+
+    def _array(self, spec: dict) -> np.ndarray:
+        dtype = np.dtype(spec["array_dtype"])
+        return np.ndarray((self.layout["n_rows"],), dtype=dtype, buffer=self.shm.buf,
+                          offset=self.layout["data_offset"] + spec["offset"])
+
+    def rows(self, start: int, stop: int) -> pd.DataFrame:
+        """
+        A copy of the rows [start, stop) as a DataFrame with the original columns, dtypes and index.
+        """
+        data = {}
+        for spec in self.layout["specs"]:
+            array = self._array(spec)[start:stop]
+            dtype = spec["dtype"]
+            if spec["values"] is not None:
+                values = spec["values"].take(array)
+                values[array < 0] = None
+                data[spec["column"]] = pd.array(values, dtype=dtype)
+            elif isinstance(dtype, pd.CategoricalDtype):
+                data[spec["column"]] = pd.Categorical.from_codes(array.copy(), dtype=dtype)
+            else:
+                data[spec["column"]] = array.copy()
+        index = pd.Index(data.pop(_INDEX), name=self.layout["name"])
+        return pd.DataFrame(data, index=index)
+
+    def close(self) -> None:
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+            self._owner = False
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def apply_to_rows(name: str, start: int, stop: int, func):
+    """
+    Run `func` on the rows [start, stop) of a shared frame; the task shipped to worker processes.
+    """
+    return func(SharedFrame.attach(name).rows(start, stop))
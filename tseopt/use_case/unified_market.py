@@ -0,0 +1,228 @@
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from tseopt.data_source.tadbir import schema as tadbir_schema
+from tseopt.data_source.tadbir.api import BulkDataError, Tadbir
+from tseopt.data_source.transport import Transport, default_transport
+from tseopt.data_source.tsetmc.api import fetch_entire_market_data
+from tseopt.data_source.tsetmc.tracker import MarketWatchTracker
+from tseopt.storage.isin_index import ISINIndex
+
+SOURCES: list[str] = ["tsetmc", "tadbir"]
+MERGED_FIELDS: list[str] = list(tadbir_schema.MARKET_WATCH_COLUMN_NAMES.values())
+
+
+class _SourceState:
+    """
+    The last values of the merged fields reported by one source, indexed by tse_code, and the time
+    every one of them last changed. Contracts missing from a fetch (e.g. a failed chunk) keep their
+    last state.
+    """
+
+    def __init__(self) -> None:
+        self.values = pd.DataFrame(columns=MERGED_FIELDS, dtype=np.float64)
+        self.changed_at = pd.DataFrame(columns=MERGED_FIELDS, dtype=np.float64)
+        self.fetched_at: float | None = None
+
+    def observe(self, values: pd.DataFrame, observed_at: float) -> None:
+        values = values[MERGED_FIELDS].astype(np.float64)
+        new = values.to_numpy()
+        old = self.values.reindex(values.index).to_numpy()
+        old_changed_at = self.changed_at.reindex(values.index).to_numpy()
+        same = (new == old) | (np.isnan(new) & np.isnan(old))
+        changed_at = np.where(same & ~np.isnan(old_changed_at), old_changed_at, observed_at)
+
+        kept = ~self.values.index.isin(values.index)
+        changed_at = pd.DataFrame(changed_at, index=values.index, columns=MERGED_FIELDS)
+        self.values = pd.concat([self.values[kept], values]) if kept.any() else values
+        self.changed_at = pd.concat([self.changed_at[kept], changed_at]) if kept.any() else changed_at
+        self.fetched_at = observed_at
+
+    def aligned(self, index: pd.Index) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Values and change times on `index`; a missing value never wins (change time -inf).
+        """
+        values = self.values.reindex(index).to_numpy()
+        changed_at = self.changed_at.reindex(index).to_numpy()
+        return values, np.where(np.isnan(values), -np.inf, changed_at)
+
+
+class UnifiedOptionMarket:
+    """
+    One option market built from TSETMC and Tadbir at once.
+
+    Every refresh fetches the TSETMC market watch and the Tadbir bulk quotes of the same contracts
+    concurrently. For every contract and every field both sources report (prices, best limits and
+    trade totals), the value of the source that changed it most recently is kept, so a source that
+    lags behind never overwrites a newer quote of the other one. TSETMC contracts are matched to
+    Tadbir ISINs through a persistent ISINIndex.
+
+    Examples:
+    --------
+    >>> market = UnifiedOptionMarket(isin_index=ISINIndex("isin_index.json"))
+    >>> data = market.refresh()
+    >>> data[["ticker", "bid_price", "ask_price", "tsetmc_updated_at", "tadbir_updated_at"]]
+    """
+
+    def __init__(
+            self,
+            isin_index: ISINIndex | None = None,
+            prefer: str = "tsetmc",
+            timeout: float = 10,
+            chunk_size: int = 500,
+            max_workers: int = 4,
+            transport: Transport = default_transport
+    ) -> None:
+        """
+        Parameters:
+        ----------
+        isin_index : ISINIndex | None
+            The tse_code <-> ISIN mapping; a fresh in-memory index by default. Unknown contracts are
+            resolved once, when they first appear in the market watch; contracts that fail to resolve
+            are retried with the index's backoff.
+        prefer : str
+            The source kept when both changed a field in the same refresh, "tsetmc" or "tadbir".
+        timeout : float
+            Timeout of every request in seconds.
+        chunk_size, max_workers : int
+            ISINs per Tadbir bulk request and number of bulk requests in flight.
+        transport : Transport
+            The pooled HTTP transport shared by both sources.
+        """
+        if prefer not in SOURCES:
+            raise ValueError(f"prefer must be one of {SOURCES}")
+        self.isin_index = isin_index if isin_index is not None else ISINIndex(timeout=timeout, transport=transport)
+        self.tracker = MarketWatchTracker(timeout=timeout, transport=transport)
+        self._prefer = prefer
+        self._timeout = timeout
+        self._transport = transport
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._tadbir = Tadbir(transport=transport, timeout=timeout)
+        self._states = {source: _SourceState() for source in SOURCES}
+        self._data: pd.DataFrame | None = None
+        self._field_sources: pd.DataFrame | None = None
+        self.last_errors: dict[str, Exception] = {}
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            raise ValueError("There is no data. Please ensure that you have refreshed the market using the refresh method.")
+        return self._data
+
+    @property
+    def field_sources(self) -> pd.DataFrame:
+        """
+        The source every merged field of every contract was taken from, indexed by tse_code.
+        """
+        if self._field_sources is None:
+            raise ValueError("There is no data. Please ensure that you have refreshed the market using the refresh method.")
+        return self._field_sources
+
+    @property
+    def fetched_at(self) -> dict[str, pd.Timestamp | None]:
+        return {
+            source: pd.Timestamp(state.fetched_at, unit="s") if state.fetched_at is not None else None
+            for source, state in self._states.items()
+        }
+
+    def _fetch_tadbir(self, isins: dict[str, str]) -> pd.DataFrame | None:
+        """
+        Tadbir quotes of `isins` (tse_code -> ISIN), indexed by tse_code. Failed chunks are left out;
+        None if nothing could be fetched.
+        """
+        try:
+            chunks = self._tadbir.get_last_bulk_data_chunks(
+                list(isins.values()), chunk_size=self._chunk_size, max_workers=self._max_workers
+            )
+        except BulkDataError as e:
+            self.last_errors["tadbir"] = e
+            chunks = [chunk for chunk in e.chunks if chunk is not None]
+
+        data = pd.DataFrame(list(chain.from_iterable(chunks))).rename(columns=tadbir_schema.BULK_DATA_COLUMN_NAMES)
+        if data.empty or "isin" not in data:
+            return None
+        self.isin_index.update(zip(data.get("tse_code", []), data["isin"]))
+        tse_codes = {isin: tse_code for tse_code, isin in isins.items()}
+        data.index = pd.Index(data["isin"].map(tse_codes), name=None)
+        data = data[data.index.notna() & ~data.index.duplicated(keep="last")]
+        return data.rename(columns=tadbir_schema.MARKET_WATCH_COLUMN_NAMES).reindex(columns=MERGED_FIELDS)
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Fetch both sources and return the consolidated market.
+
+        Returns:
+        -------
+        pd.DataFrame
+            The columns of get_all_options_data, indexed by tse_code, whose merged fields hold the
+            freshest value of either source, and:
+            - 'isin': ISIN of the contract (missing if it could not be resolved).
+            - 'tsetmc_updated_at', 'tadbir_updated_at': When the merged fields of the contract last
+              changed in each source.
+        """
+        observed_at = time.time()
+        known = self.isin_index.isins(self.tracker.snapshot.index) if self._data is not None else {}
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="tseopt-unified") as executor:
+            futures = [executor.submit(self._fetch_tadbir, known)] if known else []
+            raw_data = fetch_entire_market_data(self._timeout, transport=self._transport)
+            snapshot = self.tracker.apply(raw_data).snapshot
+
+            # Contracts new to this market are quoted from Tadbir right away: those the index already
+            # maps (e.g. loaded from its file on the first refresh) while the unknown ones are resolved.
+            new_codes = snapshot.index.difference(pd.Index(list(known)))
+            mapped = self.isin_index.isins(new_codes)
+            if mapped:
+                futures.append(executor.submit(self._fetch_tadbir, mapped))
+            unknown = self.isin_index.pending(new_codes.difference(pd.Index(list(mapped))))
+            resolved = self.isin_index.resolve(unknown) if unknown else {}
+            if resolved:
+                futures.append(executor.submit(self._fetch_tadbir, resolved))
+            frames = [frame for frame in (future.result() for future in futures) if frame is not None]
+
+        self._states["tsetmc"].observe(snapshot, observed_at)
+        if frames:
+            self._states["tadbir"].observe(pd.concat(frames) if len(frames) > 1 else frames[0], observed_at)
+
+        self._data, self._field_sources = self._merge(snapshot)
+        return self._data
+
+    def _merge(self, snapshot: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        index = snapshot.index
+        tsetmc_values, tsetmc_changed_at = self._states["tsetmc"].aligned(index)
+        tadbir_values, tadbir_changed_at = self._states["tadbir"].aligned(index)
+        if self._prefer == "tadbir":
+            use_tadbir = tadbir_changed_at >= tsetmc_changed_at
+        else:
+            use_tadbir = tadbir_changed_at > tsetmc_changed_at
+        use_tadbir &= ~np.isnan(tadbir_values)
+        merged = np.where(use_tadbir, tadbir_values, tsetmc_values)
+
+        data = snapshot.copy()
+        for i, field in enumerate(MERGED_FIELDS):
+            column = merged[:, i]
+            dtype = snapshot[field].dtype
+            data[field] = column.astype(dtype) if dtype.kind in "iu" and not np.isnan(column).any() else column
+        data["isin"] = index.map(self.isin_index.isin)
+        for source, changed_at in (("tsetmc", tsetmc_changed_at), ("tadbir", tadbir_changed_at)):
+            latest = changed_at.max(axis=1, initial=-np.inf)
+            data[f"{source}_updated_at"] = pd.to_datetime(np.where(np.isinf(latest), np.nan, latest), unit="s")
+
+        field_sources = pd.DataFrame(
+            np.where(use_tadbir, "tadbir", "tsetmc"), index=index, columns=MERGED_FIELDS
+        ).astype(pd.CategoricalDtype(SOURCES))
+        return data, field_sources
+
+    def feed(self, interval: float = 5) -> Iterator[pd.DataFrame]:
+        """
+        Refresh the market every `interval` seconds and yield the consolidated frame.
+        """
+        while True:
+            started = time.monotonic()
+            yield self.refresh()
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,363 @@
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from enum import Enum
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from tseopt.use_case.options_chains import Chains
+from tseopt.use_case.pricing import DAYS_IN_YEAR, PriceSource, price_options
+
+_QUOTE_COLUMNS = ["end_date", "strike_price", "option_type", "days_to_maturity", "ua_last_price",
+                  "bid_price", "ask_price", "last_price"]
+
+
+class SmileModel(str, Enum):
+    SVI = "svi"
+    QUADRATIC = "quadratic"
+    FLAT = "flat"
+
+
+class Smile(NamedTuple):
+    """
+    The fitted total implied variance w(k) = iv^2 * t of one expiry, k being the log forward moneyness.
+    """
+    end_date: str
+    t: float
+    forward: float
+    model: str
+    params: tuple[float, ...]
+    n_points: int
+    rmse: float
+
+
+def svi_total_variance(k: np.ndarray, params: tuple[float, ...]) -> np.ndarray:
+    """
+    Raw SVI: w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2)).
+    """
+    a, b, rho, m, sigma = params
+    x = np.asarray(k, dtype=np.float64) - m
+    return a + b * (rho * x + np.sqrt(x * x + sigma * sigma))
+
+
+def total_variance(smile: Smile, k: np.ndarray) -> np.ndarray:
+    k = np.asarray(k, dtype=np.float64)
+    if smile.model == SmileModel.SVI:
+        return svi_total_variance(k, smile.params)
+    if smile.model == SmileModel.QUADRATIC:
+        return np.maximum(np.polyval(smile.params, k), 1e-12)
+    return np.full(k.shape, smile.params[0])
+
+
+def _svi_slices(k: np.ndarray, w: np.ndarray, m: np.ndarray, sigma: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The best (a, d, c) of w = a + d * y + c * sqrt(y^2 + 1), y = (k - m) / sigma, for every (m, sigma)
+    candidate at once by batched least squares, projected onto the no-arbitrage domain
+    0 <= c <= 4 sigma, |d| <= min(c, 4 sigma - c). Returns the parameters and the squared errors.
+    """
+    y = (k[None, :] - m[:, None]) / sigma[:, None]
+    z = np.sqrt(y * y + 1)
+    design = np.stack([np.ones_like(y), y, z], axis=2)
+    gram = np.einsum("gni,gnj->gij", design, design)
+    # A ridge relative to the scale of every system keeps the near-collinear candidates solvable.
+    gram += 1e-10 * np.trace(gram, axis1=1, axis2=2)[:, None, None] * np.eye(3)
+    moment = np.einsum("gni,n->gi", design, w)
+    a, d, c = np.linalg.solve(gram, moment[..., None])[..., 0].T
+
+    c = np.clip(c, 0, 4 * sigma)
+    bound = np.minimum(c, 4 * sigma - c)
+    d = np.clip(d, -bound, bound)
+    a = np.clip((w[None, :] - d[:, None] * y - c[:, None] * z).mean(axis=1), 0, w.max())
+    residuals = a[:, None] + d[:, None] * y + c[:, None] * z - w[None, :]
+    return np.stack([a, d, c], axis=1), np.einsum("gn,gn->g", residuals, residuals)
+
+
+def fit_svi(k: np.ndarray, w: np.ndarray, rounds: int = 3, size: int = 24) -> tuple[tuple[float, ...], float]:
+    """
+    Fit raw SVI by the quasi-explicit method: (a, d, c) are linear given (m, sigma), which are
+    searched on a grid that is refined around the best candidate. Returns (a, b, rho, m, sigma)
+    and the root-mean-square error in total variance.
+    """
+    k, w = np.asarray(k, dtype=np.float64), np.asarray(w, dtype=np.float64)
+    span = max(k.max() - k.min(), 1e-2)
+    m_low, m_high = k.min() - span, k.max() + span
+    log_sigma_low, log_sigma_high = np.log(1e-3), np.log(2.0)
+    for _ in range(rounds):
+        m_grid, log_sigma_grid = np.meshgrid(np.linspace(m_low, m_high, size),
+                                             np.linspace(log_sigma_low, log_sigma_high, size))
+        m, sigma = m_grid.ravel(), np.exp(log_sigma_grid.ravel())
+        linear, errors = _svi_slices(k, w, m, sigma)
+        best = int(np.argmin(errors))
+        m_step = (m_high - m_low) / (size - 1)
+        log_sigma_step = (log_sigma_high - log_sigma_low) / (size - 1)
+        m_low, m_high = m[best] - 2 * m_step, m[best] + 2 * m_step
+        log_sigma_low = np.log(sigma[best]) - 2 * log_sigma_step
+        log_sigma_high = np.log(sigma[best]) + 2 * log_sigma_step
+
+    a, d, c = linear[best]
+    m, sigma = m[best], sigma[best]
+    b = c / sigma
+    rho = d / c if c > 0 else 0.0
+    # Keep the minimum total variance, a + b * sigma * sqrt(1 - rho^2), non-negative.
+    a = max(a, -b * sigma * np.sqrt(max(1 - rho * rho, 0.0)))
+    params = (float(a), float(b), float(rho), float(m), float(sigma))
+    rmse = float(np.sqrt(np.mean(np.square(svi_total_variance(k, params) - w))))
+    return params, rmse
+
+
+def fit_smile(
+        end_date: str,
+        t: float,
+        forward: float,
+        k: np.ndarray,
+        w: np.ndarray,
+        model: SmileModel = SmileModel.SVI,
+        min_points: int = 5
+) -> Smile:
+    """
+    Fit one expiry; SVI falls back to a quadratic below `min_points` points and to a flat smile below 3.
+    """
+    model = SmileModel(model)
+    n = len(k)
+    if model == SmileModel.SVI and n >= min_points:
+        params, rmse = fit_svi(k, w)
+    elif model != SmileModel.FLAT and n >= 3:
+        model = SmileModel.QUADRATIC
+        params = tuple(float(p) for p in np.polyfit(k, w, 2))
+        rmse = float(np.sqrt(np.mean(np.square(np.polyval(params, k) - w))))
+    else:
+        model = SmileModel.FLAT
+        params = (float(np.mean(w)),)
+        rmse = float(np.sqrt(np.mean(np.square(w - params[0]))))
+    return Smile(end_date, t, forward, model.value, params, n, rmse)
+
+
+def _is_fitted(smile: Smile) -> bool:
+    return bool(np.isfinite(smile.params).all() and np.isfinite(smile.rmse))
+
+
+def fit_underlying(task: tuple) -> tuple[str, list[Smile]]:
+    """
+    Fit every expiry of one underlying; a module-level function so it can run in worker processes.
+    `task` is (ua_tse_code, model, min_points, [(end_date, t, forward, k, w), ...]).
+    """
+    ua_tse_code, model, min_points, expiries = task
+    smiles = [fit_smile(end_date, t, forward, k, w, model, min_points) for end_date, t, forward, k, w in expiries]
+    return ua_tse_code, sorted(smiles, key=lambda smile: smile.t)
+
+
+class VolatilitySurface:
+    """
+    Per-expiry implied volatility smiles of every underlying asset, fitted in log forward moneyness.
+
+    `update` fingerprints the quotes of every underlying and refits only the underlyings whose quotes
+    changed since their last successful fit; the fits run in a process pool across underlyings. Between
+    expiries the total variance is interpolated linearly in time at constant moneyness.
+
+    Examples:
+    --------
+    >>> with VolatilitySurface(risk_free_rate=0.3) as surface:
+    ...     surface.update(Chains(entire_option_market_data))
+    ...     surface.iv(ua_tse_code, strikes=[9000, 10000, 11000], days_to_maturity=30)
+    """
+
+    def __init__(
+            self,
+            risk_free_rate: float = 0.3,
+            model: SmileModel = SmileModel.SVI,
+            price_source: PriceSource = PriceSource.MID,
+            min_points: int = 5,
+            max_workers: int | None = None,
+            executor: Executor | None = None
+    ) -> None:
+        """
+        Parameters:
+        ----------
+        risk_free_rate : float
+            Annual, continuously compounded rate of the forwards and the implied volatilities.
+        model : SmileModel
+            The smile fitted to every expiry.
+        price_source : PriceSource
+            The option price the implied volatilities are computed from.
+        min_points : int
+            Minimum number of strikes of an SVI fit.
+        max_workers : int | None
+            Processes of the pool the surface creates; 1 fits in the calling process.
+        executor : Executor | None
+            An executor to run the fits on instead of the surface's own pool.
+        """
+        self.risk_free_rate = risk_free_rate
+        self.model = SmileModel(model)
+        self.price_source = PriceSource(price_source)
+        self.min_points = min_points
+        self._max_workers = max_workers
+        self._executor = executor
+        self._own_executor: ProcessPoolExecutor | None = None
+        self._smiles: dict[str, list[Smile]] = {}
+        self._spots: dict[str, float] = {}
+        self._fingerprints: dict[str, int] = {}
+
+    def _map(self, tasks: list[tuple]) -> Iterable[tuple[str, list[Smile]]]:
+        if len(tasks) <= 1 or (self._executor is None and self._max_workers == 1):
+            return map(fit_underlying, tasks)
+        if self._executor is None and self._own_executor is None:
+            self._own_executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        executor = self._executor or self._own_executor
+        return executor.map(fit_underlying, tasks, chunksize=max(1, len(tasks) // 64))
+
+    def close(self) -> None:
+        if self._own_executor is not None:
+            self._own_executor.shutdown()
+            self._own_executor = None
+
+    def __enter__(self) -> "VolatilitySurface":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _fingerprint(options: pd.DataFrame) -> int:
+        # Order independent, so a reordered snapshot with the same quotes is not refitted.
+        hashes = pd.util.hash_pandas_object(options[_QUOTE_COLUMNS], index=False).to_numpy()
+        return int(hashes.sum(dtype=np.uint64))
+
+    def _tasks(self, options: pd.DataFrame) -> list[tuple]:
+        """
+        One fitting task per underlying: the out-of-the-money option of every strike (the other one
+        when it has no implied volatility) in total variance against log forward moneyness.
+        """
+        iv = price_options(options, self.risk_free_rate, self.price_source)["iv"].to_numpy()
+        t = options["days_to_maturity"].to_numpy(dtype=np.float64) / DAYS_IN_YEAR
+        strike = options["strike_price"].to_numpy(dtype=np.float64)
+        forward = options["ua_last_price"].to_numpy(dtype=np.float64) * np.exp(self.risk_free_rate * t)
+        is_call = (options["option_type"] == "call").to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            points = pd.DataFrame({
+                "ua_tse_code": options["ua_tse_code"].to_numpy(),
+                "end_date": options["end_date"].to_numpy(),
+                "strike_price": strike,
+                "itm": is_call != (strike >= forward),
+                "t": t,
+                "forward": forward,
+                "k": np.log(strike / forward),
+                "w": iv * iv * t,
+            })
+        points = points[np.isfinite(points["w"]) & (points["t"] > 0)]
+        points = points.sort_values(["ua_tse_code", "end_date", "strike_price", "itm"], kind="stable")
+        points = points.drop_duplicates(["ua_tse_code", "end_date", "strike_price"])
+
+        tasks = []
+        for ua_tse_code, underlying in points.groupby("ua_tse_code", sort=False):
+            expiries = [
+                (end_date, float(expiry["t"].iloc[0]), float(expiry["forward"].iloc[0]),
+                 expiry["k"].to_numpy(), expiry["w"].to_numpy())
+                for end_date, expiry in underlying.groupby("end_date", sort=True)
+            ]
+            tasks.append((ua_tse_code, self.model.value, self.min_points, expiries))
+        return tasks
+
+    def update(self, chains: Chains) -> list[str]:
+        """
+        Refit the underlyings of `chains` whose quotes changed and drop the ones that disappeared.
+
+        Returns the ua_tse_codes that were refitted.
+        """
+        changed, fingerprints = [], {}
+        for ua_tse_code in chains.ua_tse_codes:
+            options = chains.options(ua_tse_code)
+            fingerprints[ua_tse_code] = self._fingerprint(options)
+            if self._fingerprints.get(ua_tse_code) != fingerprints[ua_tse_code]:
+                changed.append(options)
+
+        for ua_tse_code in set(self._smiles) - set(fingerprints):
+            del self._smiles[ua_tse_code], self._spots[ua_tse_code]
+        # A fingerprint is only recorded once its underlying is fitted, so a failed fit is retried.
+        self._fingerprints = {
+            ua_tse_code: fingerprint for ua_tse_code, fingerprint in self._fingerprints.items()
+            if fingerprints.get(ua_tse_code) == fingerprint
+        }
+        if not changed:
+            return []
+
+        options = pd.concat(changed, ignore_index=True)
+        refitted = options["ua_tse_code"].unique().tolist()
+        for ua_tse_code in refitted:
+            self._smiles[ua_tse_code] = []
+        spots = options.groupby("ua_tse_code", sort=False)["ua_last_price"].first()
+        self._spots.update(spots.astype(np.float64).to_dict())
+        tasks = self._tasks(options)
+        fitting = {task[0] for task in tasks}
+        for ua_tse_code in refitted:
+            if ua_tse_code not in fitting:  # no implied volatility to fit
+                self._fingerprints[ua_tse_code] = fingerprints[ua_tse_code]
+        for ua_tse_code, smiles in self._map(tasks):
+            self._smiles[ua_tse_code] = smiles
+            if all(_is_fitted(smile) for smile in smiles):
+                self._fingerprints[ua_tse_code] = fingerprints[ua_tse_code]
+        return refitted
+
+    @property
+    def ua_tse_codes(self) -> list[str]:
+        return [ua_tse_code for ua_tse_code, smiles in self._smiles.items() if smiles]
+
+    def smiles(self, ua_tse_code: str) -> list[Smile]:
+        if not self._smiles.get(ua_tse_code):
+            raise ValueError(f"There is no fitted smile for ua_tse_code: {ua_tse_code}")
+        return self._smiles[ua_tse_code]
+
+    @property
+    def params(self) -> pd.DataFrame:
+        """
+        The fitted smiles of every underlying, one row per expiry.
+        """
+        rows = [
+            {"ua_tse_code": ua_tse_code} | smile._asdict()
+            for ua_tse_code, smiles in self._smiles.items() for smile in smiles
+        ]
+        return pd.DataFrame(rows, columns=["ua_tse_code", *Smile._fields])
+
+    def total_variance(self, ua_tse_code: str, strikes, days_to_maturity) -> np.ndarray:
+        """
+        Total implied variance at every (strike, days_to_maturity) pair; the arguments are broadcast.
+        """
+        smiles = self.smiles(ua_tse_code)
+        strikes, days = np.broadcast_arrays(np.asarray(strikes, dtype=np.float64),
+                                            np.asarray(days_to_maturity, dtype=np.float64))
+        t = days / DAYS_IN_YEAR
+        k = np.log(strikes / (self._spots[ua_tse_code] * np.exp(self.risk_free_rate * t)))
+
+        times = np.array([smile.t for smile in smiles])
+        variances = np.stack([total_variance(smile, k) for smile in smiles])
+        if len(smiles) == 1:
+            return variances[0] * t / times[0]
+
+        # Linear in time between the two surrounding expiries; proportional to t outside them.
+        upper = np.clip(np.searchsorted(times, t), 1, len(times) - 1)
+        lower = upper - 1
+        w_lower = np.take_along_axis(variances, lower[None], axis=0)[0]
+        w_upper = np.take_along_axis(variances, upper[None], axis=0)[0]
+        weight = (t - times[lower]) / (times[upper] - times[lower])
+        inside = w_lower + np.clip(weight, 0, 1) * (w_upper - w_lower)
+        before = w_lower * t / times[0]
+        after = w_upper * t / times[-1]
+        return np.where(t < times[0], before, np.where(t > times[-1], after, inside))
+
+    def iv(self, ua_tse_code: str, strikes, days_to_maturity) -> np.ndarray:
+        """
+        Implied volatility at every (strike, days_to_maturity) pair; the arguments are broadcast.
+        """
+        w = self.total_variance(ua_tse_code, strikes, days_to_maturity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(np.maximum(w, 0) * DAYS_IN_YEAR / np.asarray(days_to_maturity, dtype=np.float64))
+
+    def grid(self, ua_tse_code: str, strikes, days_to_maturity) -> pd.DataFrame:
+        """
+        Implied volatility on the grid of `days_to_maturity` (rows) by `strikes` (columns).
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        days = np.asarray(days_to_maturity, dtype=np.float64)
+        values = self.iv(ua_tse_code, strikes[None, :], days[:, None])
+        return pd.DataFrame(values, index=pd.Index(days, name="days_to_maturity"),
+                            columns=pd.Index(strikes, name="strike_price"))